@@ -0,0 +1,153 @@
+"""
+Scoring for ad-hoc (non-persisted) people — the finder's Person payloads.
+
+Converts finder people and SP rosters into records.PersonRecord so
+scoring.compute_connectivity() — the same engine as the API — scores them.
+Orgs are matched by resolve.company_key(), so "Acme" and "Acme, Inc." are the
+same org; years are used when known. Locations are geocoded with geo.locate()
+like stored people.
+
+SP rosters are converted and indexed (scoring.MemberIndex) once per distinct
+roster and kept in a small LRU, so repeated calls from the same page only
+convert the targets.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+
+import geo
+import records
+import resolve
+import scoring
+from team import SP_TEAM
+
+ROSTER_CACHE_SIZE = 8
+
+_rosters = OrderedDict()    # roster hash → (members, MemberIndex)
+
+
+def _org(name: str) -> records.OrgRecord:
+    key = resolve.company_key(name) or name.strip().lower()
+    return records.OrgRecord(key, name.strip())
+
+
+def _years(y):
+    """Finder education years: [start, end], a single year, or None."""
+    if isinstance(y, (list, tuple)):
+        return (y[0] if len(y) > 0 else None), (y[1] if len(y) > 1 else None)
+    return (y, y) if isinstance(y, int) else (None, None)
+
+
+def _education(items) -> list:
+    out = []
+    for e in items or []:
+        if isinstance(e, str):
+            e = {"s": e}
+        name = e.get("s") or e.get("institution")
+        if not name:
+            continue
+        start, end = _years(e.get("y")) if "y" in e else (e.get("start"), e.get("end"))
+        out.append(records.EducationRecord(name, start, end))
+    return out
+
+
+def finder_person_record(p: dict, pid=None) -> records.PersonRecord:
+    """A finder Person ({id, name, title, orgs, education, board, location, ...})."""
+    roles = [records.RoleRecord(org.id, org) for org in map(_org, p.get("orgs") or []) if org.id]
+    roles += [records.RoleRecord(org.id, org, is_board=True) for org in map(_org, p.get("board") or []) if org.id]
+    city_id, metro_id = geo.locate(p.get("location") or None)
+    return records.PersonRecord(
+        id=pid if pid is not None else p.get("id"),
+        full_name=p.get("name") or "",
+        location=p.get("location") or None,
+        city_id=city_id,
+        metro_id=metro_id,
+        current_title=p.get("title") or None,
+        linkedin_url=p.get("linkedin") or None,
+        roles=roles,
+        education=_education(p.get("education")),
+    )
+
+
+def sp_member_record(m: dict) -> records.PersonRecord:
+    """
+    An SP member from the frontend roster: a finder Person plus optional
+    `roles` ({org, title, start, end}) carrying years for known stints.
+    Plain `orgs` entries without a dated role are added undated.
+    """
+    person = finder_person_record({**m, "orgs": []})
+    dated = set()
+    for r in m.get("roles") or []:
+        org = _org(r.get("org") or "")
+        if org.id and org.id not in dated:
+            dated.add(org.id)
+            person.roles.append(records.RoleRecord(org.id, org, r.get("start"), r.get("end")))
+    for org in map(_org, m.get("orgs") or []):
+        if org.id and org.id not in dated:
+            dated.add(org.id)
+            person.roles.append(records.RoleRecord(org.id, org))
+    person.is_internal = True
+    return person
+
+
+def team_member_record(m: dict) -> records.PersonRecord:
+    """An SP_TEAM entry from team.py."""
+    city_id, metro_id = geo.locate(m.get("location"))
+    return records.PersonRecord(
+        id=resolve.linkedin_slug(m.get("linkedin_url")) or m["full_name"],
+        full_name=m["full_name"],
+        location=m.get("location"),
+        city_id=city_id,
+        metro_id=metro_id,
+        current_title=m.get("current_title"),
+        current_company=m.get("current_company"),
+        linkedin_url=m.get("linkedin_url"),
+        is_internal=True,
+        roles=[
+            records.RoleRecord(org.id, org, o.get("start"), o.get("end"), bool(o.get("board")))
+            for o in m.get("orgs", []) for org in [_org(o["name"])]
+        ],
+        education=[records.EducationRecord(e["institution"], e.get("start"), e.get("end")) for e in m.get("education", [])],
+    )
+
+
+def roster(sp_members=None, ctx=None):
+    """(members, MemberIndex) for a frontend roster, or team.py's SP_TEAM when None."""
+    ctx = ctx or scoring.default_context()
+    source = sp_members if sp_members is not None else SP_TEAM
+    key = hashlib.sha1(json.dumps([source, str(ctx.as_of), [(s.name, w) for s, w in ctx.signals]],
+                                  sort_keys=True, default=str).encode()).hexdigest()
+    if key in _rosters:
+        _rosters.move_to_end(key)
+        return _rosters[key]
+    if sp_members is None:
+        members = [team_member_record(m) for m in SP_TEAM]
+    else:
+        members = [sp_member_record(m) for m in sp_members]
+    _rosters[key] = (members, scoring.MemberIndex(members, ctx))
+    while len(_rosters) > ROSTER_CACHE_SIZE:
+        _rosters.popitem(last=False)
+    return _rosters[key]
+
+
+def score_people(people: list, sp_members=None, only_ids=None, min_score: int = 0, ctx=None):
+    """
+    Score finder people against the roster. With `only_ids`, only those people
+    are scored (incremental re-analysis after an edit). Returns
+    ([(member, target, ConnectivityResult)] by score descending, scored ids).
+    """
+    ctx = ctx or scoring.default_context()
+    _, index = roster(sp_members, ctx)
+    wanted = set(only_ids) if only_ids is not None else None
+    top = scoring.TopK()
+    scored = []
+    for p in people:
+        if wanted is not None and p.get("id") not in wanted:
+            continue
+        target = finder_person_record(p)
+        scored.append(target.id)
+        for member in index.candidates(target):
+            result = scoring.compute_connectivity(member, target, None, ctx)
+            if scoring.keep_result(result, min_score):
+                top.push(result.score, (member, target, result))
+    return top.items(), scored
@@ -0,0 +1,242 @@
+"""
+Per-client rate limiting and fair admission for expensive endpoints.
+
+Each request has a cost estimate (company size, search queries, ...). Cost
+is taken from the client's token bucket, which refills at <PREFIX>_RATE_PER_S
+up to <PREFIX>_RATE_BURST. When the bucket is short, the answer is 429 with
+Retry-After set to when it will have enough.
+
+Admitted requests then take one of <PREFIX>_ADMIT_CONCURRENCY slots. When all
+slots are busy they wait in a weighted-fair queue. Each request is tagged
+    finish = max(virtual time, client's last finish) + cost / client weight
+and the smallest tag goes next. Someone firing off a dozen big requests
+queues behind their own backlog while other clients' requests go ahead of
+it. A client may have at most <PREFIX>_ADMIT_MAX_QUEUED requests waiting, and
+a request waits at most <PREFIX>_ADMIT_MAX_WAIT_S. Past either limit it's
+429 too, with its tokens refunded. Light requests (cost <= 1, e.g. cached
+results) are charged but never queue.
+
+Clients are identified by address: the header named in RCP_CLIENT_IP_HEADER
+when behind a proxy that sets it (Fly-Client-IP on Fly.io), else the peer
+address. On Fly.io the peer is always the Fly proxy, so without the header
+every client shares one bucket; from_env() logs a warning when FLY_APP_NAME
+is set and RCP_CLIENT_IP_HEADER isn't. State is per process. Under gunicorn,
+rate, burst and the default concurrency are divided by WEB_CONCURRENCY, so
+the workers together come out at about the configured numbers.
+
+Environment (<PREFIX> is RCP for main.py, SP for server.py):
+    <PREFIX>_RATE_PER_S           cost units a client earns per second (default: 1)
+    <PREFIX>_RATE_BURST           bucket size (default: 60)
+    <PREFIX>_ADMIT_CONCURRENCY    expensive requests running at once (default: per app)
+    <PREFIX>_ADMIT_MAX_QUEUED     waiting requests per client (default: 4)
+    <PREFIX>_ADMIT_MAX_WAIT_S     longest wait for a slot (default: 30)
+    <PREFIX>_CLIENT_WEIGHTS       "client=weight,..." fair-share weights (default: all 1)
+    RCP_CLIENT_IP_HEADER          trusted header carrying the client address (default: none)
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import time
+from collections import Counter
+
+from fastapi import HTTPException, Request
+
+log = logging.getLogger("rcp.admission")
+
+CLIENT_IP_HEADER = os.getenv("RCP_CLIENT_IP_HEADER", "")
+LIGHT_COST = 1.0
+MAX_BUCKETS = 10000
+
+
+def client_id(request: Request) -> str:
+    if CLIENT_IP_HEADER and request.headers.get(CLIENT_IP_HEADER):
+        return request.headers[CLIENT_IP_HEADER].split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _parse_weights(spec: str) -> dict:
+    weights = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        client, _, weight = item.rpartition("=")
+        weights[client.strip()] = float(weight)
+    return weights
+
+
+def _too_many(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(status_code=429, detail=detail,
+                         headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+
+class Admission:
+    COUNTERS = ("admitted", "queued", "rate_limited", "queue_full", "timed_out")
+
+    def __init__(self, name: str, concurrency: int, rate: float = 1.0, burst: float = 60.0,
+                 max_queued: int = 4, max_wait_s: float = 30.0, weights: dict = None):
+        self.name = name
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_queued = max_queued
+        self.max_wait_s = max_wait_s
+        self.weights = weights or {}
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.active = 0
+        self._buckets = {}          # client → [tokens, updated]
+        self._heap = []             # (finish tag, seq, start tag, future)
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._last_finish = {}      # client → finish tag of their latest request
+        self._waiting = Counter()   # client → queued requests
+        self._wait_ms = []          # recent queue waits, for the report
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, concurrency: int) -> "Admission":
+        workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1") or 1))
+        if os.getenv("FLY_APP_NAME") and not CLIENT_IP_HEADER:
+            log.warning(f"{name}: running on Fly.io without RCP_CLIENT_IP_HEADER; every client is the "
+                        f"Fly proxy and shares one rate limit. Set RCP_CLIENT_IP_HEADER=Fly-Client-IP.")
+        return cls(
+            name,
+            concurrency=int(os.getenv(f"{prefix}_ADMIT_CONCURRENCY", "0")) or max(1, concurrency // workers),
+            rate=float(os.getenv(f"{prefix}_RATE_PER_S", "1")) / workers,
+            burst=float(os.getenv(f"{prefix}_RATE_BURST", "60")) / workers,
+            max_queued=int(os.getenv(f"{prefix}_ADMIT_MAX_QUEUED", "4")),
+            max_wait_s=float(os.getenv(f"{prefix}_ADMIT_MAX_WAIT_S", "30")),
+            weights=_parse_weights(os.getenv(f"{prefix}_CLIENT_WEIGHTS", "")),
+        )
+
+    # ── Token buckets ────────────────────────────────────────────────────────
+
+    def _take(self, client: str, cost: float) -> float:
+        """Take `cost` tokens; returns 0, or the seconds until there will be enough."""
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[client] = [self.burst, now]
+        bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if bucket[0] < cost:
+            return (cost - bucket[0]) / self.rate
+        bucket[0] -= cost
+        return 0.0
+
+    def _refund(self, client: str, cost: float) -> None:
+        if client in self._buckets:
+            self._buckets[client][0] = min(self.burst, self._buckets[client][0] + cost)
+
+    def _prune(self, now: float) -> None:
+        """Forget clients whose buckets have refilled; they'd start full anyway."""
+        for client, (tokens, updated) in list(self._buckets.items()):
+            if tokens + (now - updated) * self.rate >= self.burst:
+                del self._buckets[client]
+                self._last_finish.pop(client, None)
+
+    # ── Fair queue ───────────────────────────────────────────────────────────
+
+    async def acquire(self, client: str, cost: float) -> bool:
+        """
+        Charge and admit a request, waiting for a slot if needed. Returns
+        whether it holds a slot (pass that to release()); raises a 429.
+        """
+        cost = min(cost, self.burst)   # anything bigger could never be admitted
+        retry_after = self._take(client, cost)
+        if retry_after:
+            self.counters["rate_limited"] += 1
+            raise _too_many(f"Rate limit: this request costs {cost:g} units and you're out of them.", retry_after)
+        if cost <= LIGHT_COST:
+            self.counters["admitted"] += 1
+            return False
+
+        start = max(self._vtime, self._last_finish.get(client, 0.0))
+        finish = start + cost / self.weights.get(client, 1.0)
+        while self._heap and self._heap[0][3].done():   # gave up waiting
+            heapq.heappop(self._heap)
+        if self.active < self.concurrency and not self._heap:
+            self._last_finish[client] = finish
+            self._vtime = start
+            self.active += 1
+            self.counters["admitted"] += 1
+            return True
+        if self._waiting[client] >= self.max_queued:
+            self._refund(client, cost)
+            self.counters["queue_full"] += 1
+            raise _too_many(f"Too many of your requests are already waiting ({self.max_queued}).",
+                            self.max_wait_s / 2)
+
+        self._last_finish[client] = finish
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (finish, next(self._seq), start, future))
+        self._waiting[client] += 1
+        self.counters["queued"] += 1
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait_s)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                self._record_wait(queued_at)
+                self.counters["admitted"] += 1
+                return True   # handed a slot just as we gave up
+            future.cancel()   # release() skips it
+            self._refund(client, cost)
+            self.counters["timed_out"] += 1
+            raise _too_many("Server busy; try again shortly.", self.max_wait_s / 2)
+        except asyncio.CancelledError:   # client went away
+            if future.done() and not future.cancelled():
+                self.release()   # pass on the slot we were just handed
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._waiting[client] -= 1
+            if not self._waiting[client]:
+                del self._waiting[client]
+        self._record_wait(queued_at)
+        self.counters["admitted"] += 1
+        return True
+
+    def release(self, holds_slot: bool = True) -> None:
+        if not holds_slot:
+            return
+        while self._heap:
+            _, _, start, future = heapq.heappop(self._heap)
+            if not future.done():
+                self._vtime = max(self._vtime, start)
+                future.set_result(None)   # the slot passes straight to them
+                return
+        self.active -= 1
+
+    def _record_wait(self, queued_at: float) -> None:
+        self._wait_ms.append((time.monotonic() - queued_at) * 1000)
+        del self._wait_ms[:-500]
+
+    def guard(self, cost):
+        """
+        A FastAPI dependency admitting the request for the duration of the
+        endpoint. `cost` is a number or async fn(request) → number.
+        """
+        async def dependency(request: Request):
+            estimate = await cost(request) if callable(cost) else cost
+            holds_slot = await self.acquire(client_id(request), estimate)
+            try:
+                yield
+            finally:
+                self.release(holds_slot)
+        return dependency
+
+    def report(self) -> dict:
+        waits = sorted(self._wait_ms)
+        return {
+            **self.counters,
+            "active": self.active,
+            "concurrency": self.concurrency,
+            "queue_depth": sum(self._waiting.values()),
+            "queued_by_client": dict(self._waiting.most_common(10)),
+            "clients": len(self._buckets),
+            "wait_ms_p50": round(waits[len(waits) // 2], 1) if waits else None,
+            "wait_ms_p95": round(waits[int(len(waits) * 0.95)], 1) if waits else None,
+        }
@@ -0,0 +1,241 @@
+"""
+Startup pipeline — schema migrations and seeding, out of the request path.
+
+On boot the API reads the `schema_meta` markers in a single query. If the
+schema and seed versions are current it is ready immediately; otherwise the
+pipeline runs in a background thread (or inline / not at all, see
+RCP_BOOTSTRAP) while /api/ready reports progress.
+
+Run it out-of-band (e.g. as a Fly.io release command):
+    python bootstrap.py            # migrate + seed
+    python bootstrap.py migrate
+    python bootstrap.py seed
+    python bootstrap.py status
+
+Environment:
+    RCP_BOOTSTRAP   background (default) | inline | skip
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+from sqlalchemy import inspect, text
+
+from database import SessionLocal, engine
+import models
+import edges
+import geo
+import resolve
+import retention
+
+log = logging.getLogger("rcp.bootstrap")
+
+# Bump SCHEMA_VERSION and append to MIGRATIONS when the schema changes;
+# bump SEED_VERSION when seed.py data changes.
+SCHEMA_VERSION = 5
+SEED_VERSION = 1
+
+MODE = os.getenv("RCP_BOOTSTRAP", "background")
+
+# Reset by start() to the time the app module began importing
+PROCESS_STARTED = time.perf_counter()
+
+STATUS = {
+    "state": "starting",   # starting | migrating | seeding | ready | failed
+    "error": None,
+    "timings_ms": {},
+}
+
+
+def _mark(step: str, started: float) -> None:
+    STATUS["timings_ms"][step] = round((time.perf_counter() - started) * 1000, 1)
+
+
+# ── Markers ──────────────────────────────────────────────────────────────────
+
+def read_markers() -> dict:
+    """All schema_meta markers in one query; {} when the table doesn't exist yet."""
+    try:
+        with engine.connect() as conn:
+            return {k: v for k, v in conn.execute(text("SELECT key, value FROM schema_meta"))}
+    except Exception:
+        return {}
+
+
+def write_marker(db, key: str, value) -> None:
+    row = db.get(models.SchemaMeta, key)
+    if row is None:
+        db.add(models.SchemaMeta(key=key, value=str(value)))
+    else:
+        row.value = str(value)
+
+
+def is_current(markers: dict) -> bool:
+    return (
+        int(markers.get("schema_version", 0)) >= SCHEMA_VERSION and
+        int(markers.get("seed_version", 0)) >= SEED_VERSION
+    )
+
+
+# ── Migrations ───────────────────────────────────────────────────────────────
+# Each migration upgrades an existing database to `version`. Fresh databases
+# get every table from create_all() and skip straight to SCHEMA_VERSION.
+
+def _backfill_coworker_edges(db) -> None:
+    edges.rebuild_all_edges(db)
+
+
+def _add_person_geo(db) -> None:
+    """persons.city_id / metro_id (see geo.py), backfilled once per distinct location."""
+    columns = {c["name"] for c in inspect(engine).get_columns("persons")}
+    for name in ("city_id", "metro_id"):
+        if name not in columns:
+            db.execute(text(f"ALTER TABLE persons ADD COLUMN {name} INTEGER"))
+        db.execute(text(f"CREATE INDEX IF NOT EXISTS ix_persons_{name} ON persons ({name})"))
+    locations = db.execute(text("SELECT DISTINCT location FROM persons WHERE location IS NOT NULL")).scalars()
+    for location in locations.all():
+        city_id, metro_id = geo.locate(location)
+        if city_id is not None or metro_id is not None:
+            db.execute(
+                text("UPDATE persons SET city_id = :city_id, metro_id = :metro_id WHERE location = :location"),
+                {"city_id": city_id, "metro_id": metro_id, "location": location},
+            )
+
+
+def _partition_interactions(db) -> None:
+    """(person, occurred_at) indexes on interactions; on Postgres, monthly partitions (see retention.py)."""
+    if not retention.partition_interactions(db):
+        for index in models.Interaction.__table__.indexes:
+            index.create(db.connection(), checkfirst=True)
+
+
+def _add_person_name_key(db) -> None:
+    """persons.last_name_key (see resolve.name_key), the blocking key for duplicate checks."""
+    if "last_name_key" not in {c["name"] for c in inspect(engine).get_columns("persons")}:
+        db.execute(text("ALTER TABLE persons ADD COLUMN last_name_key VARCHAR"))
+    db.execute(text("CREATE INDEX IF NOT EXISTS ix_persons_last_name_key ON persons (last_name_key)"))
+    rows = db.execute(text("SELECT id, full_name FROM persons")).all()
+    for person_id, full_name in rows:
+        db.execute(text("UPDATE persons SET last_name_key = :key WHERE id = :id"),
+                   {"key": resolve.name_key(full_name).last or None, "id": person_id})
+
+
+MIGRATIONS = [
+    (2, _backfill_coworker_edges),
+    (3, _add_person_geo),
+    (4, _partition_interactions),
+    (5, _add_person_name_key),
+]
+
+
+def migrate(markers: dict = None) -> None:
+    markers = read_markers() if markers is None else markers
+    existing = models.Person.__tablename__ in inspect(engine).get_table_names()
+    models.Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        if "schema_version" in markers:
+            current = int(markers["schema_version"])
+        else:
+            # Databases from before schema_meta existed are at version 1
+            current = 1 if existing else SCHEMA_VERSION
+            if not existing:
+                retention.partition_interactions(db)   # create_all() can't declare partitioning
+        for version, fn in MIGRATIONS:
+            if version > current:
+                log.info(f"Applying migration {version}: {fn.__name__}")
+                fn(db)
+        write_marker(db, "schema_version", SCHEMA_VERSION)
+        db.commit()
+    finally:
+        db.close()
+
+
+# ── Seeding ──────────────────────────────────────────────────────────────────
+
+def seed(markers: dict = None) -> None:
+    from seed import seed_db
+
+    markers = read_markers() if markers is None else markers
+    if int(markers.get("seed_version", 0)) >= SEED_VERSION:
+        return
+    db = SessionLocal()
+    try:
+        seed_db(db)
+        write_marker(db, "seed_version", SEED_VERSION)
+        db.commit()
+    finally:
+        db.close()
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────────
+
+def run_pipeline(markers: dict = None) -> None:
+    markers = read_markers() if markers is None else markers
+    try:
+        if int(markers.get("schema_version", 0)) < SCHEMA_VERSION:
+            STATUS["state"] = "migrating"
+            started = time.perf_counter()
+            migrate(markers)
+            _mark("migrate", started)
+        if int(markers.get("seed_version", 0)) < SEED_VERSION:
+            STATUS["state"] = "seeding"
+            started = time.perf_counter()
+            seed(markers)
+            _mark("seed", started)
+        STATUS["state"] = "ready"
+    except Exception as e:
+        log.exception("Startup pipeline failed")
+        STATUS["state"] = "failed"
+        STATUS["error"] = str(e)
+    _mark("ready", PROCESS_STARTED)
+
+
+def start(process_started: float = None) -> None:
+    """Called from the app's startup hook; never blocks on work that isn't needed."""
+    global PROCESS_STARTED
+    if process_started is not None:
+        PROCESS_STARTED = process_started
+        _mark("import", process_started)
+    started = time.perf_counter()
+    markers = read_markers()
+    _mark("marker_check", started)
+
+    if is_current(markers) or MODE == "skip":
+        STATUS["state"] = "ready"
+        _mark("ready", PROCESS_STARTED)
+    elif MODE == "inline":
+        run_pipeline(markers)
+    else:
+        threading.Thread(target=run_pipeline, args=(markers,), name="rcp-bootstrap", daemon=True).start()
+
+    log.info(f"Startup: state={STATUS['state']} timings={STATUS['timings_ms']}")
+
+
+def is_ready() -> bool:
+    return STATUS["state"] == "ready"
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "all"
+    if command == "status":
+        markers = read_markers()
+        print(f"markers={markers} current={is_current(markers)} "
+              f"(schema {SCHEMA_VERSION}, seed {SEED_VERSION})")
+        sys.exit(0)
+
+    if command == "migrate":
+        migrate()
+    elif command == "seed":
+        seed()
+    elif command == "all":
+        run_pipeline()
+        if STATUS["state"] != "ready":
+            sys.exit(f"❌ {STATUS['error']}")
+    else:
+        sys.exit(f"Unknown command '{command}'. Use migrate | seed | all | status.")
+    print(f"✅ {command} done")
@@ -0,0 +1,304 @@
+"""
+Change capture for scoring inputs.
+
+A SQLAlchemy after_flush hook records which people and orgs a write touched
+(Person, Role, Education, Interaction, InteractionRollup, Organization).
+They're published to an in-process queue once the transaction commits (a
+rollback drops them). A consumer thread drains the queue, coalescing
+whatever has piled up into one Change, and runs the registered handlers on
+it in one session — refreshing coworker edges, rescoring cached pairs,
+flagging the snapshot — so a write doesn't pay for any of that and nothing
+downstream is thrown away wholesale.
+
+Capture is per process. With several workers (gunicorn.conf.py), each
+worker appends the changes it handled to a shared log (shared_cache.py) and
+replays the others' through the handlers subscribed with remote=True, a poll
+interval later. Handlers that write to the database (edges) only run in the
+worker that made the change, and it logs the change after they've committed.
+Bulk Core inserts (db.execute(table.insert(), rows)) bypass the ORM and
+aren't captured.
+
+Environment:
+    RCP_SCORE_CACHE_MAX   targets kept in the connectivity ScoreCache (default: 5000)
+    RCP_CHANGE_POLL_S     how often other workers' changes are picked up (default: 0.5)
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, inspect
+
+import models
+
+log = logging.getLogger("rcp.changes")
+
+SCORE_CACHE_MAX = int(os.getenv("RCP_SCORE_CACHE_MAX", "5000"))
+CHANGE_POLL_S = float(os.getenv("RCP_CHANGE_POLL_S", "0.5"))
+
+
+@dataclass
+class Change:
+    person_ids: set = field(default_factory=set)
+    org_ids: set = field(default_factory=set)
+
+    def merge(self, other: "Change") -> None:
+        self.person_ids |= other.person_ids
+        self.org_ids |= other.org_ids
+
+    def __bool__(self):
+        return bool(self.person_ids or self.org_ids)
+
+
+# Columns whose old and new values both count as touched, per model
+_PERSON_COLUMNS = {
+    models.Person: ("id",),
+    models.Role: ("person_id",),
+    models.Education: ("person_id",),
+    models.Interaction: ("internal_person_id", "external_person_id"),
+    models.InteractionRollup: ("internal_person_id", "external_person_id"),
+}
+_ORG_COLUMNS = {
+    models.Organization: ("id",),
+    models.Role: ("org_id",),
+}
+
+
+def _values(obj, column: str):
+    history = inspect(obj).attrs[column].history
+    return [v for v in (*history.added, *history.unchanged, *history.deleted) if v is not None]
+
+
+def _capture(session, flush_context) -> None:
+    change = session.info.setdefault("rcp_change", Change())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        for column in _PERSON_COLUMNS.get(type(obj), ()):
+            change.person_ids.update(_values(obj, column))
+        for column in _ORG_COLUMNS.get(type(obj), ()):
+            change.org_ids.update(_values(obj, column))
+
+
+class ChangeFeed:
+    """The queue between the capture hook and the consumer thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.handlers = {}       # name → (fn(db, change), runs for other workers' changes)
+        self.generation = 0      # bumped on every publish and after each handler; see ScoreCache.put
+        self.counters = {"published": 0, "batches": 0, "remote": 0, "errors": 0}
+        self.last_batch_ms = None
+        self.shared = None       # shared_cache.ChangeLog when running with several workers
+        self._installed = False
+        self._thread = None
+
+    def install(self, session_factory, ready=lambda: True, shared=None) -> None:
+        """
+        Capture on sessions made by `session_factory` once `ready()` (skips
+        bootstrap seeding). With a `shared` ChangeLog, exchange changes with
+        the other workers.
+        """
+        if self._installed:
+            return
+        self._installed = True
+        self.shared = shared
+        if shared:
+            shared.read()   # start from the end of the log
+
+        @event.listens_for(session_factory, "after_flush")
+        def after_flush(session, flush_context):
+            if ready() and not session.info.get("rcp_consumer"):
+                _capture(session, flush_context)
+
+        @event.listens_for(session_factory, "after_commit")
+        def after_commit(session):
+            change = session.info.pop("rcp_change", None)
+            if change:
+                self.publish(change)
+
+        @event.listens_for(session_factory, "after_rollback")
+        def after_rollback(session):
+            session.info.pop("rcp_change", None)
+
+    def subscribe(self, name: str, handler, remote: bool = True) -> None:
+        """
+        handler(db, change) runs on the consumer thread, in registration order.
+        remote=False: only for this process's own writes (e.g. handlers that
+        write derived rows, which the writing worker already did).
+        """
+        self.handlers[name] = (handler, remote)
+
+    def publish(self, change: Change) -> None:
+        self.generation += 1
+        self.counters["published"] += 1
+        self.queue.put(change)
+
+    def start(self, session_factory) -> threading.Thread:
+        if self._thread and self._thread.is_alive():
+            return self._thread
+
+        def loop():
+            while True:
+                try:
+                    change = self.queue.get(timeout=CHANGE_POLL_S if self.shared else None)
+                    taken = 1
+                except queue.Empty:
+                    change, taken = Change(), 0
+                while True:   # coalesce whatever else is already waiting
+                    try:
+                        change.merge(self.queue.get_nowait())
+                        taken += 1
+                    except queue.Empty:
+                        break
+                try:
+                    if change:
+                        self._apply(session_factory, change)
+                        if self.shared:
+                            self._share(change)
+                    if self.shared:
+                        self._replay(session_factory)
+                finally:
+                    for _ in range(taken):
+                        self.queue.task_done()
+
+        self._thread = threading.Thread(target=loop, name="rcp-changes", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _share(self, change: Change) -> None:
+        try:
+            self.shared.append(change)
+        except Exception:
+            self.counters["errors"] += 1
+            log.exception(f"Couldn't log {change} for the other workers")
+
+    def _replay(self, session_factory) -> None:
+        try:
+            remote = Change()
+            for person_ids, org_ids in self.shared.read():
+                remote.merge(Change(person_ids, org_ids))
+        except Exception:
+            self.counters["errors"] += 1
+            log.exception("Couldn't read the shared change log")
+            return
+        if remote:
+            self.generation += 1   # like publish(): results read before this may be stale
+            self.counters["remote"] += 1
+            self._apply(session_factory, remote, remote=True)
+
+    def _apply(self, session_factory, change: Change, remote: bool = False) -> None:
+        started = time.perf_counter()
+        db = session_factory()
+        db.info["rcp_consumer"] = True   # our own writes (edges) aren't changes
+        try:
+            for name, (handler, runs_remote) in self.handlers.items():
+                if remote and not runs_remote:
+                    continue
+                try:
+                    handler(db, change)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    self.counters["errors"] += 1
+                    log.exception(f"Change handler '{name}' failed for {change}")
+                # A result read before this handler's writes (e.g. edges) may be
+                # stale even if a later handler has already looked at the cache
+                self.generation += 1
+        finally:
+            db.close()
+        self.counters["batches"] += 1
+        self.last_batch_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Block until everything published so far has been handled."""
+        done = threading.Event()
+        threading.Thread(target=lambda: (self.queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def report(self) -> dict:
+        return {**self.counters, "pending": self.queue.qsize(), "last_batch_ms": self.last_batch_ms,
+                "running": bool(self._thread and self._thread.is_alive()), "shared": self.shared is not None}
+
+
+class ScoreCache:
+    """
+    Default-context connectivity per target: {target_id: (target, {sp_id: result})}
+    with people stored as records, LRU-bounded. Entries are for one scoring
+    date; the whole cache resets when the default context rolls over.
+    """
+
+    def __init__(self, max_targets: int = SCORE_CACHE_MAX):
+        self.max_targets = max_targets
+        self.counters = {"hits": 0, "misses": 0, "rescored_pairs": 0, "dropped": 0}
+        self._entries = OrderedDict()
+        self._as_of = None
+        self._lock = threading.Lock()
+
+    def _check_date(self, ctx) -> None:
+        if ctx.as_of != self._as_of:
+            self._entries.clear()
+            self._as_of = ctx.as_of
+
+    def get(self, target_id, ctx):
+        with self._lock:
+            self._check_date(ctx)
+            entry = self._entries.get(target_id)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(target_id)
+            self.counters["hits"] += 1
+            return entry[0], sorted(entry[1].values(), key=lambda r: r.sp_member.id)
+
+    def put(self, target, results, ctx, generation: int, feed: ChangeFeed) -> None:
+        """Store unless a change was published since `generation` (the read may be stale)."""
+        with self._lock:
+            self._check_date(ctx)
+            if generation != feed.generation:
+                return
+            self._entries[target.id] = (target, {r.sp_member.id: r for r in results})
+            self._entries.move_to_end(target.id)
+            while len(self._entries) > self.max_targets:
+                self._entries.popitem(last=False)
+
+    def target_ids(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def has_member(self, member_id) -> bool:
+        with self._lock:
+            return any(member_id in by_member for _, by_member in self._entries.values())
+
+    def replace_target(self, target_id, target=None, results=None) -> None:
+        """Swap in freshly scored results for a target, or drop it (target=None)."""
+        with self._lock:
+            if target is None:
+                if self._entries.pop(target_id, None) is not None:
+                    self.counters["dropped"] += 1
+                return
+            if target_id in self._entries:
+                self._entries[target_id] = (target, {r.sp_member.id: r for r in results})
+                self.counters["rescored_pairs"] += len(results)
+
+    def replace_member(self, member_id, results_by_target: dict) -> None:
+        """Swap in one SP member's freshly scored results for the given cached targets."""
+        with self._lock:
+            for target_id, result in results_by_target.items():
+                if target_id in self._entries:
+                    self._entries[target_id][1][member_id] = result
+                    self.counters["rescored_pairs"] += 1
+
+    def drop_member(self, member_id) -> None:
+        """Remove someone who is no longer an SP member (or no longer exists) everywhere."""
+        with self._lock:
+            for _, by_member in self._entries.values():
+                by_member.pop(member_id, None)
+
+    def report(self) -> dict:
+        with self._lock:
+            return {**self.counters, "targets": len(self._entries)}
+
+
+FEED = ChangeFeed()
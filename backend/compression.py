@@ -0,0 +1,113 @@
+"""
+Response compression for both apps.
+
+Brotli is used when the client accepts it and the optional `brotli` package
+is installed, gzip otherwise. Only text-like responses (JSON, HTML, JS, CSS)
+of at least RCP_COMPRESS_MIN_BYTES are compressed; smaller bodies aren't worth
+the CPU. Streaming responses such as the snapshot export pass through
+untouched. Bodies over a megabyte are compressed in the threadpool so the
+event loop keeps serving.
+
+Environment:
+    RCP_COMPRESS_MIN_BYTES   smallest body worth compressing (default: 1024)
+    RCP_GZIP_LEVEL           gzip level (default: 6)
+    RCP_BROTLI_QUALITY       brotli quality (default: 5)
+"""
+import gzip
+import os
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:     # optional: gzip only
+    brotli = None
+
+MIN_BYTES = int(os.getenv("RCP_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("RCP_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RCP_BROTLI_QUALITY", "5"))
+THREADPOOL_BYTES = 1 << 20
+
+COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+COUNTERS = {"responses": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def _accepted(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(accept_encoding: str):
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def report() -> dict:
+    saved = 1 - COUNTERS["bytes_out"] / COUNTERS["bytes_in"] if COUNTERS["bytes_in"] else None
+    return {**COUNTERS, "saved": round(saved, 3) if saved is not None else None,
+            "encodings": ["br", "gzip"] if brotli is not None else ["gzip"]}
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message     # held until we've seen the body
+                return
+            if passthrough:
+                return await send(message)
+            if message["type"] != "http.response.body":
+                passthrough = True
+                await send(start)
+                return await send(message)
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (message.get("more_body") or "content-encoding" in headers or len(body) < self.minimum_size
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE)):
+                passthrough = True   # streamed, already encoded, small or binary
+                await send(start)
+                return await send(message)
+
+            compressed = (await run_in_threadpool(compress, body, encoding) if len(body) > THREADPOOL_BYTES
+                          else compress(body, encoding))
+            COUNTERS["responses"] += 1
+            COUNTERS["bytes_in"] += len(body)
+            COUNTERS["bytes_out"] += len(compressed)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,177 @@
+"""
+Co-worker edges — precomputed "these two people overlapped at org X".
+
+Edges are derived from non-board Role rows with a sweep-line over each org's
+roles sorted by start year, and refreshed only for orgs whose roles changed —
+or, after a write to a few people, only for pairs involving them.
+Scoring and graph queries read the `coworker_edges` table instead of
+comparing Role rows pairwise.
+
+Rebuild everything:  python edges.py
+"""
+import heapq
+from collections import defaultdict
+from datetime import date
+
+from intervals import IntervalIndex
+from models import Role, CoworkerEdge
+
+
+def _rank(edge: tuple) -> tuple:
+    """A pair sharing several roles keeps the longest overlap, then the most recent (current beats ended)."""
+    overlap_years, _, last_year = edge
+    return overlap_years, last_year is None, last_year or 0
+
+
+def compute_org_edges(roles, current_year: int = None) -> dict:
+    """
+    Sweep-line over one org's roles.
+    Returns {(person_a_id, person_b_id): (overlap_years, first_year, last_year)}
+    keeping the longest (then latest) overlap when a pair shares several roles
+    at the org.
+    last_year is None while both roles are still current.
+    """
+    current_year = current_year or date.today().year
+    spans = sorted(
+        (r.start_year or 0, r.end_year or current_year, r.person_id, r.end_year is None)
+        for r in roles if not r.is_board
+    )
+
+    edges = {}
+    active = []  # heap of (end, person_id, is_current)
+    for start, end, person_id, is_current in spans:
+        # Roles that ended on or before this start can no longer overlap anything
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        for a_end, a_person_id, a_current in active:
+            if a_person_id == person_id:
+                continue
+            overlap_end = min(end, a_end)
+            overlap_years = overlap_end - start
+            if overlap_years <= 0:
+                continue
+            key = (min(person_id, a_person_id), max(person_id, a_person_id))
+            edge = (overlap_years, start, None if is_current and a_current else overlap_end)
+            if key not in edges or _rank(edge) > _rank(edges[key]):
+                edges[key] = edge
+
+        heapq.heappush(active, (end, person_id, is_current))
+    return edges
+
+
+def compute_person_edges(roles, person_ids, current_year: int = None) -> dict:
+    """
+    compute_org_edges() restricted to pairs involving `person_ids`: each of
+    their roles looks up the roles overlapping it in an IntervalIndex, so this
+    is O(n log n + their roles × (log n + k)) instead of every overlapping pair.
+    Ties between a pair's overlaps are broken by _rank(), so the same one wins.
+    """
+    current_year = current_year or date.today().year
+    spans = sorted(
+        (r.start_year or 0, r.end_year or current_year, r.person_id, r.end_year is None)
+        for r in roles if not r.is_board
+    )
+    index = IntervalIndex((start, end, i) for i, (start, end, _, _) in enumerate(spans))
+    visits = set()   # (later span, earlier span) — the sweep meets the pair at the later start
+    for i, (start, end, person_id, _) in enumerate(spans):
+        if person_id not in person_ids:
+            continue
+        for j in index.overlapping(start, end):
+            if spans[j][2] != person_id:
+                visits.add((max(i, j), min(i, j)))
+
+    edges = {}
+    for later, earlier in sorted(visits):
+        start, end, person_id, is_current = spans[later]
+        a_end, a_person_id, a_current = spans[earlier][1:]
+        overlap_years = min(end, a_end) - start
+        if overlap_years <= 0:
+            continue
+        key = (min(person_id, a_person_id), max(person_id, a_person_id))
+        edge = (overlap_years, start, None if is_current and a_current else min(end, a_end))
+        if key not in edges or _rank(edge) > _rank(edges[key]):
+            edges[key] = edge
+    return edges
+
+
+def refresh_org_edges(db, org_ids, person_ids=None) -> int:
+    """
+    Recompute edges for the given orgs — only those involving `person_ids`
+    when given. Flushes but does not commit.
+    """
+    org_ids = list(set(org_ids))
+    if not org_ids:
+        return 0
+
+    stale = db.query(CoworkerEdge).filter(CoworkerEdge.org_id.in_(org_ids))
+    if person_ids is not None:
+        person_ids = set(person_ids)
+        stale = stale.filter(CoworkerEdge.person_a_id.in_(person_ids) | CoworkerEdge.person_b_id.in_(person_ids))
+    stale.delete(synchronize_session=False)
+
+    roles_by_org = defaultdict(list)
+    for role in db.query(Role).filter(Role.org_id.in_(org_ids), Role.is_board == False):
+        roles_by_org[role.org_id].append(role)
+
+    current_year = date.today().year
+    rows = []
+    for org_id, roles in roles_by_org.items():
+        org_edges = (compute_org_edges(roles, current_year) if person_ids is None
+                     else compute_person_edges(roles, person_ids, current_year))
+        for (a, b), (overlap_years, first_year, last_year) in org_edges.items():
+            rows.append({
+                "person_a_id": a,
+                "person_b_id": b,
+                "org_id": org_id,
+                "overlap_years": overlap_years,
+                "first_overlap_year": first_year,
+                "last_overlap_year": last_year,
+            })
+
+    if rows:
+        db.execute(CoworkerEdge.__table__.insert(), rows)
+    db.flush()
+    return len(rows)
+
+
+def rebuild_all_edges(db) -> int:
+    org_ids = [org_id for (org_id,) in db.query(Role.org_id).distinct()]
+    return refresh_org_edges(db, org_ids)
+
+
+def load_pair_edges(db, sp_ids, target_ids) -> dict:
+    """
+    Edges between any SP member and any target, in one query.
+    Returns {(sp_id, target_id): {org_id: CoworkerEdge}}.
+    """
+    sp_ids, target_ids = list(sp_ids), list(target_ids)
+    pairs = defaultdict(dict)
+    if not sp_ids or not target_ids:
+        return pairs
+
+    query = db.query(CoworkerEdge).filter(
+        (CoworkerEdge.person_a_id.in_(sp_ids) & CoworkerEdge.person_b_id.in_(target_ids)) |
+        (CoworkerEdge.person_a_id.in_(target_ids) & CoworkerEdge.person_b_id.in_(sp_ids))
+    )
+    sp_set = set(sp_ids)
+    for edge in query:
+        if edge.person_a_id in sp_set:
+            pairs[(edge.person_a_id, edge.person_b_id)][edge.org_id] = edge
+        if edge.person_b_id in sp_set:
+            pairs[(edge.person_b_id, edge.person_a_id)][edge.org_id] = edge
+    return pairs
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, engine
+    import models
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        count = rebuild_all_edges(db)
+        db.commit()
+        print(f"✅ Rebuilt {count} co-worker edges")
+    finally:
+        db.close()
@@ -0,0 +1,128 @@
+"""
+Location normalization against the bundled offline gazetteer (data/).
+
+    locate("SF")                       → (1, 1)    San Francisco, Bay Area
+    locate("Palo Alto, California")    → (4, 1)
+    locate("San Francisco Bay Area")   → (None, 1) metro only
+    locate("Somewhere, XY")            → (None, None)
+
+data/cities.csv holds cities with coordinates and aliases; data/metros.csv
+holds metro areas as a center and a radius. A city belongs to the nearest
+metro whose radius covers it. Person.city_id / metro_id are set from this
+when the location is written, so the location signal compares integers.
+"""
+import csv
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+_PUNCT = re.compile(r"[^\w\s-]")
+_SPACES = re.compile(r"\s+")
+
+COUNTRY_NAMES = {
+    "US": "united states|united states of america|usa", "GB": "united kingdom|uk|great britain",
+    "CA": "canada", "FR": "france", "IL": "israel", "IN": "india", "IE": "ireland", "SG": "singapore",
+    "AU": "australia", "DE": "germany", "HK": "hong kong", "JP": "japan",
+}
+
+
+def _norm(text: str) -> str:
+    return _SPACES.sub(" ", _PUNCT.sub("", text.lower())).strip()
+
+
+def distance_km(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle distance (haversine)."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+class Gazetteer:
+    def __init__(self, data_dir: Path = DATA_DIR):
+        with open(data_dir / "metros.csv", newline="", encoding="utf-8") as f:
+            self.metros = {int(row["metro_id"]): row for row in csv.DictReader(f)}
+        with open(data_dir / "cities.csv", newline="", encoding="utf-8") as f:
+            self.cities = {int(row["city_id"]): row for row in csv.DictReader(f)}
+
+        self.metro_of = {city_id: self._nearest_metro(city) for city_id, city in self.cities.items()}
+
+        self.metro_names = {}    # normalized alias → metro_id
+        for metro_id, metro in self.metros.items():
+            for alias in [metro["name"], *metro["aliases"].split("|")]:
+                if alias:
+                    self.metro_names.setdefault(_norm(alias), metro_id)
+
+        self.places = {}         # city_id → every normalized way to name its region/country
+        self.city_names = {}     # normalized name/alias → [city_id, ...] in file order
+        for city_id, city in self.cities.items():
+            self.places[city_id] = {_norm(city["region"]), _norm(city["region_name"]), _norm(city["country"]),
+                                    *COUNTRY_NAMES.get(city["country"], "").split("|")}
+            for alias in [city["name"], *city["aliases"].split("|")]:
+                if alias and city_id not in self.city_names.get(_norm(alias), []):
+                    self.city_names.setdefault(_norm(alias), []).append(city_id)
+        self.known_places = set().union(*self.places.values()) - {""}
+
+    def _nearest_metro(self, city):
+        lat, lon = float(city["lat"]), float(city["lon"])
+        best = None
+        for metro_id, metro in self.metros.items():
+            d = distance_km(lat, lon, float(metro["lat"]), float(metro["lon"]))
+            if d <= float(metro["radius_km"]) and (best is None or d < best[0]):
+                best = (d, metro_id)
+        return best[1] if best else None
+
+    def _city(self, name: str, qualifiers: list):
+        candidates = self.city_names.get(name)
+        if not candidates:
+            return None
+        known = self.known_places
+        for q in qualifiers:   # "Portland, ME" — pick by state/region/country
+            for city_id in candidates:
+                if q in self.places[city_id]:
+                    return city_id
+        if any(q in known for q in qualifiers):
+            return None        # "Cambridge, United Kingdom" isn't Cambridge, MA
+        return candidates[0]
+
+    def locate(self, location):
+        """(city_id, metro_id) for a free-text location; Nones where unknown."""
+        if not location or not location.strip():
+            return None, None
+        whole = _norm(location)
+        if whole in self.metro_names:
+            return None, self.metro_names[whole]
+        parts = [_norm(p) for p in location.split(",") if _norm(p)]
+        for name in ([whole] if "," in location else []) + parts[:1]:
+            city_id = self._city(name, parts[1:])
+            if city_id is not None:
+                return city_id, self.metro_of[city_id]
+        # "Greater Boston, MA" / "San Francisco Bay Area, CA"
+        if parts and parts[0] in self.metro_names:
+            return None, self.metro_names[parts[0]]
+        return None, None
+
+    def city_name(self, city_id) -> str:
+        city = self.cities.get(city_id)
+        return f"{city['name']}, {city['region']}" if city else ""
+
+    def metro_name(self, metro_id) -> str:
+        metro = self.metros.get(metro_id)
+        return metro["name"] if metro else ""
+
+
+@lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    return Gazetteer()
+
+
+@lru_cache(maxsize=20000)
+def locate(location):
+    return gazetteer().locate(location)
+
+
+def metro_name(metro_id) -> str:
+    return gazetteer().metro_name(metro_id)
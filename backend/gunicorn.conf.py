@@ -0,0 +1,71 @@
+"""
+Production runner for both apps:
+
+    gunicorn -c gunicorn.conf.py main:app      # RCP API
+    gunicorn -c gunicorn.conf.py server:app    # connection finder
+
+Uvicorn workers, one per CPU by default. Scoring is CPU-bound Python, so
+more workers than cores only adds contention. The app is imported once in
+the master, and its preload() runs there before forking: migrations and
+seeding happen once, and read-only data is shared copy-on-write. Workers are
+recycled after RCP_MAX_REQUESTS requests (with jitter, so they don't all
+restart together) and drain their change feed on the way out.
+
+Caches stay per worker. They're kept consistent through a small SQLite
+database on tmpfs (shared_cache.py), created fresh for each master.
+
+Environment:
+    PORT                  listen port (default: 8000)
+    WEB_CONCURRENCY       worker processes (default: CPU count)
+    RCP_MAX_REQUESTS      requests before a worker is recycled; 0 = never (default: 2000)
+    RCP_WORKER_TIMEOUT_S  seconds a request may block a worker (default: 120)
+    RCP_SHARED_DIR        directory for the shared cache (default: a new one under /dev/shm)
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+max_requests = int(os.getenv("RCP_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv("RCP_WORKER_TIMEOUT_S", "120"))   # find-connections can take a minute
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+# Apps size per-process limits from this (admission.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Workers are the parallelism; don't also give each one a scoring process pool
+if workers > 1:
+    os.environ.setdefault("RCP_SCORING_PROCESSES", "1")
+
+# Set before the app is imported, so shared_cache sees it in the master and every worker
+_shared_dir = None
+if "RCP_SHARED_DIR" not in os.environ:
+    _shared_dir = tempfile.mkdtemp(prefix="rcp-shared-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.environ["RCP_SHARED_DIR"] = _shared_dir
+
+
+def on_starting(server):
+    # preload_app has already imported the app module
+    module = sys.modules.get(server.app.app_uri.split(":")[0])
+    preload = getattr(module, "preload", None)
+    if preload:
+        server.log.info(f"Running {module.__name__}.preload()")
+        preload()
+
+
+def post_fork(server, worker):
+    database = sys.modules.get("database")
+    if database is not None:
+        database.engine.dispose(close=False)   # the master's pooled connections belong to the master
+
+
+def on_exit(server):
+    if _shared_dir:
+        shutil.rmtree(_shared_dir, ignore_errors=True)
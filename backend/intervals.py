@@ -0,0 +1,138 @@
+"""
+Interval index over roles — "who was at org X during [a, b]" without
+comparing every pair of roles.
+
+IntervalIndex is a static centered interval tree over half-open
+[start, end) year intervals; overlapping(a, b) is O(log n + k). Current roles
+(end_year NULL) are stored with end = OPEN once, when the index is built, so
+queries never substitute today's year. Unknown start years count as 0, like
+edges.py.
+
+RoleIndexes keeps one index per org, built on first use from that org's
+roles and invalidated by the change feed (changes.py) when they change.
+
+Environment:
+    RCP_ROLE_INDEX_MAX   orgs kept indexed, least recently used evicted (default: 2000)
+"""
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+OPEN = float("inf")
+
+ROLE_INDEX_MAX = int(os.getenv("RCP_ROLE_INDEX_MAX", "2000"))
+
+RoleSpan = namedtuple("RoleSpan", "person_id title start_year end_year is_board")
+
+
+class IntervalIndex:
+    """Centered interval tree. Build once from (start, end, payload); empty intervals are dropped."""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals):
+        intervals = [iv for iv in intervals if iv[0] < iv[1]]
+        self.left = self.right = None
+        if not intervals:
+            self.center, self.by_start, self.by_end = None, [], []
+            return
+        starts = sorted(iv[0] for iv in intervals)
+        self.center = center = starts[len(starts) // 2]   # a start, so never OPEN
+        here, left, right = [], [], []
+        for iv in intervals:
+            if iv[1] <= center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        self.by_start = sorted(here, key=lambda iv: iv[0])
+        self.by_end = sorted(here, key=lambda iv: iv[1], reverse=True)
+        if left:
+            self.left = IntervalIndex(left)
+        if right:
+            self.right = IntervalIndex(right)
+
+    def overlapping(self, start, end) -> list:
+        """Payloads of intervals overlapping [start, end)."""
+        out = []
+        node_stack = [self]
+        while node_stack:
+            node = node_stack.pop()
+            if node.center is None:
+                continue
+            if end <= node.center:
+                # Everything here ends after center >= end > start; need start < end
+                for iv in node.by_start:
+                    if iv[0] >= end:
+                        break
+                    out.append(iv[2])
+                if node.left:
+                    node_stack.append(node.left)
+            elif start > node.center:
+                for iv in node.by_end:
+                    if iv[1] <= start:
+                        break
+                    out.append(iv[2])
+                if node.right:
+                    node_stack.append(node.right)
+            else:
+                out.extend(iv[2] for iv in node.by_start)
+                if node.left:
+                    node_stack.append(node.left)
+                if node.right:
+                    node_stack.append(node.right)
+        return out
+
+
+def role_interval(start_year, end_year):
+    """[start, end) for a role; a role that starts and ends in one year covers that year."""
+    start = start_year or 0
+    if end_year is None:
+        return start, OPEN
+    return start, max(end_year, start + 1)
+
+
+class RoleIndexes:
+    """Per-org IntervalIndex of RoleSpans (board seats included), LRU-bounded."""
+
+    def __init__(self, max_orgs: int = ROLE_INDEX_MAX):
+        self.max_orgs = max_orgs
+        self.counters = {"hits": 0, "builds": 0, "invalidations": 0}
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db, org_id) -> IntervalIndex:
+        with self._lock:
+            index = self._indexes.get(org_id)
+            if index is not None:
+                self._indexes.move_to_end(org_id)
+                self.counters["hits"] += 1
+                return index
+        from models import Role
+        rows = db.query(Role.person_id, Role.title, Role.start_year, Role.end_year, Role.is_board).filter(
+            Role.org_id == org_id
+        )
+        index = IntervalIndex(
+            (*role_interval(start, end), RoleSpan(person_id, title, start, end, bool(is_board)))
+            for person_id, title, start, end, is_board in rows
+        )
+        with self._lock:
+            self.counters["builds"] += 1
+            self._indexes[org_id] = index
+            while len(self._indexes) > self.max_orgs:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, org_ids=None) -> None:
+        with self._lock:
+            if org_ids is None:
+                self._indexes.clear()
+                return
+            for org_id in org_ids:
+                if self._indexes.pop(org_id, None) is not None:
+                    self.counters["invalidations"] += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            return {**self.counters, "orgs": len(self._indexes)}
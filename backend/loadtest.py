@@ -0,0 +1,394 @@
+"""
+Load test and latency SLO report for both apps.
+
+Starts main:app and server:app under gunicorn (gunicorn.conf.py) against
+DATABASE_URL, then runs each scenario with 1, 8, 32 … concurrent virtual
+users. It's a closed loop: each user sends its next request as soon as the
+last one returns. Reports throughput and p50/p95/p99 latency per step, and
+the most users each scenario served with p95 inside its SLO and under 1%
+failed (errors + 429s). A scenario stops escalating at the first step that
+misses, unless --all-steps.
+
+    python loadtest.py                                  # everything
+    python loadtest.py --scenarios typeahead connectivity --users 1 16 64
+    python loadtest.py --org-sizes 20 200 2000 --duration 20 --workers 2
+    python loadtest.py --compare loadtest-results/1a2b3c4d5e.json
+
+Scenarios:
+    typeahead          GET  /api/people?q=  (2–4 letters of someone's name)
+    connectivity       GET  /api/connectivity?target_id=  (random external person)
+    company-<N>        GET  /api/connectivity/company?format=compact, an org with about N people
+    find-connections   POST /api/find-connections?refresh=true, searches answered by the
+                       fixture provider after SP_SEARCH_LATENCY_MS (default here: 300 ± 200)
+
+find-connections never touches the network. It replays fixtures from
+--fixtures, and companies that don't have any yet are first recorded from
+the local provider (our own persons table). Each virtual user sends its own
+client id (RCP_CLIENT_IP_HEADER), so admission sees separate clients and
+queues them fairly. Token bucket rates are raised out of the way unless
+--rate-limits is given; 429s count as failures either way.
+
+Results go to loadtest-results/<git sha>.json along with whether the tree
+was dirty, the host and the settings, so runs on different commits can be
+compared with --compare. Point DATABASE_URL at a populated database (e.g.
+one built with seed.py) that's already migrated (python bootstrap.py): the
+apps start with RCP_BOOTSTRAP=skip, so it's only read.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import func
+
+from scaling import HERE, free_port, start_app, wait_ready
+
+CLIENT_HEADER = "X-Loadtest-Client"
+ERROR_BUDGET = 0.01
+RESULTS_DIR = HERE / "loadtest-results"
+DEFAULT_FIXTURES = HERE / "fixtures" / "loadtest"
+
+# p95 targets in ms; company-<N> falls back to "company"
+SLO_P95_MS = {
+    "typeahead": 200,
+    "connectivity": 500,
+    "company": 3000,
+    "find-connections": 30000,
+}
+
+# Token buckets big enough never to matter (see --rate-limits)
+UNLIMITED = {f"{prefix}_{name}": value for prefix in ("RCP", "SP")
+             for name, value in (("RATE_PER_S", "1000000"), ("RATE_BURST", "1000000000"))}
+
+APPS = {"main:app": "/api/ready", "server:app": "/api/health"}
+
+
+# ── Test data ────────────────────────────────────────────────────────────────
+
+def graph_sample(org_sizes: list, finder_companies: int) -> dict:
+    """Names, external ids and orgs picked by size from DATABASE_URL."""
+    from database import SessionLocal
+    import models
+
+    db = SessionLocal()
+    try:
+        names, external_ids = [], []
+        for name, person_id, is_internal in db.query(models.Person.full_name, models.Person.id, models.Person.is_internal):
+            names.append(name)
+            if not is_internal:
+                external_ids.append(person_id)
+        org_counts = db.query(
+            models.Organization.linkedin_slug, func.count(func.distinct(models.Role.person_id))
+        ).join(models.Role, models.Role.org_id == models.Organization.id).filter(
+            models.Organization.linkedin_slug.isnot(None)
+        ).group_by(models.Organization.id).all()
+    finally:
+        db.close()
+    if not external_ids or not org_counts:
+        sys.exit("DATABASE_URL has no people or orgs with LinkedIn slugs; seed it first (python seed.py)")
+
+    by_size = sorted(org_counts, key=lambda c: -c[1])
+    return {
+        "names": names,
+        "external_ids": external_ids,
+        "orgs": {size: min(org_counts, key=lambda c: abs(c[1] - size)) for size in org_sizes},
+        "finder_slugs": [slug for slug, _ in by_size[:finder_companies]],
+    }
+
+
+def _prefix(names: list) -> str:
+    word = random.choice(random.choice(names).split() or ["a"])
+    return word[:random.randint(2, 4)]
+
+
+# ── Scenarios ────────────────────────────────────────────────────────────────
+# Each returns (app, fn(client, headers) making one request)
+
+def _typeahead(sample: dict):
+    return "main:app", lambda client, headers: client.get(
+        "/api/people", params={"q": _prefix(sample["names"])}, headers=headers)
+
+
+def _connectivity(sample: dict):
+    return "main:app", lambda client, headers: client.get(
+        "/api/connectivity", params={"target_id": random.choice(sample["external_ids"])}, headers=headers)
+
+
+def _company(size: int):
+    def setup(sample: dict):
+        slug, _ = sample["orgs"][size]
+        return "main:app", lambda client, headers: client.get(
+            "/api/connectivity/company", params={"linkedin_slug": slug, "format": "compact"}, headers=headers)
+    return setup
+
+
+def _find_connections(sample: dict):
+    slugs = sample["finder_slugs"]
+    return "server:app", lambda client, headers: client.post(
+        "/api/find-connections", params={"refresh": "true"},
+        json={"url": f"https://www.linkedin.com/company/{random.choice(slugs)}"}, headers=headers)
+
+
+def scenarios(org_sizes: list) -> dict:
+    found = {"typeahead": _typeahead, "connectivity": _connectivity}
+    found.update({f"company-{size}": _company(size) for size in org_sizes})
+    found["find-connections"] = _find_connections
+    return found
+
+
+def slo_ms(name: str, overrides: dict) -> float:
+    base = name.split("-")[0] if name.startswith("company-") else name
+    return overrides.get(name, overrides.get(base, SLO_P95_MS[base]))
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+
+def _database_key() -> str:
+    from database import DATABASE_URL
+    return hashlib.sha1(DATABASE_URL.encode()).hexdigest()[:12]   # no credentials on disk
+
+
+async def _record(base_url: str, slugs: list, companies: dict) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        await wait_ready(client, APPS["server:app"])
+        for slug in slugs:
+            response = await client.post("/api/find-connections", params={"refresh": "true"},
+                                         json={"url": f"https://www.linkedin.com/company/{slug}"})
+            response.raise_for_status()
+            companies[slug] = len(response.json()["people"])
+            note = "" if companies[slug] else " (no leadership titles matched; only discovery searches will run)"
+            print(f"  {slug}: {companies[slug]} people{note}")
+
+
+def record_fixtures(fixtures: Path, slugs: list) -> None:
+    """Record find-connections searches for `slugs` from the local provider, once per database."""
+    manifest_path = fixtures / "loadtest.json"
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("database") != _database_key():
+        manifest = {"database": _database_key(), "companies": {}}
+    missing = [slug for slug in slugs if slug not in manifest["companies"]]
+    if not missing:
+        return
+    print(f"Recording search fixtures for {len(missing)} companies from the local provider")
+    port = free_port()
+    proc = start_app("server:app", 1, port, {
+        **UNLIMITED, "SP_SEARCH_PROVIDER": "local", "SP_SEARCH_RECORD": "1", "SP_SEARCH_FIXTURES": str(fixtures),
+    })
+    try:
+        asyncio.run(_record(f"http://127.0.0.1:{port}", missing, manifest["companies"]))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+    fixtures.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=1))
+
+
+# ── Driver ───────────────────────────────────────────────────────────────────
+
+def percentile(sorted_values: list, q: float):
+    """Nearest-rank percentile of seconds, in ms."""
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)] * 1000, 1)
+
+
+async def run_step(base_url: str, make_request, users: int, duration_s: float, warmup_s: float) -> dict:
+    """`users` closed-loop virtual users for warmup + duration; only requests started after warmup count."""
+    latencies, counts = [], Counter()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        measure_from = time.monotonic() + warmup_s
+        deadline = measure_from + duration_s
+
+        async def user(n: int):
+            headers = {CLIENT_HEADER: f"vu-{n}"}
+            while time.monotonic() < deadline:
+                sent_at, started = time.monotonic(), time.perf_counter()
+                try:
+                    response = await make_request(client, headers)
+                except httpx.HTTPError:
+                    response = None
+                if sent_at < measure_from:
+                    continue
+                if response is None or (response.status_code >= 400 and response.status_code != 429):
+                    counts["errors"] += 1
+                elif response.status_code == 429:
+                    counts["rejected"] += 1
+                else:
+                    latencies.append(time.perf_counter() - started)
+                    if "hit" in (response.headers.get("X-Score-Cache"), response.headers.get("X-Cache")):
+                        counts["cache_hits"] += 1
+
+        await asyncio.gather(*(user(n) for n in range(users)))
+        elapsed = time.monotonic() - measure_from
+    latencies.sort()
+    total = len(latencies) + counts["errors"] + counts["rejected"]
+    return {
+        "users": users,
+        "requests": total,
+        "rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": percentile(latencies, 1.0),
+        "errors": counts["errors"],
+        "rejected": counts["rejected"],
+        "failed_ratio": round((counts["errors"] + counts["rejected"]) / total, 4) if total else None,
+        "cache_hit_ratio": round(counts["cache_hits"] / len(latencies), 3) if latencies else None,
+    }
+
+
+def meets_slo(step: dict, slo: float) -> bool:
+    return step["p95_ms"] is not None and step["p95_ms"] <= slo and step["failed_ratio"] < ERROR_BUDGET
+
+
+def git_info() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {
+        "sha": git("rev-parse", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+# ── Reports ──────────────────────────────────────────────────────────────────
+
+def _ms(value) -> str:
+    return f"{value:>9.1f}" if value is not None else f"{'—':>9}"
+
+
+def print_step(name: str, step: dict, slo: float) -> None:
+    hits = f"{step['cache_hit_ratio']:.0%}" if step["cache_hit_ratio"] is not None else "—"
+    print(f"{name:<18} {step['users']:>5}  {step['rps']:>8.1f} {_ms(step['p50_ms'])} {_ms(step['p95_ms'])} "
+          f"{_ms(step['p99_ms'])}  {step['errors']:>6} {step['rejected']:>6}  {hits:>5}  "
+          f"{'✅' if meets_slo(step, slo) else '❌'} {slo:g}")
+
+
+def print_capacity(report: dict) -> None:
+    print("\nUsers served within SLO (p95, <1% failed):")
+    for name, result in report["scenarios"].items():
+        capacity = result["capacity_users"]
+        print(f"  {name:<18} {capacity if capacity is not None else 'none':>5}   (p95 ≤ {result['slo_p95_ms']:g} ms)")
+
+
+def print_comparison(base: dict, report: dict) -> None:
+    print(f"\nvs {(base['git']['sha'] or '?')[:10]} {base['git']['subject'] or ''}")
+    print(f"{'scenario':<18} {'users':>5}  {'p95 ms':>19}  {'Δ':>7}  {'req/s':>17}  {'Δ':>7}")
+    for name, result in report["scenarios"].items():
+        old_steps = {s["users"]: s for s in base["scenarios"].get(name, {}).get("steps", [])}
+        for step in result["steps"]:
+            old = old_steps.get(step["users"])
+            if not old or old["p95_ms"] is None or step["p95_ms"] is None:
+                continue
+            p95_delta = step["p95_ms"] / old["p95_ms"] - 1 if old["p95_ms"] else 0
+            rps_delta = step["rps"] / old["rps"] - 1 if old["rps"] else 0
+            print(f"{name:<18} {step['users']:>5}  {old['p95_ms']:>8.1f} → {step['p95_ms']:>8.1f}  {p95_delta:>+6.0%}  "
+                  f"{old['rps']:>7.1f} → {step['rps']:>7.1f}  {rps_delta:>+6.0%}")
+
+
+# ── Main ─────────────────────────────────────────────────────────────────────
+
+def main(args) -> dict:
+    available = scenarios(args.org_sizes)
+    selected = args.scenarios or list(available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(unknown)}; available: {', '.join(available)}")
+    overrides = {k: float(v) for k, _, v in (s.partition("=") for s in args.slo)}
+
+    sample = graph_sample(args.org_sizes, args.finder_companies)
+    setups = {name: available[name](sample) for name in selected}
+    apps = {app for app, _ in setups.values()}
+    if "server:app" in apps:
+        record_fixtures(args.fixtures, sample["finder_slugs"])
+
+    env = {"RCP_CLIENT_IP_HEADER": CLIENT_HEADER, **({} if args.rate_limits else UNLIMITED),
+           "SP_SEARCH_PROVIDER": "fixture", "SP_SEARCH_FIXTURES": str(args.fixtures),
+           "SP_SEARCH_LATENCY_MS": str(args.search_latency_ms), "SP_SEARCH_JITTER_MS": str(args.search_jitter_ms)}
+    ports = {app: free_port() for app in apps}
+    procs = [start_app(app, args.workers, ports[app], env) for app in apps]
+
+    report = {
+        "git": git_info(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {"cpus": os.cpu_count(), "python": platform.python_version(), "platform": platform.platform()},
+        "settings": {
+            "workers": args.workers, "duration_s": args.duration, "warmup_s": args.warmup,
+            "rate_limits": args.rate_limits, "search_latency_ms": args.search_latency_ms,
+            "search_jitter_ms": args.search_jitter_ms, "database": _database_key(),
+            "orgs": {f"company-{size}": {"slug": slug, "people": people}
+                     for size, (slug, people) in sample["orgs"].items()},
+        },
+        "scenarios": {},
+    }
+    try:
+        async def ready():
+            for app, port in ports.items():
+                async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+                    await wait_ready(client, APPS[app], timeout_s=300)
+        asyncio.run(ready())
+
+        print(f"{'scenario':<18} {'users':>5}  {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  "
+              f"{'errors':>6} {'429s':>6}  {'cache':>5}  SLO")
+        for name, (app, make_request) in setups.items():
+            slo = slo_ms(name, overrides)
+            result = report["scenarios"][name] = {"app": app, "slo_p95_ms": slo, "capacity_users": None, "steps": []}
+            for users in args.users:
+                step = asyncio.run(run_step(f"http://127.0.0.1:{ports[app]}", make_request,
+                                            users, args.duration, args.warmup))
+                result["steps"].append(step)
+                print_step(name, step, slo)
+                if meets_slo(step, slo):
+                    result["capacity_users"] = users
+                elif not args.all_steps:
+                    break
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=60)
+
+    print_capacity(report)
+    if args.compare:
+        print_comparison(json.loads(Path(args.compare).read_text()), report)
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{(report['git']['sha'] or 'nogit')[:10]}{'-dirty' if report['git']['dirty'] else ''}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=1))
+    print(f"\nWrote {out}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", nargs="+", help="default: all")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 8, 32], help="concurrent users per step")
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before each step")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1)
+    parser.add_argument("--org-sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="company-<N> scenarios use the org with the closest number of people")
+    parser.add_argument("--finder-companies", type=int, default=8, help="largest orgs find-connections rotates through")
+    parser.add_argument("--search-latency-ms", type=float, default=300)
+    parser.add_argument("--search-jitter-ms", type=float, default=200)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--slo", nargs="+", default=[], metavar="SCENARIO=MS", help="override p95 targets")
+    parser.add_argument("--rate-limits", action="store_true", help="keep the configured per-client token buckets")
+    parser.add_argument("--all-steps", action="store_true", help="keep going after a step misses its SLO")
+    parser.add_argument("--compare", help="an earlier results file to diff against")
+    parser.add_argument("--out", help="results file (default: loadtest-results/<sha>.json)")
+    main(parser.parse_args())
@@ -1,14 +1,26 @@
-from fastapi import FastAPI, HTTPException, Depends
+import time
+_import_started = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional, Union
+from datetime import date
+from pathlib import Path
+import dataclasses
+import heapq
 import math
+import os
+import shutil
+import tarfile
+import tempfile
 
-from database import get_db, engine
-import models, schemas, scoring
-from seed import seed_db
-
-models.Base.metadata.create_all(bind=engine)
+from database import SessionLocal, engine, get_db
+import models, schemas, scoring, edges, parallel, records, bootstrap, resolve, snapshot, changes, intervals, geo, shared_cache, admission, compression
 
 app = FastAPI(title="Smith Point RCP API", version="1.0.0")
 
@@ -18,13 +30,73 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(compression.CompressionMiddleware)
+
+# Read-only scoring mode: serve /api/connectivity* from a memory-mapped
+# snapshot (see snapshot.py) instead of the ORM
+SNAPSHOTS = snapshot.SnapshotStore(os.environ["RCP_SCORING_SNAPSHOT"]) if os.getenv("RCP_SCORING_SNAPSHOT") else None
+SNAPSHOT_REFRESH_S = float(os.getenv("RCP_SNAPSHOT_REFRESH_S", "3600"))
+SNAPSHOT_DEBOUNCE_S = float(os.getenv("RCP_SNAPSHOT_DEBOUNCE_S", "10"))
+SNAPSHOT_BUILD = os.getenv("RCP_SNAPSHOT_BUILD", "1") == "1"
+
+# Default-context /api/connectivity results, kept warm by the change feed
+SCORES = changes.ScoreCache()
+# Per-org interval index over roles, for /api/orgs/{id}/alumni
+ROLE_INDEX = intervals.RoleIndexes()
+
+# Paths served while migrations/seeding are still running
+_ALWAYS_AVAILABLE = {"/api/health", "/api/ready"}
+
+@app.middleware("http")
+async def readiness_gate(request: Request, call_next):
+    if not bootstrap.is_ready() and request.url.path.startswith("/api/") \
+            and request.url.path not in _ALWAYS_AVAILABLE:
+        return JSONResponse(
+            {"detail": f"Service starting ({bootstrap.STATUS['state']})"},
+            status_code=503,
+            headers={"Retry-After": "2"},
+        )
+    return await call_next(request)
 
 @app.on_event("startup")
 def startup():
-    db = next(get_db())
-    if db.query(models.Person).filter(models.Person.is_internal == True).count() == 0:
-        seed_db(db)
-    db.close()
+    bootstrap.start(_import_started)
+    if SNAPSHOTS is not None and SNAPSHOT_BUILD:
+        SNAPSHOTS.start_refresher(
+            SessionLocal, SNAPSHOT_REFRESH_S, SNAPSHOT_DEBOUNCE_S,
+            ready=bootstrap.is_ready,
+            schema_version=lambda: bootstrap.read_markers().get("schema_version"),
+        )
+    # Writes publish what they touched (changes.py); the consumer catches up the rest
+    changes.FEED.install(SessionLocal, ready=bootstrap.is_ready, shared=shared_cache.change_log())
+    changes.FEED.subscribe("edges", lambda db, change: edges.refresh_org_edges(db, change.org_ids, change.person_ids),
+                           remote=False)
+    changes.FEED.subscribe("scores", _rescore_cached)
+    changes.FEED.subscribe("role_index", lambda db, change: ROLE_INDEX.invalidate(change.org_ids))
+    if SNAPSHOTS is not None:
+        changes.FEED.subscribe("snapshot", lambda db, change: SNAPSHOTS.mark_dirty(), remote=False)
+    changes.FEED.start(SessionLocal)
+
+SHUTDOWN_DRAIN_S = float(os.getenv("RCP_SHUTDOWN_DRAIN_S", "10"))
+
+@app.on_event("shutdown")
+def shutdown():
+    # A recycled worker finishes the edge refreshes for writes it took
+    changes.FEED.wait_idle(SHUTDOWN_DRAIN_S)
+    parallel.shutdown()
+
+def preload():
+    """
+    One-time work in the gunicorn master, before workers fork (gunicorn.conf.py):
+    migrate and seed once instead of racing in every worker, and load the
+    read-only gazetteer so workers share its pages.
+    """
+    if bootstrap.MODE != "skip":
+        bootstrap.run_pipeline()
+        if not bootstrap.is_ready():
+            raise RuntimeError(f"Startup pipeline failed: {bootstrap.STATUS['error']}")
+    geo.gazetteer()
+    engine.dispose()   # no pooled connections across the fork
 
 # ── People ──────────────────────────────────────────────────────────────────
 
@@ -47,8 +119,43 @@ def get_person(person_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Person not found")
     return person
 
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _find_existing_person(db: Session, person: schemas.PersonCreate):
+    """
+    Entity-resolve against persons with the same LinkedIn profile (all of
+    them, so the strongest match is never cut off) or the same normalized
+    last name (persons.last_name_key).
+    """
+    last = resolve.name_key(person.full_name).last
+    slug = resolve.linkedin_slug(person.linkedin_url)
+    candidates = []
+    if slug:
+        candidates += db.query(models.Person).filter(
+            models.Person.linkedin_url.ilike(f"%/in/{_like_escape(slug)}%", escape="\\")
+        ).all()
+    if last:
+        candidates += db.query(models.Person).filter(
+            models.Person.last_name_key == last
+        ).order_by(models.Person.id).limit(200).all()
+    return resolve.find_match(
+        person.full_name, person.linkedin_url, person.current_company, candidates,
+        cand_name=lambda p: p.full_name,
+        cand_url=lambda p: p.linkedin_url,
+        cand_company=lambda p: p.current_company,
+    )
+
 @app.post("/api/people", response_model=schemas.PersonDetail)
-def create_person(person: schemas.PersonCreate, db: Session = Depends(get_db)):
+def create_person(person: schemas.PersonCreate, allow_duplicate: bool = False, db: Session = Depends(get_db)):
+    if not allow_duplicate:
+        existing = _find_existing_person(db, person)
+        if existing:
+            raise HTTPException(status_code=409, detail={
+                "message": f"Looks like an existing person: {existing.full_name}. "
+                           f"Pass allow_duplicate=true to add anyway.",
+                "existing_id": existing.id,
+            })
     db_person = models.Person(**person.dict(exclude={"orgs", "education"}))
     db.add(db_person)
     db.commit()
@@ -71,6 +178,66 @@ def get_org(org_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Organization not found")
     return org
 
+@app.get("/api/orgs/{org_id}/alumni", response_model=List[schemas.AlumniOut])
+def get_org_alumni(
+    org_id: int,
+    overlap_with: Optional[int] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    include_board: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+):
+    """
+    People with roles at an org: all of them, those overlapping a person's
+    own roles there (?overlap_with=, longest overlap first), or those there
+    at any point in [start_year, end_year].
+
+    overlap_years is computed like coworker_edges (edges.compute_org_edges):
+    roles that only share a calendar year, e.g. 2018–2018 against 2017–2020,
+    are listed with 0 and have no edge.
+    """
+    if not db.query(models.Organization.id).filter(models.Organization.id == org_id).first():
+        raise HTTPException(status_code=404, detail="Organization not found")
+    index = ROLE_INDEX.get(db, org_id)
+    current_year = date.today().year
+
+    best = {}  # person_id → (overlap_years, RoleSpan)
+    if overlap_with is not None:
+        own = db.query(models.Role.start_year, models.Role.end_year).filter(
+            models.Role.org_id == org_id, models.Role.person_id == overlap_with,
+            *([] if include_board else [models.Role.is_board == False]),
+        ).all()
+        if not own:
+            raise HTTPException(status_code=404, detail="That person has no role at this organization")
+        for mine in own:
+            for span in index.overlapping(*intervals.role_interval(mine.start_year, mine.end_year)):
+                if span.person_id == overlap_with or (span.is_board and not include_board):
+                    continue
+                years = max(0, min(mine.end_year or current_year, span.end_year or current_year)
+                            - max(mine.start_year or 0, span.start_year or 0))
+                if span.person_id not in best or years > best[span.person_id][0]:
+                    best[span.person_id] = (years, span)
+    else:
+        window_end = end_year + 1 if end_year is not None else math.inf   # years are inclusive
+        for span in index.overlapping(start_year if start_year is not None else -math.inf, window_end):
+            if span.is_board and not include_board:
+                continue
+            if span.person_id not in best or (span.start_year or 0) > (best[span.person_id][1].start_year or 0):
+                best[span.person_id] = (None, span)   # most recent role per person
+
+    ranked = sorted(best.items(), key=lambda item: (-(item[1][0] or 0), -(item[1][1].start_year or 0), item[0]))
+    if limit is not None:
+        ranked = ranked[:limit]
+    people = {p.id: p for p in db.query(models.Person).filter(models.Person.id.in_([pid for pid, _ in ranked]))}
+    return [
+        schemas.AlumniOut(
+            person=people[pid], title=span.title, start_year=span.start_year, end_year=span.end_year,
+            is_board=span.is_board, overlap_years=years,
+        )
+        for pid, (years, span) in ranked if pid in people
+    ]
+
 @app.post("/api/orgs", response_model=schemas.OrgSummary)
 def create_org(org: schemas.OrgCreate, db: Session = Depends(get_db)):
     db_org = models.Organization(**org.dict())
@@ -81,24 +248,318 @@ def create_org(org: schemas.OrgCreate, db: Session = Depends(get_db)):
 
 # ── Connectivity ─────────────────────────────────────────────────────────────
 
-@app.get("/api/connectivity", response_model=schemas.ConnectivityResponse)
-def get_connectivity(target_id: int, db: Session = Depends(get_db)):
-    target = db.query(models.Person).filter(models.Person.id == target_id).first()
-    if not target:
-        raise HTTPException(status_code=404, detail="Target person not found")
+def _parse_strengths(strength: Optional[str]):
+    if not strength:
+        return None
+    strengths = {s.strip().lower() for s in strength.split(",") if s.strip()}
+    unknown = strengths - set(scoring.STRENGTHS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown strength(s): {', '.join(sorted(unknown))}")
+    return strengths
+
+def _scoring_context(as_of: Optional[date], signals: Optional[str], weights: Optional[str]):
+    """Build the request's ScoringContext from ?as_of=&signals=company,board&weights=company:1.5"""
+    if not (as_of or signals or weights):
+        return scoring.default_context()
+    names = [n.strip() for n in signals.split(",") if n.strip()] if signals else None
+    parsed_weights = {}
+    for item in (weights or "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition(":")
+        try:
+            parsed_weights[name.strip()] = float(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid weight '{item}'. Expected name:number.")
+    try:
+        return scoring.ScoringContext(as_of, names, parsed_weights)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _person_loaders(ctx, internal: bool) -> list:
+    """Eager-load only the relationships the selected signals read."""
+    loaders = []
+    if "roles" in ctx.needs:
+        loaders.append(selectinload(models.Person.roles).selectinload(models.Role.org))
+    if "education" in ctx.needs:
+        loaders.append(selectinload(models.Person.education))
+    if "interactions" in ctx.needs and internal:
+        loaders.append(selectinload(models.Person.interactions_as_internal))
+        loaders.append(selectinload(models.Person.interaction_rollups))
+    return loaders
+
+def _load_pair_edges(db, ctx, sp_members, targets):
+    if "edges" not in ctx.needs:
+        return {}
+    return edges.load_pair_edges(db, [m.id for m in sp_members], [t.id for t in targets])
+
+def _overlap_result(member, target, result):
+    return schemas.OverlapResult(
+        sp_member=member,
+        target_person=target,
+        score=result.score,
+        strength=result.strength,
+        signals=result.signals,
+    )
 
-    sp_members = db.query(models.Person).filter(models.Person.is_internal == True).all()
+def _compact_overlaps(pairs, people: dict, icons: dict) -> list:
+    out = []
+    for member, target, result in pairs:
+        people.setdefault(member.id, member)
+        people.setdefault(target.id, target)
+        for s in result.signals:
+            icons.setdefault(s.type, s.icon)
+        out.append(schemas.CompactOverlap(
+            sp=member.id, target=target.id, score=result.score, strength=result.strength,
+            signals=[(s.type, s.label, s.points) for s in result.signals],
+        ))
+    return out
+
+def _compact_company_response(response: Response, org, total, pairs=(), groups=None) -> Response:
+    """?format=compact: people de-duplicated, no signal details; serialized here, skipping re-validation."""
+    people, icons = {}, {}
+    body = schemas.CompactCompanyConnectivityResponse(
+        org=schemas.OrgSummary.model_validate(org),
+        people=[],
+        icons=icons,
+        overlaps=_compact_overlaps(pairs, people, icons),
+        total=total,
+        groups=None if groups is None else [
+            schemas.CompactOverlapGroup(
+                person=g.person.id,
+                best_score=g.best_score,
+                strength=g.results[0][2].strength,
+                count=g.count,
+                overlaps=_compact_overlaps(g.results, people, icons),
+            )
+            for g in groups
+        ],
+    )
+    body.people = [schemas.PersonSummary.model_validate(p) for p in people.values()]
+    compact = Response(body.model_dump_json(), media_type="application/json")
+    # A returned Response doesn't pick up the injected one's headers; raw keeps repeated ones
+    compact.raw_headers.extend(response.headers.raw)
+    return compact
+
+def _live_snapshot(response: Response):
+    """The snapshot to score from in read-only mode, or None to use the database."""
+    snap = SNAPSHOTS.get() if SNAPSHOTS is not None else None
+    response.headers["X-Scoring-Source"] = f"snapshot:{SNAPSHOTS.version}" if snap else "db"
+    return snap
+
+def _sp_members_db(db, ctx) -> list:
+    return db.query(models.Person).options(*_person_loaders(ctx, internal=True)).filter(
+        models.Person.is_internal == True
+    ).order_by(models.Person.id).all()
+
+def _score_target_db(db, ctx, target, sp_members=None):
+    """Every SP member's result for one ORM target, with people copied to records."""
+    sp_members = _sp_members_db(db, ctx) if sp_members is None else sp_members
+    pair_edges = _load_pair_edges(db, ctx, sp_members, [target])
     results = []
     for member in sp_members:
-        result = scoring.compute_connectivity(member, target)
-        if result.signals:
-            results.append(result)
+        result = scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)
+        results.append(dataclasses.replace(result, sp_member=records.person_record(member, needs=())))
+    return records.person_record(target, needs=()), results
+
+def _rescore_cached(db, change):
+    """Change handler: rescore only the cached pairs that involve a touched person."""
+    ctx = scoring.default_context()
+    cached = set(SCORES.target_ids())
+    touched = change.person_ids
+    if not (cached and touched):
+        return
+    people = {p.id: p for p in db.query(models.Person).options(*_person_loaders(ctx, internal=True)).filter(
+        models.Person.id.in_(touched)
+    )}
+
+    # A touched target: rescore it against every member
+    sp_members = _sp_members_db(db, ctx) if touched & cached else []
+    for target_id in touched & cached:
+        if target_id in people:
+            SCORES.replace_target(target_id, *_score_target_db(db, ctx, people[target_id], sp_members))
+        else:
+            SCORES.replace_target(target_id)
+
+    # A touched member (or a person who stopped being one): rescore it against the other cached targets
+    others = cached - touched
+    affected = [pid for pid in touched if pid not in people or people[pid].is_internal or SCORES.has_member(pid)]
+    if not (others and affected):
+        return
+    targets = db.query(models.Person).options(*_person_loaders(ctx, internal=False)).filter(
+        models.Person.id.in_(others)
+    ).all()
+    for member_id in affected:
+        member = people.get(member_id)
+        if member is None or not member.is_internal:
+            SCORES.drop_member(member_id)
+            continue
+        pair_edges = _load_pair_edges(db, ctx, [member], targets)
+        member_record = records.person_record(member, needs=())
+        SCORES.replace_member(member_id, {
+            target.id: dataclasses.replace(
+                scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx),
+                sp_member=member_record,
+            )
+            for target in targets
+        })
 
-    results.sort(key=lambda x: x.score, reverse=True)
-    return schemas.ConnectivityResponse(target=target, connectors=results)
+@app.get("/api/connectivity", response_model=schemas.ConnectivityResponse)
+def get_connectivity(
+    target_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    min_score: int = 0,
+    strength: Optional[str] = None,
+    as_of: Optional[date] = None,
+    signals: Optional[str] = None,
+    weights: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    strengths = _parse_strengths(strength)
+    ctx = _scoring_context(as_of, signals, weights)
+    snap = _live_snapshot(response)
+    cacheable = not snap and ctx is scoring.default_context()
+    cached = SCORES.get(target_id, ctx) if cacheable else None
+    if cached:
+        target, results = cached
+    elif snap:
+        target = snap.person(target_id, ctx.needs - {"interactions"})
+        if not target:
+            raise HTTPException(status_code=404, detail="Target person not found")
+        sp_members = SNAPSHOTS.members(snap, ctx.needs)
+        pair_edges = snap.pair_edges([m.id for m in sp_members], [target.id]) if "edges" in ctx.needs else {}
+        results = [
+            scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)
+            for member in sp_members
+        ]
+    else:
+        generation = changes.FEED.generation
+        target = db.query(models.Person).options(*_person_loaders(ctx, internal=False)).filter(
+            models.Person.id == target_id
+        ).first()
+        if not target:
+            raise HTTPException(status_code=404, detail="Target person not found")
+        target, results = _score_target_db(db, ctx, target)
+        if cacheable:
+            SCORES.put(target, results, ctx, generation, changes.FEED)
+    if cacheable:
+        response.headers["X-Score-Cache"] = "hit" if cached else "miss"
+
+    top = scoring.TopK(limit)
+    for result in results:
+        if scoring.keep_result(result, min_score, strengths):
+            top.push(result.score, result)
+
+    return schemas.ConnectivityResponse(target=target, connectors=top.items())
+
+# Company and batch scoring go through per-client rate limits and a fair
+# queue (admission.py); cost is roughly 1 + targets / TARGETS_PER_COST_UNIT
+ADMISSION = admission.Admission.from_env("scoring", "RCP", concurrency=os.cpu_count() or 1)
+TARGETS_PER_COST_UNIT = 100
+
+def _org_sizes(slugs) -> int:
+    """People with a role at the orgs with these LinkedIn slugs (a cost estimate, so internal ones count too)."""
+    if not slugs:
+        return 0
+    snap = SNAPSHOTS.get() if SNAPSHOTS is not None else None
+    if snap:
+        orgs = [snap.org_by_slug(slug) for slug in slugs]
+        return sum(len(snap.people_at_org(org.id)) for org in orgs if org)
+    db = SessionLocal()
+    try:
+        return db.query(func.count(models.Role.person_id.distinct())).join(models.Organization).filter(
+            models.Organization.linkedin_slug.in_(slugs)
+        ).scalar() or 0
+    finally:
+        db.close()
+
+async def _company_cost(request: Request) -> float:
+    slug = request.query_params.get("linkedin_slug")
+    return 1 + await run_in_threadpool(_org_sizes, [slug] if slug else []) / TARGETS_PER_COST_UNIT
+
+async def _batch_cost(request: Request) -> float:
+    try:
+        body = await request.json()
+        slugs = list(dict.fromkeys(body.get("linkedin_slugs") or []))
+        targets = len(body.get("target_ids") or [])
+    except (ValueError, AttributeError, TypeError):
+        return 1
+    return 1 + (targets + await run_in_threadpool(_org_sizes, slugs)) / TARGETS_PER_COST_UNIT
+
+BATCH_MAX_TARGETS = int(os.getenv("RCP_BATCH_MAX_TARGETS", "1000"))
+
+@app.post("/api/connectivity/batch", response_model=schemas.BatchConnectivityResponse,
+          dependencies=[Depends(ADMISSION.guard(_batch_cost))])
+def get_batch_connectivity(req: schemas.BatchConnectivityRequest, response: Response, db: Session = Depends(get_db)):
+    """
+    Score many targets (ids and/or every external person at the given
+    companies) in one pass: SP members and their relationships are loaded
+    once, indexed, and each target is only scored against members it shares
+    an org, school, city or interaction with. Results are grouped per target.
+    """
+    strengths = _parse_strengths(req.strength)
+    ctx = _scoring_context(req.as_of, req.signals, req.weights)
+    target_needs = ctx.needs - {"interactions"}
+    snap = _live_snapshot(response)
+
+    # Resolve slugs to target ids, keeping request order and dropping repeats
+    wanted = list(dict.fromkeys(req.target_ids))
+    seen = set(wanted)
+    missing_slugs = []
+    for slug in dict.fromkeys(req.linkedin_slugs):
+        if snap:
+            org = snap.org_by_slug(slug)
+            external = set(snap.person_ids(internal=False))
+            ids = [pid for pid in snap.people_at_org(org.id) if pid in external] if org else []
+        else:
+            org = db.query(models.Organization).filter(models.Organization.linkedin_slug == slug).first()
+            ids = [pid for (pid,) in db.query(models.Person.id).join(models.Role).filter(
+                models.Role.org_id == org.id, models.Person.is_internal == False
+            ).distinct().order_by(models.Person.id)] if org else []
+        if not org:
+            missing_slugs.append(slug)
+        for pid in ids:
+            if pid not in seen:
+                seen.add(pid)
+                wanted.append(pid)
+    if len(wanted) > BATCH_MAX_TARGETS:
+        raise HTTPException(status_code=400, detail=f"Too many targets ({len(wanted)}); the limit is {BATCH_MAX_TARGETS}.")
+
+    if snap:
+        found = {pid: p for pid in wanted for p in [snap.person(pid, target_needs)] if p is not None}
+        sp_members = SNAPSHOTS.members(snap, ctx.needs)
+        pair_edges = snap.pair_edges([m.id for m in sp_members], list(found)) if "edges" in ctx.needs else {}
+    else:
+        found = {
+            p.id: p for p in db.query(models.Person).options(*_person_loaders(ctx, internal=False))
+            .filter(models.Person.id.in_(wanted)).all()
+        } if wanted else {}
+        sp_members = db.query(models.Person).options(*_person_loaders(ctx, internal=True)).filter(
+            models.Person.is_internal == True
+        ).all()
+        pair_edges = _load_pair_edges(db, ctx, sp_members, list(found.values()))
+
+    index = scoring.MemberIndex(sp_members, ctx)
+    results = []
+    for pid in wanted:
+        target = found.get(pid)
+        if target is None:
+            continue
+        top = scoring.TopK(req.limit)
+        for member in index.candidates(target):
+            result = scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)
+            if scoring.keep_result(result, req.min_score, strengths):
+                top.push(result.score, result)
+        results.append(schemas.ConnectivityResponse(target=target, connectors=top.items()))
+
+    return schemas.BatchConnectivityResponse(
+        results=results,
+        missing_target_ids=[pid for pid in dict.fromkeys(req.target_ids) if pid not in found],
+        missing_slugs=missing_slugs,
+    )
 
-@app.get("/api/connectivity/company", response_model=schemas.CompanyConnectivityResponse)
-def get_company_connectivity(linkedin_slug: str, db: Session = Depends(get_db)):
+def _company_inputs_db(db, ctx, linkedin_slug):
     # Find or look up people at this org
     org = db.query(models.Organization).filter(
         models.Organization.linkedin_slug == linkedin_slug
@@ -110,7 +571,7 @@ def get_company_connectivity(linkedin_slug: str, db: Session = Depends(get_db)):
     # Get all people at this org
     roles = db.query(models.Role).filter(models.Role.org_id == org.id).all()
     people_ids = list(set(r.person_id for r in roles))
-    target_people = db.query(models.Person).filter(
+    target_people = db.query(models.Person).options(*_person_loaders(ctx, internal=False)).filter(
         models.Person.id.in_(people_ids),
         models.Person.is_internal == False
     ).all()
@@ -118,23 +579,129 @@ def get_company_connectivity(linkedin_slug: str, db: Session = Depends(get_db)):
     if not target_people:
         raise HTTPException(status_code=404, detail=f"No external people found at '{org.name}'.")
 
-    sp_members = db.query(models.Person).filter(models.Person.is_internal == True).all()
+    sp_members = db.query(models.Person).options(*_person_loaders(ctx, internal=True)).filter(
+        models.Person.is_internal == True
+    ).all()
+    return org, sp_members, target_people, _load_pair_edges(db, ctx, sp_members, target_people)
+
+def _company_inputs_snapshot(snap, ctx, linkedin_slug):
+    org = snap.org_by_slug(linkedin_slug)
+    if not org:
+        raise HTTPException(status_code=404, detail=f"Company '{linkedin_slug}' not found. Add it via POST /api/orgs first.")
+
+    external = set(snap.person_ids(internal=False))
+    target_people = [
+        snap.person(pid, ctx.needs - {"interactions"})
+        for pid in snap.people_at_org(org.id) if pid in external
+    ]
+    if not target_people:
+        raise HTTPException(status_code=404, detail=f"No external people found at '{org.name}'.")
+
+    sp_members = SNAPSHOTS.members(snap, ctx.needs)
+    pair_edges = (
+        snap.pair_edges([m.id for m in sp_members], [t.id for t in target_people])
+        if "edges" in ctx.needs else {}
+    )
+    return org, sp_members, target_people, pair_edges
+
+@app.get("/api/connectivity/company",
+         response_model=Union[schemas.CompanyConnectivityResponse, schemas.CompactCompanyConnectivityResponse],
+         dependencies=[Depends(ADMISSION.guard(_company_cost))])
+def get_company_connectivity(
+    linkedin_slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    min_score: int = 0,
+    strength: Optional[str] = None,
+    group_by: Optional[str] = None,
+    per_group: int = Query(5, ge=1),
+    parallel_scoring: bool = False,
+    as_of: Optional[date] = None,
+    signals: Optional[str] = None,
+    weights: Optional[str] = None,
+    response_format: str = Query("full", alias="format"),
+    db: Session = Depends(get_db),
+):
+    """
+    Every SP member × external person at the company. ?format=compact returns
+    a CompactCompanyConnectivityResponse instead (people listed once, no
+    signal details) — a fraction of the size for big orgs.
+    """
+    strengths = _parse_strengths(strength)
+    ctx = _scoring_context(as_of, signals, weights)
+    if group_by not in (None, "target", "sp_member"):
+        raise HTTPException(status_code=400, detail="group_by must be 'target' or 'sp_member'")
+    if response_format not in ("full", "compact"):
+        raise HTTPException(status_code=400, detail="format must be 'full' or 'compact'")
+
+    snap = _live_snapshot(response)
+    generation = changes.FEED.generation   # before loading; keys the scoring pool's members
+    if snap:
+        org, sp_members, target_people, pair_edges = _company_inputs_snapshot(snap, ctx, linkedin_slug)
+    else:
+        org, sp_members, target_people, pair_edges = _company_inputs_db(db, ctx, linkedin_slug)
+
+    # Stream (member, target, result) for every pair that passes the filters
+    if parallel_scoring and parallel.should_parallelize(len(sp_members), len(target_people)):
+        members_by_id = {m.id: m for m in sp_members}
+        targets_by_id = {t.id: t for t in target_people}
+        if snap:
+            # Snapshot people and edges are already plain records
+            member_records, target_records, edge_recs = sp_members, target_people, pair_edges
+        else:
+            member_records = [records.person_record(m, ctx.needs) for m in sp_members]
+            target_records = [records.person_record(t, ctx.needs - {"interactions"}) for t in target_people]
+            edge_recs = records.edge_records(pair_edges)
+        scored = parallel.score_targets(
+            member_records,
+            target_records,
+            edge_recs,
+            ctx,
+            min_score,
+            strengths,
+            version=snap.path.name if snap else generation,
+        )
+        pairs = (
+            (members_by_id[sp_id], targets_by_id[target_id],
+             scoring.ConnectivityResult(members_by_id[sp_id], signals, score, level))
+            for sp_id, target_id, score, level, signals in scored
+        )
+    else:
+        pairs = (
+            (member, target, result)
+            for target in target_people
+            for member in sp_members
+            for result in [scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)]
+            if scoring.keep_result(result, min_score, strengths)
+        )
 
-    overlaps = []
-    for target in target_people:
-        for member in sp_members:
-            result = scoring.compute_connectivity(member, target)
-            if result.signals:
-                overlaps.append(schemas.OverlapResult(
-                    sp_member=member,
-                    target_person=target,
-                    score=result.score,
-                    strength=result.strength,
-                    signals=result.signals,
-                ))
+    if group_by:
+        groups, total = scoring.group_results(pairs, group_by, limit, per_group)
+        if response_format == "compact":
+            return _compact_company_response(response, org, total, groups=groups)
+        return schemas.CompanyConnectivityResponse(
+            org=org,
+            overlaps=[],
+            total=total,
+            groups=[
+                schemas.OverlapGroup(
+                    person=g.person,
+                    best_score=g.best_score,
+                    strength=g.results[0][2].strength,
+                    count=g.count,
+                    overlaps=[_overlap_result(*pair) for pair in g.results],
+                )
+                for g in groups
+            ],
+        )
 
-    overlaps.sort(key=lambda x: x.score, reverse=True)
-    return schemas.CompanyConnectivityResponse(org=org, overlaps=overlaps, total=len(overlaps))
+    top = scoring.TopK(limit)
+    for member, target, result in pairs:
+        top.push(result.score, (member, target, result))
+    if response_format == "compact":
+        return _compact_company_response(response, org, top.seen, pairs=top.items())
+    overlaps = [_overlap_result(*pair) for pair in top.items()]
+    return schemas.CompanyConnectivityResponse(org=org, overlaps=overlaps, total=top.seen)
 
 # ── Roles ────────────────────────────────────────────────────────────────────
 
@@ -177,13 +744,27 @@ def create_education(edu: schemas.EducationCreate, db: Session = Depends(get_db)
 
 @app.get("/api/interactions", response_model=List[schemas.InteractionOut])
 def list_interactions(person_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(models.Interaction)
+    """Latest 100 raw interactions; older history is in /api/interactions/monthly."""
+    newest = models.Interaction.occurred_at.desc()
+    if not person_id:
+        return db.query(models.Interaction).order_by(newest).limit(100).all()
+    # One index range scan per side (person, occurred_at) instead of sorting an OR
+    sides = [
+        db.query(models.Interaction).filter(column == person_id).order_by(newest).limit(100).all()
+        for column in (models.Interaction.internal_person_id, models.Interaction.external_person_id)
+    ]
+    return heapq.nlargest(100, {i.id: i for side in sides for i in side}.values(), key=lambda i: i.occurred_at)
+
+@app.get("/api/interactions/monthly", response_model=List[schemas.InteractionRollupOut])
+def list_interaction_rollups(person_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Monthly roll-ups of interactions past the retention window (see retention.py)."""
+    query = db.query(models.InteractionRollup)
     if person_id:
         query = query.filter(
-            (models.Interaction.internal_person_id == person_id) |
-            (models.Interaction.external_person_id == person_id)
+            (models.InteractionRollup.internal_person_id == person_id) |
+            (models.InteractionRollup.external_person_id == person_id)
         )
-    return query.order_by(models.Interaction.occurred_at.desc()).limit(100).all()
+    return query.order_by(models.InteractionRollup.month.desc()).limit(100).all()
 
 @app.post("/api/interactions", response_model=schemas.InteractionOut)
 def create_interaction(interaction: schemas.InteractionCreate, db: Session = Depends(get_db)):
@@ -193,8 +774,46 @@ def create_interaction(interaction: schemas.InteractionCreate, db: Session = Dep
     db.refresh(db_interaction)
     return db_interaction
 
+# ── Export ───────────────────────────────────────────────────────────────────
+
+@app.get("/api/export/snapshot")
+def export_snapshot(db: Session = Depends(get_db)):
+    """Columnar snapshot of the whole graph as a .tar.gz (see snapshot.py)."""
+    workdir = Path(tempfile.mkdtemp(prefix="rcp-export-"))
+    archive = workdir / "rcp-snapshot.tar.gz"
+    try:
+        snapshot.write_snapshot(db, workdir / "snapshot", bootstrap.read_markers().get("schema_version"))
+        with tarfile.open(archive, "w:gz") as tar:
+            tar.add(workdir / "snapshot", arcname="rcp-snapshot")
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)   # the response's cleanup never runs on a 500
+        raise
+    return FileResponse(
+        archive,
+        media_type="application/gzip",
+        filename=archive.name,
+        background=BackgroundTask(shutil.rmtree, workdir, ignore_errors=True),
+    )
+
 # ── Health ────────────────────────────────────────────────────────────────────
 
 @app.get("/api/health")
 def health():
     return {"status": "ok", "version": "1.0.0"}
+
+@app.get("/api/ready")
+def ready():
+    body = {
+        "ready": bootstrap.is_ready(),
+        "state": bootstrap.STATUS["state"],
+        "error": bootstrap.STATUS["error"],
+        "timings_ms": bootstrap.STATUS["timings_ms"],
+    }
+    body["changes"] = changes.FEED.report()
+    body["score_cache"] = SCORES.report()
+    body["role_index"] = ROLE_INDEX.report()
+    body["admission"] = ADMISSION.report()
+    body["compression"] = compression.report()
+    if SNAPSHOTS is not None:
+        body["snapshot"] = SNAPSHOTS.report()
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
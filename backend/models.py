@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, SmallInteger
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, Text, SmallInteger, UniqueConstraint
+from sqlalchemy.orm import relationship, synonym, validates
 from sqlalchemy.sql import func
 from database import Base
+import geo
+import resolve
 
 class Person(Base):
     __tablename__ = "persons"
@@ -10,9 +12,12 @@ class Person(Base):
     full_name    = Column(String, nullable=False, index=True)
     first_name   = Column(String)
     last_name    = Column(String)
+    last_name_key = Column(String, index=True)   # resolve.name_key(full_name).last, kept in sync below
     email        = Column(String, unique=True, nullable=True)
     linkedin_url = Column(String, unique=True, nullable=True)
     location     = Column(String)
+    city_id      = Column(Integer, index=True)   # geo.locate(location), kept in sync below
+    metro_id     = Column(Integer, index=True)
     bio          = Column(Text)
     photo_url    = Column(String)
     current_title   = Column(String)
@@ -25,6 +30,17 @@ class Person(Base):
     education    = relationship("Education", back_populates="person", cascade="all, delete-orphan")
     interactions_as_internal = relationship("Interaction", foreign_keys="Interaction.internal_person_id", back_populates="internal_person")
     interactions_as_external = relationship("Interaction", foreign_keys="Interaction.external_person_id", back_populates="external_person")
+    interaction_rollups      = relationship("InteractionRollup", foreign_keys="InteractionRollup.internal_person_id", viewonly=True)
+
+    @validates("location")
+    def _locate(self, key, location):
+        self.city_id, self.metro_id = geo.locate(location)
+        return location
+
+    @validates("full_name")
+    def _key_name(self, key, full_name):
+        self.last_name_key = resolve.name_key(full_name).last or None
+        return full_name
 
 
 class Organization(Base):
@@ -76,7 +92,14 @@ class Education(Base):
 
 
 class Interaction(Base):
+    """Raw interaction log. Rows older than the retention window are rolled up
+    into InteractionRollup by retention.py; on Postgres the table is
+    partitioned by month of occurred_at."""
     __tablename__ = "interactions"
+    __table_args__ = (
+        Index("ix_interactions_internal_occurred", "internal_person_id", "occurred_at"),
+        Index("ix_interactions_external_occurred", "external_person_id", "occurred_at"),
+    )
 
     id                 = Column(Integer, primary_key=True, index=True)
     internal_person_id = Column(Integer, ForeignKey("persons.id"), nullable=False)
@@ -89,3 +112,50 @@ class Interaction(Base):
 
     internal_person = relationship("Person", foreign_keys=[internal_person_id], back_populates="interactions_as_internal")
     external_person = relationship("Person", foreign_keys=[external_person_id], back_populates="interactions_as_external")
+
+
+class InteractionRollup(Base):
+    """Interactions of one type between one pair in one calendar month,
+    compacted from the raw log by retention.rollup()."""
+    __tablename__ = "interaction_rollups"
+    __table_args__ = (
+        UniqueConstraint("internal_person_id", "external_person_id", "interaction_type", "month"),
+        Index("ix_interaction_rollups_external", "external_person_id", "month"),
+    )
+
+    id                 = Column(Integer, primary_key=True)
+    internal_person_id = Column(Integer, ForeignKey("persons.id"), nullable=False, index=True)
+    external_person_id = Column(Integer, ForeignKey("persons.id"), nullable=False)
+    interaction_type   = Column(String)
+    month              = Column(Date, nullable=False)   # first day of the month
+    count              = Column(Integer, nullable=False, default=0)
+    last_occurred_at   = Column(DateTime(timezone=True), nullable=False)
+
+    # Reads like an Interaction to scoring: dated by the month's latest one
+    occurred_at = synonym("last_occurred_at")
+
+
+class CoworkerEdge(Base):
+    """Precomputed pair of people whose (non-board) roles overlapped at one org.
+
+    Rebuilt per org by edges.refresh_org_edges(); person_a_id < person_b_id.
+    """
+    __tablename__ = "coworker_edges"
+    __table_args__ = (UniqueConstraint("person_a_id", "person_b_id", "org_id"),)
+
+    id                 = Column(Integer, primary_key=True, index=True)
+    person_a_id        = Column(Integer, ForeignKey("persons.id"), nullable=False, index=True)
+    person_b_id        = Column(Integer, ForeignKey("persons.id"), nullable=False, index=True)
+    org_id             = Column(Integer, ForeignKey("organizations.id"), nullable=False, index=True)
+    overlap_years      = Column(SmallInteger, nullable=False)
+    first_overlap_year = Column(SmallInteger)
+    last_overlap_year  = Column(SmallInteger, nullable=True)   # NULL = still overlapping
+
+
+class SchemaMeta(Base):
+    """Key/value markers (schema_version, seed_version) read once at startup."""
+    __tablename__ = "schema_meta"
+
+    key        = Column(String, primary_key=True)
+    value      = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
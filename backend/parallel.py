@@ -0,0 +1,109 @@
+"""
+Process-pool scoring for large organizations.
+
+Scoring is CPU-bound Python once data is loaded, so a single uvicorn worker
+pegs one core. This splits the target set into chunks and scores them in a
+ProcessPoolExecutor. SP members are shipped once per worker process (via the
+pool initializer) as plain records; each chunk carries only its targets and
+their precomputed edges.
+
+A pool is keyed on what its members were built from: their ids, the signals'
+needs and the caller's data version (change-feed generation or snapshot). The
+last POOLS_KEPT pools stay warm, so requests with different ?signals= don't
+keep rebuilding each other's; an older pool is retired once its queued chunks
+have run, never cancelled under a request that's still waiting on it.
+
+Small jobs stay on the single-process path — see should_parallelize().
+
+Environment:
+    RCP_SCORING_PROCESSES   worker processes (default: CPU count)
+    RCP_PARALLEL_MIN_PAIRS  minimum SP × target pairs before using the pool
+"""
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import scoring
+
+PROCESSES = int(os.getenv("RCP_SCORING_PROCESSES", "0")) or os.cpu_count() or 1
+MIN_PAIRS = int(os.getenv("RCP_PARALLEL_MIN_PAIRS", "5000"))
+CHUNKS_PER_PROCESS = 4
+POOLS_KEPT = 2
+
+_pools = OrderedDict()   # key → ProcessPoolExecutor, least recently used first
+_pool_lock = threading.Lock()
+
+# Set in each worker process by _init_worker
+_members = []
+
+
+def _init_worker(members):
+    global _members
+    _members = members
+
+
+def _score_chunk(targets, pair_edges, ctx, min_score, strengths):
+    out = []
+    for target in targets:
+        for member in _members:
+            result = scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)
+            if scoring.keep_result(result, min_score, strengths):
+                out.append((member.id, target.id, result.score, result.strength, result.signals))
+    return out
+
+
+def should_parallelize(num_members: int, num_targets: int) -> bool:
+    return PROCESSES > 1 and num_members * num_targets >= MIN_PAIRS
+
+
+def _get_pool(key, members):
+    """The pool for `key`, started with `members` if it isn't running yet."""
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ProcessPoolExecutor(
+                max_workers=PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(members,),
+            )
+            while len(_pools) > POOLS_KEPT:
+                _, old = _pools.popitem(last=False)
+                old.shutdown(wait=False)   # queued chunks still run; workers exit after
+        _pools.move_to_end(key)
+        return pool
+
+
+def score_targets(members, targets, pair_edges, ctx, min_score: int = 0, strengths=None, version=None) -> list:
+    """
+    Score every (member, target) pair across the pool.
+    `members`/`targets` are records.PersonRecord, `pair_edges` from
+    records.edge_records(), and `ctx` the request's scoring.ScoringContext
+    (pickled once per chunk). `version` must change whenever any member's
+    data may have, e.g. the change-feed generation read before loading them.
+    Results failing scoring.keep_result() are dropped in the workers.
+    Returns (sp_id, target_id, score, strength, signals) tuples in the same
+    order as the single-process loop.
+    """
+    pool = _get_pool((tuple(m.id for m in members), frozenset(ctx.needs), version), members)
+    chunk_size = max(1, math.ceil(len(targets) / (PROCESSES * CHUNKS_PER_PROCESS)))
+    chunks = [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+    jobs = []
+    for chunk in chunks:
+        chunk_ids = {t.id for t in chunk}
+        chunk_edges = {pair: edges for pair, edges in pair_edges.items() if pair[1] in chunk_ids}
+        jobs.append(pool.submit(_score_chunk, chunk, chunk_edges, ctx, min_score, strengths))
+    results = []
+    for job in jobs:
+        results.extend(job.result())
+    return results
+
+
+def shutdown():
+    with _pool_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
@@ -0,0 +1,122 @@
+"""
+Plain-data scoring records.
+
+Lightweight, picklable stand-ins for the ORM objects that scoring.py reads.
+They expose the same attribute names (person.roles, role.org.name, ...) so
+compute_connectivity() works on either, without a session attached, and carry
+the summary fields the API schemas read. Built from the ORM here, or from a
+columnar snapshot by snapshot.Snapshot.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class OrgRecord:
+    id: object
+    name: str
+    linkedin_slug: Optional[str] = None
+    hq_location: Optional[str] = None
+    industry: Optional[str] = None
+    is_portfolio: bool = False
+
+
+@dataclass
+class RoleRecord:
+    org_id: object
+    org: OrgRecord
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    is_board: bool = False
+
+
+@dataclass
+class EducationRecord:
+    institution: str
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+
+
+@dataclass
+class InteractionRecord:
+    external_person_id: object
+    interaction_type: str
+    occurred_at: datetime
+    count: int = 1   # > 1 for a monthly roll-up (retention.py)
+
+
+@dataclass
+class EdgeRecord:
+    overlap_years: int
+    first_overlap_year: Optional[int]
+    last_overlap_year: Optional[int]
+
+
+@dataclass
+class PersonRecord:
+    id: object
+    full_name: str
+    location: Optional[str] = None
+    city_id: Optional[int] = None
+    metro_id: Optional[int] = None
+    current_title: Optional[str] = None
+    current_company: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    is_internal: bool = False
+    roles: List[RoleRecord] = field(default_factory=list)
+    education: List[EducationRecord] = field(default_factory=list)
+    interactions_as_internal: List[InteractionRecord] = field(default_factory=list)
+
+
+ALL_NEEDS = frozenset({"roles", "education", "interactions"})
+
+
+def person_record(person, needs=ALL_NEEDS) -> PersonRecord:
+    """
+    Copy an ORM Person into records, including only the relationships named in
+    `needs` (see scoring.SIGNAL_REGISTRY) so unused ones are never loaded.
+    """
+    return PersonRecord(
+        id=person.id,
+        full_name=person.full_name,
+        location=person.location,
+        city_id=person.city_id,
+        metro_id=person.metro_id,
+        current_title=person.current_title,
+        current_company=person.current_company,
+        linkedin_url=person.linkedin_url,
+        is_internal=bool(person.is_internal),
+        roles=[
+            RoleRecord(
+                org_id=r.org_id,
+                org=OrgRecord(r.org_id, r.org.name if r.org else str(r.org_id)),
+                start_year=r.start_year,
+                end_year=r.end_year,
+                is_board=bool(r.is_board),
+            )
+            for r in (person.roles or [] if "roles" in needs else [])
+        ],
+        education=[
+            EducationRecord(e.institution, e.start_year, e.end_year)
+            for e in (person.education or [] if "education" in needs else [])
+        ],
+        interactions_as_internal=[
+            InteractionRecord(i.external_person_id, i.interaction_type, i.occurred_at)
+            for i in (person.interactions_as_internal or [] if "interactions" in needs else [])
+        ] + [
+            InteractionRecord(r.external_person_id, r.interaction_type, r.last_occurred_at, r.count)
+            for r in (person.interaction_rollups or [] if "interactions" in needs else [])
+        ],
+    )
+
+
+def edge_records(pair_edges: dict) -> dict:
+    """{(sp_id, target_id): {org_id: CoworkerEdge}} → same shape with EdgeRecords."""
+    return {
+        pair: {
+            org_id: EdgeRecord(e.overlap_years, e.first_overlap_year, e.last_overlap_year)
+            for org_id, e in by_org.items()
+        }
+        for pair, by_org in pair_edges.items()
+    }
@@ -0,0 +1,221 @@
+"""
+Entity resolution for people.
+
+Groups records that refer to the same person ("Bob Smith" / "Robert Smith",
+"R. Smith", same LinkedIn profile under two URLs) in near-linear time:
+
+  1. Blocking — each record gets cheap keys (LinkedIn slug; last name +
+     company), and only records sharing a key are compared.
+  2. Matching — within a block, names match when last names agree and first
+     names agree after nickname canonicalization, by initial, or by fuzzy
+     similarity.
+  3. Merging — matches are unioned (union-find) into clusters.
+
+Pure Python; used by the finder (server.py) before deep-dive searches and by
+POST /api/people to avoid inserting duplicates.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Callable, List, Optional
+
+# Common English nicknames → canonical first name
+NICKNAMES = {
+    "bob": "robert", "bobby": "robert", "rob": "robert", "robbie": "robert", "bert": "robert",
+    "bill": "william", "billy": "william", "will": "william", "willy": "william", "liam": "william",
+    "jim": "james", "jimmy": "james", "jamie": "james",
+    "mike": "michael", "mikey": "michael", "mick": "michael",
+    "dave": "david", "davey": "david",
+    "dan": "daniel", "danny": "daniel",
+    "tom": "thomas", "tommy": "thomas",
+    "chris": "christopher", "kit": "christopher",
+    "steve": "steven", "stephen": "steven",
+    "joe": "joseph", "joey": "joseph",
+    "jon": "john", "johnny": "john", "jack": "john",
+    "rick": "richard", "rich": "richard", "dick": "richard", "richie": "richard",
+    "ed": "edward", "eddie": "edward", "ted": "edward", "ned": "edward",
+    "tony": "anthony",
+    "andy": "andrew", "drew": "andrew",
+    "matt": "matthew",
+    "nick": "nicholas", "nicky": "nicholas",
+    "pat": "patrick",
+    "pete": "peter",
+    "sam": "samuel", "sammy": "samuel",
+    "ben": "benjamin", "benji": "benjamin",
+    "alex": "alexander", "sandy": "alexander",
+    "greg": "gregory",
+    "jeff": "jeffrey", "geoff": "jeffrey", "geoffrey": "jeffrey",
+    "ken": "kenneth", "kenny": "kenneth",
+    "larry": "lawrence", "laurence": "lawrence",
+    "charlie": "charles", "chuck": "charles",
+    "tim": "timothy", "timmy": "timothy",
+    "ron": "ronald", "ronnie": "ronald",
+    "don": "donald", "donnie": "donald",
+    "doug": "douglas",
+    "fred": "frederick", "freddie": "frederick",
+    "hank": "henry", "harry": "henry",
+    "kate": "katherine", "katie": "katherine", "kathy": "katherine", "kathryn": "katherine",
+    "catherine": "katherine", "cathy": "katherine",
+    "liz": "elizabeth", "beth": "elizabeth", "betsy": "elizabeth", "lizzie": "elizabeth",
+    "jen": "jennifer", "jenny": "jennifer",
+    "sue": "susan", "susie": "susan",
+    "meg": "margaret", "maggie": "margaret", "peggy": "margaret",
+    "becky": "rebecca",
+    "vicky": "victoria", "tori": "victoria",
+    "abby": "abigail",
+    "pam": "pamela",
+    "debbie": "deborah", "deb": "deborah",
+}
+
+# Honorifics / suffixes / credentials dropped before matching
+_NOISE = {
+    "mr", "mrs", "ms", "dr", "prof", "jr", "sr", "ii", "iii", "iv",
+    "phd", "mba", "cpa", "cfa", "md", "jd", "esq", "pmp",
+}
+
+_PARENS = re.compile(r"\(.*?\)|\[.*?\]|\".*?\"")
+_NON_ALPHA = re.compile(r"[^a-z\s'-]")
+_LINKEDIN_SLUG = re.compile(r"linkedin\.com/in/([^/?#\s]+)", re.IGNORECASE)
+_COMPANY_SUFFIX = re.compile(r"\b(inc|incorporated|corp|corporation|co|llc|ltd|plc|group|holdings)\b\.?")
+
+FUZZY_THRESHOLD = 0.88
+
+
+@dataclass(frozen=True)
+class NameKey:
+    first: str          # canonical first name ("" if unknown)
+    last: str           # normalized last name
+    full: str           # normalized full name, noise removed
+
+
+def _ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def name_key(name: str) -> NameKey:
+    cleaned = _NON_ALPHA.sub(" ", _PARENS.sub(" ", _ascii(name or "").lower()))
+    tokens = [t.strip("'-") for t in cleaned.split()]
+    tokens = [t for t in tokens if t and t not in _NOISE]
+    if not tokens:
+        return NameKey("", "", "")
+    first = NICKNAMES.get(tokens[0], tokens[0]) if len(tokens) > 1 else ""
+    return NameKey(first, tokens[-1], " ".join(tokens))
+
+
+def linkedin_slug(url: Optional[str]) -> Optional[str]:
+    """'https://uk.linkedin.com/in/Bob-Smith-1a2b3c/?trk=x' → 'bob-smith-1a2b3c'"""
+    m = _LINKEDIN_SLUG.search(url or "")
+    return m.group(1).rstrip("/").lower() if m else None
+
+
+def company_key(company: Optional[str]) -> str:
+    return " ".join(_COMPANY_SUFFIX.sub(" ", _NON_ALPHA.sub(" ", (company or "").lower())).split())
+
+
+def _first_names_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    # "R Smith" vs "Robert Smith"
+    if len(a) == 1 or len(b) == 1:
+        return a[0] == b[0]
+    return SequenceMatcher(None, a, b).ratio() >= FUZZY_THRESHOLD
+
+
+def names_match(a: NameKey, b: NameKey) -> bool:
+    if not a.last or not b.last:
+        return False
+    if a.last != b.last and SequenceMatcher(None, a.last, b.last).ratio() < 0.9:
+        return False
+    if a.first and b.first:
+        return _first_names_match(a.first, b.first)
+    return SequenceMatcher(None, a.full, b.full).ratio() >= FUZZY_THRESHOLD
+
+
+class _UnionFind:
+    """Union-find that refuses to merge clusters with conflicting first names,
+    so "R. Smith" can't bridge "Robert Smith" and "Richard Smith"."""
+
+    def __init__(self, first_names: List[str]):
+        self.parent = list(range(len(first_names)))
+        self.firsts = [{f} if len(f) > 1 else set() for f in first_names]
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int, force: bool = False) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if not force and any(not _first_names_match(x, y) for x in self.firsts[ra] for y in self.firsts[rb]):
+            return
+        root, child = min(ra, rb), max(ra, rb)
+        self.parent[child] = root
+        self.firsts[root] |= self.firsts[child]
+
+
+def cluster(
+    items: list,
+    name: Callable,
+    url: Callable = lambda item: None,
+    company: Callable = lambda item: None,
+) -> List[List[int]]:
+    """
+    Group items that refer to the same person. Accessors pull the name,
+    LinkedIn URL and company from each item. Returns clusters of indexes,
+    each in input order, ordered by their first member.
+    """
+    keys = [name_key(name(item)) for item in items]
+    slugs = [linkedin_slug(url(item)) for item in items]
+    companies = [company_key(company(item)) for item in items]
+
+    blocks = defaultdict(list)
+    for i, key in enumerate(keys):
+        if slugs[i]:
+            blocks[("slug", slugs[i])].append(i)
+        if key.last:
+            blocks[("name", key.last, companies[i])].append(i)
+
+    uf = _UnionFind([k.first for k in keys])
+    for block_key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        same_profile = block_key[0] == "slug"
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = members[x], members[y]
+                if same_profile or names_match(keys[i], keys[j]):
+                    uf.union(i, j, force=same_profile)
+
+    clusters = defaultdict(list)
+    for i in range(len(items)):
+        clusters[uf.find(i)].append(i)
+    return sorted(clusters.values(), key=lambda c: c[0])
+
+
+def find_match(name: str, url: Optional[str], company: Optional[str], candidates: list,
+               cand_name: Callable, cand_url: Callable, cand_company: Callable):
+    """
+    Return the first candidate that is the same person as (name, url, company),
+    or None. The same LinkedIn profile is a match and a different one never
+    is (profiles are unique per person). Otherwise names must match and both
+    companies must be known and agree; a name alone isn't enough to call two
+    people the same.
+    """
+    key, slug, comp = name_key(name), linkedin_slug(url), company_key(company)
+    for cand in candidates:
+        other_slug = linkedin_slug(cand_url(cand))
+        if slug and other_slug:
+            if slug == other_slug:
+                return cand
+            continue
+        other_comp = company_key(cand_company(cand))
+        if not comp or not other_comp or comp != other_comp:
+            continue
+        if names_match(key, name_key(cand_name(cand))):
+            return cand
+    return None
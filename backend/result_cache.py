@@ -0,0 +1,158 @@
+"""
+Company-level result cache for the finder, keyed by LinkedIn slug.
+
+    fresh   (age < ttl)               served as-is
+    stale   (age < ttl + stale_ttl)   served immediately; one background
+                                      refresh is started
+    expired / missing                 computed while the caller waits
+
+Concurrent requests for the same slug share one in-flight computation
+(request coalescing), whether they're waiting on a miss or a refresh.
+
+With a `shared` store (shared_cache.SharedStore, under gunicorn), results are
+written through to it and a worker that has no fresh copy checks it before
+searching, so workers don't each search the same company. Coalescing is
+still per worker. Shared reads and writes are SQLite calls, so they run in
+the threadpool rather than on the event loop.
+
+Environment:
+    SP_RESULT_TTL_S     seconds a result stays fresh (default: 6 hours)
+    SP_RESULT_STALE_S   further seconds it may be served stale (default: 7 days)
+    SP_RESULT_CACHE_MAX max cached companies, least recently used evicted (default: 256)
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+log = logging.getLogger("sp-finder.cache")
+
+TTL_S = float(os.getenv("SP_RESULT_TTL_S", str(6 * 3600)))
+STALE_S = float(os.getenv("SP_RESULT_STALE_S", str(7 * 86400)))
+MAX_ENTRIES = int(os.getenv("SP_RESULT_CACHE_MAX", "256"))
+
+
+class ResultCache:
+    COUNTERS = ("hits", "stale_hits", "misses", "coalesced", "refreshes", "refresh_errors", "not_stored")
+
+    def __init__(self, ttl: float = TTL_S, stale_ttl: float = STALE_S, max_entries: int = MAX_ENTRIES,
+                 cacheable: Callable[[Any], bool] = lambda value: True, shared=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self.shared = shared
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.counters["shared_hits"] = 0
+        self._entries = OrderedDict()   # key → (stored_at, value)
+        self._inflight = {}             # key → asyncio.Task
+
+    async def get(self, key: str, compute: Callable[[], Awaitable[Any]], refresh: bool = False) -> tuple[Any, str]:
+        """
+        Return (value, status) where status is "hit", "stale" or "miss".
+        `refresh=True` skips the cache but still joins an in-flight computation.
+        """
+        entry = self._entries.get(key)
+        if self.shared and not refresh and (not entry or time.monotonic() - entry[0] >= self.ttl):
+            entry = await self._from_shared(key) or entry
+        if entry and not refresh:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                if age < self.ttl:
+                    self.counters["hits"] += 1
+                    return entry[1], "hit"
+                self.counters["stale_hits"] += 1
+                if key not in self._inflight:
+                    self.counters["refreshes"] += 1
+                    self._start(key, compute)
+                return entry[1], "stale"
+
+        self.counters["misses"] += 1
+        if key in self._inflight:
+            self.counters["coalesced"] += 1
+            task = self._inflight[key]
+        else:
+            task = self._start(key, compute)
+        # shield: a client disconnecting mustn't cancel the shared computation
+        return await asyncio.shield(task), "miss"
+
+    async def has(self, key: str) -> bool:
+        """Whether get() would answer from the cache (fresh or stale) rather than computing."""
+        entry = self._entries.get(key)
+        if self.shared and (not entry or time.monotonic() - entry[0] >= self.ttl):
+            entry = await self._from_shared(key) or entry
+        return bool(entry) and time.monotonic() - entry[0] < self.ttl + self.stale_ttl
+
+    def _start(self, key: str, compute) -> asyncio.Task:
+        task = asyncio.ensure_future(self._run(key, compute))
+        # Background refreshes may have no awaiter; mark their errors as retrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _run(self, key: str, compute):
+        try:
+            value = await compute()
+        except Exception:
+            if key in self._entries:
+                self.counters["refresh_errors"] += 1
+                log.exception(f"Background refresh failed for '{key}'; keeping the cached result")
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if self.cacheable(value):
+            self._store(key, value)
+            if self.shared:
+                await run_in_threadpool(self._share, key, value)
+        else:
+            self.counters["not_stored"] += 1
+        return value
+
+    def _store(self, key: str, value, stored_at: float = None) -> None:
+        self._entries[key] = (stored_at or time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _share(self, key: str, value) -> None:
+        try:
+            self.shared.put(key, value)
+        except Exception:
+            log.exception(f"Couldn't share the result for '{key}'")
+
+    def _read_shared(self, key: str):
+        try:
+            return self.shared.get(key)
+        except Exception:
+            log.exception(f"Couldn't read the shared result for '{key}'")
+            return None
+
+    async def _from_shared(self, key: str):
+        """Another worker's newer entry, stored locally; None if there isn't one."""
+        found = await run_in_threadpool(self._read_shared, key)
+        if not found:
+            return None
+        # Shared times are wall-clock; ours are monotonic
+        stored_at = time.monotonic() - (time.time() - found[0])
+        local = self._entries.get(key)
+        if local and local[0] >= stored_at:
+            return None
+        self.counters["shared_hits"] += 1
+        self._store(key, found[1], stored_at)
+        return self._entries[key]
+
+    def invalidate(self, key: str = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+        if self.shared:
+            self.shared.delete(key)
+
+    def report(self) -> dict:
+        return {**self.counters, "entries": len(self._entries), "inflight": len(self._inflight)}
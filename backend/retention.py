@@ -0,0 +1,255 @@
+"""
+Interaction log retention — raw rows for recent history, monthly roll-ups
+for everything older.
+
+CRM sync keeps appending to `interactions`. Once a calendar month is older
+than RCP_INTERACTION_RETENTION_DAYS, rollup() compacts its rows into
+`interaction_rollups`: one row per (SP member, target, interaction type,
+month) with a count and the latest timestamp. The raw rows and their notes
+are then deleted. Scoring reads both (Person.interaction_rollups next to
+interactions_as_internal, merged by records.person_record and the snapshot),
+and a roll-up scores as `count` interactions on its latest date. Live scores
+don't move, because interaction points have decayed to 0 well inside a year.
+Backtests see rolled-up months at month granularity.
+
+On Postgres, `interactions` is range-partitioned by month of occurred_at
+(partition_interactions(), run by bootstrap migration 4). Each run creates
+the next RCP_INTERACTION_PARTITIONS_AHEAD months' partitions, and a month
+that's been rolled up is dropped as a whole partition instead of deleted row
+by row. Rows outside the partitions land in `interactions_default` and are
+rolled up by delete. SQLite keeps one table and relies on the (person,
+occurred_at) indexes.
+
+Run it daily (cron, or a Fly.io scheduled machine); it's idempotent, and late
+arrivals for an already rolled-up month are folded into the existing rows:
+
+    python retention.py              # roll up everything past the window
+    python retention.py status
+
+Environment:
+    RCP_INTERACTION_RETENTION_DAYS     raw interactions kept (default: 365)
+    RCP_INTERACTION_PARTITIONS_AHEAD   future monthly partitions kept ready on Postgres (default: 3)
+"""
+import logging
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, text
+
+from models import Interaction, InteractionRollup
+
+log = logging.getLogger("rcp.retention")
+
+RETENTION_DAYS = int(os.getenv("RCP_INTERACTION_RETENTION_DAYS", "365"))
+PARTITIONS_AHEAD = int(os.getenv("RCP_INTERACTION_PARTITIONS_AHEAD", "3"))
+CHUNK_ROWS = 5000
+
+_PARTITION_NAME = re.compile(r"^interactions_y(\d{4})m(\d{2})$")
+
+
+def _month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def cutoff(today: date = None) -> date:
+    """First day of the oldest month still kept raw; everything before it is rolled up."""
+    return _month_start((today or date.today()) - timedelta(days=RETENTION_DAYS))
+
+
+def _postgres(db) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _bound(db, month: date) -> datetime:
+    """Month boundary as a timestamp; explicit UTC on Postgres (occurred_at is timestamptz)."""
+    bound = datetime(month.year, month.month, 1)
+    return bound.replace(tzinfo=timezone.utc) if _postgres(db) else bound
+
+
+# ── Partitions (Postgres) ────────────────────────────────────────────────────
+
+def _partition_name(month: date) -> str:
+    return f"interactions_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(db) -> bool:
+    if not _postgres(db):
+        return False
+    return db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'interactions'"
+    )).first() is not None
+
+
+def partitions(db) -> dict:
+    """{month: partition name} for the monthly partitions of `interactions`."""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'interactions'"
+    )).scalars()
+    months = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months[date(int(match[1]), int(match[2]), 1)] = name
+    return months
+
+
+def ensure_partitions(db, since: date = None) -> int:
+    """Create monthly partitions from `since` (default: this month) through PARTITIONS_AHEAD months out."""
+    if not is_partitioned(db):
+        return 0
+    existing = partitions(db)
+    month, last = since or _month_start(date.today()), _month_start(date.today())
+    for _ in range(PARTITIONS_AHEAD):
+        last = _next_month(last)
+    created = 0
+    while month <= last:
+        if month not in existing:
+            db.execute(text(
+                f"CREATE TABLE {_partition_name(month)} PARTITION OF interactions "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{_next_month(month).isoformat()} 00:00:00+00')"
+            ))
+            created += 1
+        month = _next_month(month)
+    return created
+
+
+def partition_interactions(db) -> bool:
+    """
+    Rebuild `interactions` as a table partitioned by month of occurred_at
+    (Postgres only; returns False elsewhere or if it already is). The primary
+    key becomes (id, occurred_at), since a partitioned table's keys must
+    include the partition column; ids keep coming from the same sequence.
+    """
+    if not _postgres(db) or is_partitioned(db):
+        return False
+    oldest = db.execute(text("SELECT MIN(occurred_at) FROM interactions")).scalar()
+    db.execute(text("ALTER TABLE interactions RENAME TO interactions_unpartitioned"))
+    db.execute(text("CREATE TABLE interactions (LIKE interactions_unpartitioned INCLUDING DEFAULTS) "
+                    "PARTITION BY RANGE (occurred_at)"))
+    db.execute(text("ALTER TABLE interactions ADD PRIMARY KEY (id, occurred_at)"))
+    for column in ("internal_person_id", "external_person_id"):
+        db.execute(text(f"ALTER TABLE interactions ADD FOREIGN KEY ({column}) REFERENCES persons (id)"))
+    db.execute(text("ALTER SEQUENCE interactions_id_seq OWNED BY interactions.id"))
+    db.execute(text("CREATE TABLE interactions_default PARTITION OF interactions DEFAULT"))
+    ensure_partitions(db, since=_month_start(oldest) if oldest else None)
+    db.execute(text("INSERT INTO interactions SELECT * FROM interactions_unpartitioned"))
+    db.execute(text("DROP TABLE interactions_unpartitioned"))
+    for index in Interaction.__table__.indexes:   # created on the parent, inherited by every partition
+        index.create(db.connection(), checkfirst=True)
+    return True
+
+
+# ── Roll-up ──────────────────────────────────────────────────────────────────
+
+def _months_to_roll_up(db, before: date, partitioned: bool) -> list:
+    """Months before `before` that still have raw rows (or, on Postgres, a partition)."""
+    months = {m for m in partitions(db) if m < before} if partitioned else set()
+    limit = _bound(db, before)
+    oldest = db.query(func.min(Interaction.occurred_at)).filter(Interaction.occurred_at < limit).scalar()
+    while oldest is not None:
+        month = _month_start(oldest)
+        months.add(month)
+        oldest = db.query(func.min(Interaction.occurred_at)).filter(
+            Interaction.occurred_at >= _bound(db, _next_month(month)), Interaction.occurred_at < limit
+        ).scalar()
+    return sorted(months)
+
+
+def _roll_up_month(db, month: date, partition: str = None) -> tuple:
+    """Fold one month's raw rows into its roll-ups and drop them. Returns (rows, roll-ups touched)."""
+    if partition:
+        db.execute(text(f"LOCK TABLE {partition} IN EXCLUSIVE MODE"))   # no inserts until it's dropped
+    in_month = (Interaction.occurred_at >= _bound(db, month)) & (Interaction.occurred_at < _bound(db, _next_month(month)))
+    groups, rows, max_id = {}, 0, 0
+    query = db.query(
+        Interaction.id, Interaction.internal_person_id, Interaction.external_person_id,
+        Interaction.interaction_type, Interaction.occurred_at,
+    ).filter(in_month)
+    for id_, internal_id, external_id, kind, occurred_at in query.yield_per(CHUNK_ROWS):
+        key = (internal_id, external_id, kind)
+        count, last = groups.get(key, (0, occurred_at))
+        groups[key] = (count + 1, max(last, occurred_at))
+        rows += 1
+        max_id = max(max_id, id_)
+
+    existing = {
+        (r.internal_person_id, r.external_person_id, r.interaction_type): r
+        for r in db.query(InteractionRollup).filter(InteractionRollup.month == month)
+    }
+    for (internal_id, external_id, kind), (count, last) in groups.items():
+        rollup = existing.get((internal_id, external_id, kind))
+        if rollup is None:
+            db.add(InteractionRollup(
+                internal_person_id=internal_id, external_person_id=external_id, interaction_type=kind,
+                month=month, count=count, last_occurred_at=last,
+            ))
+        else:
+            rollup.count += count
+            rollup.last_occurred_at = max(rollup.last_occurred_at, last)
+    db.flush()
+
+    if partition:
+        db.execute(text(f"DROP TABLE {partition}"))
+    elif rows:
+        # Only what was read: an insert racing the roll-up waits for the next run
+        db.query(Interaction).filter(in_month, Interaction.id <= max_id).delete(synchronize_session=False)
+    db.commit()
+    return rows, len(groups)
+
+
+def rollup(db, today: date = None) -> dict:
+    """Roll up every month before cutoff(today), one transaction per month."""
+    before = cutoff(today)
+    partitioned = is_partitioned(db)
+    stats = {"cutoff": before.isoformat(), "months": 0, "rows": 0, "rollups": 0, "partitions_dropped": 0,
+             "partitions_created": ensure_partitions(db)}
+    db.commit()
+    by_month = partitions(db) if partitioned else {}
+    for month in _months_to_roll_up(db, before, partitioned):
+        rows, groups = _roll_up_month(db, month, by_month.get(month))
+        log.info(f"Rolled up {month:%Y-%m}: {rows} interactions → {groups} roll-ups")
+        stats["months"] += 1
+        stats["rows"] += rows
+        stats["rollups"] += groups
+        stats["partitions_dropped"] += month in by_month
+    return stats
+
+
+def status(db) -> dict:
+    return {
+        "retention_days": RETENTION_DAYS,
+        "cutoff": cutoff().isoformat(),
+        "raw_rows": db.query(func.count(Interaction.id)).scalar(),
+        "oldest_raw": db.query(func.min(Interaction.occurred_at)).scalar(),
+        "rollup_rows": db.query(func.count(InteractionRollup.id)).scalar(),
+        "partitioned": is_partitioned(db),
+        "partitions": len(partitions(db)) if _postgres(db) else 0,
+    }
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    command = sys.argv[1] if len(sys.argv) > 1 else "rollup"
+    db = SessionLocal()
+    try:
+        if command == "rollup":
+            stats = rollup(db)
+            print(f"✅ Rolled up {stats['rows']} interactions from {stats['months']} month(s) into "
+                  f"{stats['rollups']} roll-ups (cutoff {stats['cutoff']})")
+        elif command == "status":
+            for key, value in status(db).items():
+                print(f"{key:>14}: {value}")
+        else:
+            sys.exit(f"Unknown command {command!r}; expected rollup or status")
+    finally:
+        db.close()
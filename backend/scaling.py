@@ -0,0 +1,140 @@
+"""
+Worker scaling check: run an app under gunicorn (gunicorn.conf.py) with 1, 2,
+4 … workers and measure throughput of a CPU-bound request mix at a fixed
+concurrency. With one worker per core, req/s should grow about linearly up to
+the core count.
+
+    python scaling.py                              # main:app, /api/connectivity
+    python scaling.py --workers 1 2 4 8 --concurrency 32 --duration 20
+    python scaling.py --app server:app             # finder, POST /api/score
+
+main:app requests pass an as_of date so the score cache doesn't turn the test
+into a cache benchmark. Point DATABASE_URL at a populated database (e.g. one
+built with seed.py) that's already migrated (python bootstrap.py): the apps
+start with RCP_BOOTSTRAP=skip, so it's only read.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+HERE = Path(__file__).parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(client: httpx.AsyncClient, path: str, timeout_s: float = 120) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(path)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"{path} not ready after {timeout_s}s")
+
+
+# Each scenario: async setup(client) → a function making the next request
+async def _main_app_requests(client: httpx.AsyncClient):
+    people = (await client.get("/api/people")).json()
+    targets = [p["id"] for p in people if not p["is_internal"]] or [p["id"] for p in people]
+    return lambda: client.get("/api/connectivity", params={"target_id": random.choice(targets), "as_of": "2030-01-01"})
+
+
+async def _finder_requests(client: httpx.AsyncClient):
+    companies = ["Salesforce", "Oracle", "Google", "Microsoft", "Stripe", "Snowflake", "Datadog", "HubSpot"]
+    people = [{"id": f"p{i}", "name": f"Person {i}", "orgs": random.sample(companies, 2),
+               "location": random.choice(["San Francisco, CA", "New York, NY", "Boston, MA"])} for i in range(200)]
+    return lambda: client.post("/api/score", json={"people": people})
+
+
+SCENARIOS = {"main:app": ("/api/ready", _main_app_requests), "server:app": ("/api/health", _finder_requests)}
+
+
+async def _drive(base_url: str, app: str, concurrency: int, duration_s: float) -> dict:
+    ready_path, setup = SCENARIOS[app]
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        await wait_ready(client, ready_path)
+        next_request = await setup(client)
+        latencies, errors = [], 0
+        deadline = time.monotonic() + duration_s
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await next_request()
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None,
+        "errors": errors,
+    }
+
+
+def start_app(app: str, workers: int, port: int, env: dict = None) -> subprocess.Popen:
+    """
+    `app` under gunicorn.conf.py with its own shared cache, no worker recycling,
+    no access log, and no startup pipeline (the database is never written).
+    """
+    env = {**os.environ, **(env or {}), "WEB_CONCURRENCY": str(workers), "PORT": str(port), "RCP_MAX_REQUESTS": "0",
+           "RCP_BOOTSTRAP": "skip"}
+    env.pop("RCP_SHARED_DIR", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", os.devnull, app],
+        cwd=HERE, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def run(app: str, workers: int, concurrency: int, duration_s: float) -> dict:
+    port = free_port()
+    proc = start_app(app, workers, port)
+    try:
+        return asyncio.run(_drive(f"http://127.0.0.1:{port}", app, concurrency, duration_s))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", default="main:app", choices=sorted(SCENARIOS))
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16) if n <= (os.cpu_count() or 1)])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15, help="seconds per worker count")
+    args = parser.parse_args()
+
+    print(f"{args.app}: {args.concurrency} concurrent clients, {args.duration:g}s per run, "
+          f"{os.cpu_count()} CPUs\n")
+    print(f"{'workers':>7}  {'req/s':>8}  {'speedup':>7}  {'per-worker':>10}  {'p50 ms':>8}  {'p95 ms':>8}  errors")
+    base = None
+    for n in args.workers:
+        r = run(args.app, n, args.concurrency, args.duration)
+        base = base or r["rps"]
+        speedup = r["rps"] / base if base else 0
+        print(f"{n:>7}  {r['rps']:>8.1f}  {speedup:>6.2f}x  {speedup / n:>9.0%}  "
+              f"{r['p50_ms'] or 0:>8.1f}  {r['p95_ms'] or 0:>8.1f}  {r['errors']}")
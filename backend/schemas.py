@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
 
 
 class RoleOut(BaseModel):
@@ -41,6 +41,8 @@ class PersonSummary(BaseModel):
     current_title: Optional[str]
     current_company: Optional[str]
     location: Optional[str]
+    city_id: Optional[int] = None     # geo.py gazetteer ids
+    metro_id: Optional[int] = None
     linkedin_url: Optional[str]
     is_internal: bool
 
@@ -101,6 +103,15 @@ class OrgCreate(BaseModel):
     is_portfolio: bool = False
 
 
+class AlumniOut(BaseModel):
+    person: PersonSummary
+    title: Optional[str]
+    start_year: Optional[int]
+    end_year: Optional[int]
+    is_board: bool
+    overlap_years: Optional[int] = None  # with ?overlap_with= only
+
+
 class RoleCreate(BaseModel):
     person_id: int
     org_name: str
@@ -126,6 +137,9 @@ class Signal(BaseModel):
     points: int
     icon: str
 
+    class Config:
+        from_attributes = True
+
 
 class ConnectorResult(BaseModel):
     sp_member: PersonSummary
@@ -156,15 +170,68 @@ class OverlapResult(BaseModel):
         from_attributes = True
 
 
+class OverlapGroup(BaseModel):
+    person: PersonSummary
+    best_score: int
+    strength: str
+    count: int
+    overlaps: List[OverlapResult]
+
+
 class CompanyConnectivityResponse(BaseModel):
     org: OrgSummary
     overlaps: List[OverlapResult]
     total: int
+    groups: Optional[List[OverlapGroup]] = None
 
     class Config:
         from_attributes = True
 
 
+class CompactOverlap(BaseModel):
+    sp: int           # ids into CompactCompanyConnectivityResponse.people
+    target: int
+    score: int
+    strength: str
+    signals: List[Tuple[str, str, int]]   # (type, label, points); details from /api/connectivity?target_id=
+
+
+class CompactOverlapGroup(BaseModel):
+    person: int
+    best_score: int
+    strength: str
+    count: int
+    overlaps: List[CompactOverlap]
+
+
+class CompactCompanyConnectivityResponse(BaseModel):
+    """?format=compact: each person once in `people`, overlaps refer to them by id."""
+    format: str = "compact"
+    org: OrgSummary
+    people: List[PersonSummary]
+    icons: Dict[str, str]             # signal type → icon
+    overlaps: List[CompactOverlap]
+    total: int
+    groups: Optional[List[CompactOverlapGroup]] = None
+
+
+class BatchConnectivityRequest(BaseModel):
+    target_ids: List[int] = []
+    linkedin_slugs: List[str] = []    # every external person at each company
+    limit: Optional[int] = Field(None, ge=1)   # connectors per target
+    min_score: int = 0
+    strength: Optional[str] = None
+    as_of: Optional[date] = None
+    signals: Optional[str] = None
+    weights: Optional[str] = None
+
+
+class BatchConnectivityResponse(BaseModel):
+    results: List[ConnectivityResponse]
+    missing_target_ids: List[int] = []
+    missing_slugs: List[str] = []
+
+
 class InteractionCreate(BaseModel):
     internal_person_id: int
     external_person_id: int
@@ -180,3 +247,15 @@ class InteractionOut(InteractionCreate):
 
     class Config:
         from_attributes = True
+
+
+class InteractionRollupOut(BaseModel):
+    internal_person_id: int
+    external_person_id: int
+    interaction_type: Optional[str] = None
+    month: date
+    count: int
+    last_occurred_at: datetime
+
+    class Config:
+        from_attributes = True
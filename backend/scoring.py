@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import date
+import heapq
 import math
 
+import geo
+
 
 @dataclass
 class Signal:
@@ -28,73 +31,265 @@ def _school_normalize(name: str) -> str:
         .strip())
 
 
+def _span(start, end, open_end="present") -> str:
+    """" (1998–2004)" for the details; empty when the start year is unknown."""
+    if start is None:
+        return ""
+    return f" ({start}–{end or open_end})"
+
+
 def _years_overlap(a_start, a_end, b_start, b_end) -> bool:
     if None in (a_start, a_end, b_start, b_end):
         return False
     return a_start <= b_end and b_start <= a_end
 
 
-def _recency_decay(end_year: int) -> float:
-    if end_year is None:
-        return 1.0  # current role
-    current_year = date.today().year
-    years_ago = current_year - end_year
+def _recency_decay(years_ago: int) -> float:
     if years_ago <= 3:
         return 1.0
     return max(0.4, 1.0 - 0.08 * (years_ago - 3))
 
 
-def compute_connectivity(sp_member, target) -> ConnectivityResult:
+def _interaction_points(days_ago: int) -> int:
+    months_ago = days_ago / 30
+    return int(min(25, 25 * math.exp(-0.3 * months_ago)))
+
+
+# Scores cap at 100, so a bigger multiplier can't change a result
+MAX_WEIGHT = 100.0
+
+
+class ScoringContext:
+    """
+    Per-request scoring snapshot. Captures the reference date once and
+    precomputes the recency and interaction decay tables, so the inner loops
+    do list lookups instead of date.today()/math.exp per role or interaction.
+
+    `signals` selects registered signals by name (default: all) and `weights`
+    maps signal name → multiplier applied to its points. Unknown names and
+    weights outside 0–MAX_WEIGHT (or not numbers at all, like nan) raise
+    ValueError.
+
+    Passing `as_of` scores the graph as it stood on that date (for backtests):
+    roles/education starting later and interactions after it are ignored, and
+    overlaps are cut off at that year. Backtests compare roles directly rather
+    than reading coworker edges, which keep each pair's longest overlap even
+    when it started after as_of.
+    """
+
+    def __init__(self, as_of: date = None, signals=None, weights=None):
+        self.backtest = as_of is not None
+        self.as_of = as_of or date.today()
+        self.year = self.as_of.year
+
+        # Recency decay by years ago; bottoms out at 0.4 after ~11 years
+        self._decay_by_years = [_recency_decay(y) for y in range(12)]
+
+        # Interaction points by days ago, up to the day they reach 0
+        self._points_by_days = []
+        days = 0
+        while _interaction_points(days) > 0:
+            self._points_by_days.append(_interaction_points(days))
+            days += 1
+
+        selected = set(signals) if signals else set(SIGNAL_REGISTRY)
+        weights = dict(weights or {})
+        unknown = (selected | set(weights)) - set(SIGNAL_REGISTRY)
+        if unknown:
+            raise ValueError(f"Unknown signal(s): {', '.join(sorted(unknown))}")
+        weights = {name: float(w) for name, w in weights.items()}
+        bad = [name for name, w in weights.items() if not 0 <= w <= MAX_WEIGHT]   # nan fails too
+        if bad:
+            raise ValueError(f"Weights must be between 0 and {MAX_WEIGHT:g}: {', '.join(sorted(bad))}")
+        self.signals = [
+            (spec, weights.get(name, 1.0))
+            for name, spec in SIGNAL_REGISTRY.items() if name in selected
+        ]
+        self.needs = {need for spec, _ in self.signals for need in spec.needs}
+        if self.backtest:
+            self.needs.discard("edges")
+
+    def recency_decay(self, end_year) -> float:
+        if end_year is None:
+            return 1.0  # current role
+        years_ago = self.year - end_year
+        if years_ago < 0:
+            return 1.0
+        if years_ago < len(self._decay_by_years):
+            return self._decay_by_years[years_ago]
+        return self._decay_by_years[-1]
+
+    def interaction_points(self, occurred_at) -> int:
+        days_ago = (self.as_of - occurred_at.date()).days
+        if days_ago < 0:
+            return 25
+        if days_ago < len(self._points_by_days):
+            return self._points_by_days[days_ago]
+        return 0
+
+    def end_year(self, end_year) -> int:
+        """Resolve NULL (current) end years, clamped to the as-of year for backtests."""
+        if end_year is None:
+            return self.year
+        return min(end_year, self.year) if self.backtest else end_year
+
+    def started(self, start_year) -> bool:
+        return not self.backtest or start_year is None or start_year <= self.year
+
+
+_default_contexts = {}
+
+
+def default_context() -> ScoringContext:
+    """Shared context for today's date, rebuilt when the date rolls over."""
+    today = date.today()
+    ctx = _default_contexts.get(today)
+    if ctx is None:
+        _default_contexts.clear()
+        ctx = _default_contexts[today] = ScoringContext()
+    return ctx
+
+
+def edge_overlap_years(edge, ctx: ScoringContext = None) -> int:
+    """Overlap of a CoworkerEdge, extending still-current overlaps to the context year (not for backtests)."""
+    ctx = ctx or default_context()
+    if edge.last_overlap_year is None:
+        return max(0, ctx.year - edge.first_overlap_year)
+    return edge.overlap_years
+
+
+def _role_overlap_years(sr, tr, ctx: ScoringContext) -> int:
+    s_end = ctx.end_year(sr.end_year)
+    t_end = ctx.end_year(tr.end_year)
+    overlap_start = max(sr.start_year or 0, tr.start_year or 0)
+    overlap_end   = min(s_end, t_end)
+    return max(0, overlap_end - overlap_start)
+
+
+# ── Signal registry ──────────────────────────────────────────────────────────
+#
+# Each signal is a function (sp_member, target, edges, ctx) -> List[Signal]
+# registered with the data it reads, so callers can pick signals per request
+# and the API only loads what the selected signals need:
+#   "roles"         Person.roles (+ Role.org)
+#   "education"     Person.education
+#   "interactions"  SP member's interactions_as_internal
+#   "edges"         precomputed coworker_edges for the pair
+#
+# A signal may also declare `index`: a pair of functions (member_keys,
+# target_keys), each (person, ctx) -> set of hashable keys, such that the
+# signal can only fire when the two sets intersect. MemberIndex uses these to
+# skip members that can't score; signals without one make it scan everyone.
+
+@dataclass
+class SignalSpec:
+    name: str
+    fn: Callable
+    needs: Tuple[str, ...] = ()
+    index: Optional[Tuple[Callable, Callable]] = None
+
+
+SIGNAL_REGISTRY: Dict[str, SignalSpec] = {}
+
+
+def register_signal(name: str, needs=(), index=None):
+    def decorator(fn):
+        SIGNAL_REGISTRY[name] = SignalSpec(name, fn, tuple(needs), index)
+        return fn
+    return decorator
+
+
+def _roles(person, ctx: ScoringContext) -> list:
+    roles = list(person.roles or [])
+    return [r for r in roles if ctx.started(r.start_year)] if ctx.backtest else roles
+
+
+def _education(person, ctx: ScoringContext) -> list:
+    edu = list(person.education or [])
+    return [e for e in edu if ctx.started(e.start_year)] if ctx.backtest else edu
+
+
+def _city(person) -> str:
+    return person.location.split(",")[0].strip().lower() if person.location else ""
+
+
+# Index keys (see SignalSpec.index)
+def _org_keys(person, ctx):
+    return {("org", r.org_id) for r in _roles(person, ctx)}
+
+def _school_keys(person, ctx):
+    return {("school", _school_normalize(e.institution)) for e in _education(person, ctx)}
+
+def _city_keys(person, ctx):
+    keys = {("city", _city(person))} if person.location else set()
+    if person.city_id is not None:
+        keys.add(("city_id", person.city_id))
+    if person.metro_id is not None:
+        keys.add(("metro", person.metro_id))
+    return keys
+
+def _interactions(sp_member):
+    """Raw interactions plus monthly roll-ups of older ones (retention.py). Records carry both in one list."""
+    yield from getattr(sp_member, "interactions_as_internal", [])
+    yield from getattr(sp_member, "interaction_rollups", [])
+
+def _met_keys(sp_member, ctx):
+    return {("met", i.external_person_id) for i in _interactions(sp_member)}
+
+def _target_met_keys(target, ctx):
+    return {("met", target.id)}
+
+
+@register_signal("company", needs=("roles", "edges"), index=(_org_keys, _org_keys))
+def company_signal(sp_member, target, edges, ctx: ScoringContext) -> List[Signal]:
     signals: List[Signal] = []
     seen_org_ids = set()
 
-    sp_roles = list(sp_member.roles or [])
-    t_roles  = list(target.roles or [])
-    sp_edu   = list(sp_member.education or [])
-    t_edu    = list(target.education or [])
+    t_work_roles = {}
+    for tr in _roles(target, ctx):
+        if not tr.is_board:
+            t_work_roles.setdefault(tr.org_id, tr)
 
-    # ── 1. Company overlap ───────────────────────────────────────────────────
-    for sr in sp_roles:
-        if sr.is_board:
+    for sr in _roles(sp_member, ctx):
+        if sr.is_board or sr.org_id in seen_org_ids:
+            continue
+        tr = t_work_roles.get(sr.org_id)
+        if tr is None:
             continue
-        for tr in t_roles:
-            if tr.is_board:
-                continue
-            if sr.org_id != tr.org_id:
-                continue
-            if sr.org_id in seen_org_ids:
-                continue
 
-            # Calculate year overlap
-            s_end = sr.end_year or date.today().year
-            t_end = tr.end_year or date.today().year
-            overlap_start = max(sr.start_year or 0, tr.start_year or 0)
-            overlap_end   = min(s_end, t_end)
-            overlap_years = max(0, overlap_end - overlap_start)
+        if edges is not None and not ctx.backtest:
+            edge = edges.get(sr.org_id)
+            overlap_years = edge_overlap_years(edge, ctx) if edge else 0
+        else:
+            overlap_years = _role_overlap_years(sr, tr, ctx)
 
-            if overlap_years < 0:
-                continue
+        pts = 30 * min(overlap_years / 3.0, 1.0) * ctx.recency_decay(tr.end_year)
+        pts = max(8, pts)  # floor: even 0-overlap same-company = 8pts
 
-            pts = 30 * min(overlap_years / 3.0, 1.0) * _recency_decay(tr.end_year)
-            pts = max(8, pts)  # floor: even 0-overlap same-company = 8pts
+        label = f"Both worked at {sr.org.name}"
+        detail = (
+            f"{sp_member.full_name}{_span(sr.start_year, sr.end_year)} and "
+            f"{target.full_name}{_span(tr.start_year, tr.end_year)} "
+            f"both worked at {sr.org.name}"
+        )
+        if sr.start_year is None and tr.start_year is None:
+            detail += "."   # undated (e.g. ad-hoc finder people): overlap unknown
+        elif overlap_years > 0:
+            detail += f" with {overlap_years} year(s) of overlap."
+        else:
+            detail += ", though at different times."
 
-            label = f"Both worked at {sr.org.name}"
-            detail = (
-                f"{sp_member.full_name} ({sr.start_year}–{sr.end_year or 'present'}) and "
-                f"{target.full_name} ({tr.start_year}–{tr.end_year or 'present'}) "
-                f"both worked at {sr.org.name}"
-            )
-            if overlap_years > 0:
-                detail += f" with {overlap_years} year(s) of overlap."
-            else:
-                detail += ", though at different times."
+        signals.append(Signal("company", label, detail, int(pts), "🏢"))
+        seen_org_ids.add(sr.org_id)
+    return signals
 
-            signals.append(Signal("company", label, detail, int(pts), "🏢"))
-            seen_org_ids.add(sr.org_id)
 
-    # ── 2. Board overlap ─────────────────────────────────────────────────────
+@register_signal("board", needs=("roles",), index=(_org_keys, _org_keys))
+def board_signal(sp_member, target, edges, ctx: ScoringContext) -> List[Signal]:
+    sp_roles = _roles(sp_member, ctx)
     sp_boards = {r.org_id for r in sp_roles if r.is_board}
-    t_boards  = {r.org_id for r in t_roles  if r.is_board}
+    t_boards  = {r.org_id for r in _roles(target, ctx) if r.is_board}
+    signals: List[Signal] = []
     for org_id in sp_boards & t_boards:
         org_name = next((r.org.name for r in sp_roles if r.org_id == org_id), str(org_id))
         signals.append(Signal(
@@ -103,9 +298,14 @@ def compute_connectivity(sp_member, target) -> ConnectivityResult:
             f"Both {sp_member.full_name} and {target.full_name} sit/sat on the {org_name} board.",
             20, "🪑"
         ))
+    return signals
 
-    # ── 3. Education overlap ─────────────────────────────────────────────────
-    for se in sp_edu:
+
+@register_signal("education", needs=("education",), index=(_school_keys, _school_keys))
+def education_signal(sp_member, target, edges, ctx: ScoringContext) -> List[Signal]:
+    signals: List[Signal] = []
+    t_edu = _education(target, ctx)
+    for se in _education(sp_member, ctx):
         for te in t_edu:
             if _school_normalize(se.institution) != _school_normalize(te.institution):
                 continue
@@ -123,39 +323,186 @@ def compute_connectivity(sp_member, target) -> ConnectivityResult:
                 )
             else:
                 detail = (
-                    f"{sp_member.full_name} attended {se.institution} ({se.start_year}–{se.end_year}); "
-                    f"{target.full_name} attended {te.start_year}–{te.end_year}. "
-                    f"No time overlap — different years."
+                    f"{sp_member.full_name} attended {se.institution}{_span(se.start_year, se.end_year, '?')}; "
+                    f"{target.full_name} attended{_span(te.start_year, te.end_year, '?') or ' too'}. "
+                    + ("No time overlap — different years." if None not in (se.start_year, te.start_year)
+                       else "Years unknown.")
                 )
             signals.append(Signal("education", label, detail, pts, "🎓"))
+    return signals
+
+
+@register_signal("location", index=(_city_keys, _city_keys))
+def location_signal(sp_member, target, edges, ctx: ScoringContext) -> List[Signal]:
+    if not (sp_member.location and target.location):
+        return []
+    # Geocoded people compare city ids; free text the gazetteer doesn't know
+    # falls back to comparing the first comma-separated part.
+    if sp_member.city_id is not None and target.city_id is not None:
+        same_city = sp_member.city_id == target.city_id
+    else:
+        same_city = _city(sp_member) == _city(target)
+    if same_city:
+        return [Signal(
+            "location",
+            f"Same location — {sp_member.location}",
+            f"Both {sp_member.full_name} and {target.full_name} are based in {sp_member.location}.",
+            5, "📍"
+        )]
+    if sp_member.metro_id is not None and sp_member.metro_id == target.metro_id:
+        metro = geo.metro_name(sp_member.metro_id)
+        return [Signal(
+            "location",
+            f"Same metro — {metro}",
+            f"{sp_member.full_name} ({sp_member.location}) and {target.full_name} ({target.location}) "
+            f"are both in the {metro}.",
+            3, "📍"
+        )]
+    return []
 
-    # ── 4. Location ──────────────────────────────────────────────────────────
-    if sp_member.location and target.location:
-        sp_city = sp_member.location.split(",")[0].strip().lower()
-        t_city  = target.location.split(",")[0].strip().lower()
-        if sp_city == t_city:
-            signals.append(Signal(
-                "location",
-                f"Same location — {sp_member.location}",
-                f"Both {sp_member.full_name} and {target.full_name} are based in {sp_member.location}.",
-                5, "📍"
-            ))
 
-    # ── 5. Prior interactions ────────────────────────────────────────────────
-    for interaction in getattr(sp_member, "interactions_as_internal", []):
+@register_signal("interaction", needs=("interactions",), index=(_met_keys, _target_met_keys))
+def interaction_signal(sp_member, target, edges, ctx: ScoringContext) -> List[Signal]:
+    signals: List[Signal] = []
+    for interaction in _interactions(sp_member):
         if interaction.external_person_id == target.id:
-            months_ago = (date.today() - interaction.occurred_at.date()).days / 30
-            pts = int(min(25, 25 * math.exp(-0.3 * months_ago)))
+            if ctx.backtest and interaction.occurred_at.date() > ctx.as_of:
+                continue
+            count = getattr(interaction, "count", 1)
+            pts = ctx.interaction_points(interaction.occurred_at) * count
+            kind = interaction.interaction_type if count == 1 else f"{interaction.interaction_type} ×{count}"
             signals.append(Signal(
                 "interaction",
-                f"Prior {interaction.interaction_type} ({interaction.occurred_at.strftime('%b %Y')})",
-                f"{sp_member.full_name} had a {interaction.interaction_type} with {target.full_name} "
+                f"Prior {kind} ({interaction.occurred_at.strftime('%b %Y')})",
+                f"{sp_member.full_name} had {'a' if count == 1 else count} {interaction.interaction_type}"
+                f"{'' if count == 1 else 's'} with {target.full_name} "
                 f"in {interaction.occurred_at.strftime('%B %Y')}.",
                 pts, "🤝"
             ))
+    return signals
+
+
+def compute_connectivity(sp_member, target, edges=None, ctx: ScoringContext = None) -> ConnectivityResult:
+    """
+    Score one SP member against one target with the signals selected in `ctx`.
+
+    `edges` is the pair's precomputed {org_id: CoworkerEdge} (see edges.py);
+    when given, company overlap reads it instead of comparing roles pairwise
+    (except in backtests).
+    `ctx` should be created once per request/batch; defaults to today with
+    every registered signal at weight 1.
+    """
+    ctx = ctx or default_context()
+    signals: List[Signal] = []
+    for spec, weight in ctx.signals:
+        found = spec.fn(sp_member, target, edges, ctx)
+        if weight != 1.0:
+            for signal in found:
+                signal.points = int(signal.points * weight)
+        signals.extend(found)
 
     raw_score = sum(s.points for s in signals)
-    score = min(100, raw_score)
+    score = max(0, min(100, raw_score))
     strength = "strong" if score >= 40 else "medium" if score >= 20 else "weak"
 
     return ConnectivityResult(sp_member=sp_member, signals=signals, score=score, strength=strength)
+
+
+class MemberIndex:
+    """
+    Inverted index over SP members for scoring many targets against the same
+    members. candidates(target) returns, in the original member order, only
+    the members that share an index key with the target for some selected
+    signal — every other member would produce no signals and be dropped by
+    keep_result(). Falls back to all members if a selected signal has no index.
+    """
+
+    def __init__(self, members: list, ctx: ScoringContext = None):
+        self.ctx = ctx = ctx or default_context()
+        self.members = list(members)
+        self.indexes = [spec.index for spec, _ in ctx.signals]
+        self.exhaustive = any(index is None for index in self.indexes)
+        self._postings = {}
+        if not self.exhaustive:
+            for position, member in enumerate(self.members):
+                for member_keys, _ in self.indexes:
+                    for key in member_keys(member, ctx):
+                        self._postings.setdefault(key, set()).add(position)
+
+    def candidates(self, target) -> list:
+        if self.exhaustive:
+            return self.members
+        positions = set()
+        for _, target_keys in self.indexes:
+            for key in target_keys(target, self.ctx):
+                positions |= self._postings.get(key, set())
+        return [self.members[p] for p in sorted(positions)]
+
+
+# ── Result selection ─────────────────────────────────────────────────────────
+
+STRENGTHS = ("strong", "medium", "weak")
+
+
+def keep_result(result, min_score: int = 0, strengths=None) -> bool:
+    """Filter applied inside the scoring loop, before results are collected."""
+    if not result.signals or result.score < min_score:
+        return False
+    return not strengths or result.strength in strengths
+
+
+class TopK:
+    """
+    Bounded min-heap keeping the k highest-scoring items (all of them when k is
+    None, none when k <= 0). Ties keep arrival order, matching a stable sort by
+    score descending.
+    """
+
+    def __init__(self, k: int = None):
+        self.k = k
+        self.seen = 0
+        self._heap = []
+
+    def push(self, score: int, item) -> None:
+        entry = (score, -self.seen, item)
+        self.seen += 1
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> list:
+        return [e[2] for e in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+@dataclass
+class ResultGroup:
+    person: object
+    best_score: int
+    count: int
+    results: list
+
+
+def group_results(pairs, by: str, k: int = None, per_group: int = 5):
+    """
+    Aggregate (sp_member, target, ConnectivityResult) triples by "target" or
+    "sp_member". Groups are ranked by best score; each keeps its top `per_group`.
+    Returns (top k groups, total number of groups).
+    """
+    groups = {}
+    for member, target, result in pairs:
+        person = target if by == "target" else member
+        group = groups.get(person.id)
+        if group is None:
+            group = groups[person.id] = ResultGroup(person, result.score, 0, TopK(per_group))
+        group.best_score = max(group.best_score, result.score)
+        group.count += 1
+        group.results.push(result.score, (member, target, result))
+
+    ranked = TopK(k)
+    for group in groups.values():
+        ranked.push(group.best_score, group)
+    top = ranked.items()
+    for group in top:
+        group.results = group.results.items()
+    return top, ranked.seen
@@ -0,0 +1,489 @@
+"""
+Search providers for the finder.
+
+server.py only ever calls `PROVIDER.search(query, max_results)` and gets back
+DuckDuckGo-shaped result dicts ({"title", "body", "href"}). Which engine sits
+behind that is chosen by SP_SEARCH_PROVIDER:
+
+    ddg        DuckDuckGo (default)
+    fixture    replay recorded result sets from SP_SEARCH_FIXTURES, with
+               optional latency and error injection — for load tests and
+               benchmarks without the network
+    local      our own `persons` table, rendered as LinkedIn-style snippets
+
+A comma-separated list ("ddg,local") is a fallback chain: when a provider
+fails (e.g. DuckDuckGo rate-limits us) the next one answers.
+
+Every provider is wrapped in ResilientProvider: a per-provider circuit
+breaker, jittered exponential backoff on rate limits, a per-query timeout and
+optional hedged duplicate requests. Its counters are in report().
+
+Capture fixtures from live searches with SP_SEARCH_RECORD=1.
+
+Environment:
+    SP_SEARCH_PROVIDER     provider or fallback chain (default: ddg)
+    SP_SEARCH_FIXTURES     fixture directory (default: backend/fixtures/search)
+    SP_SEARCH_LATENCY_MS   fixture provider: added latency per search
+    SP_SEARCH_JITTER_MS    fixture provider: extra uniform random latency
+    SP_SEARCH_ERROR_RATE   fixture provider: fraction of searches that fail
+    SP_SEARCH_RECORD       1 = save every successful result set as a fixture
+    SP_SEARCH_TIMEOUT_S    per-query timeout (default: 15)
+    SP_SEARCH_RETRIES      retries after a rate limit (default: 2)
+    SP_SEARCH_BACKOFF_MS   base backoff; attempt n waits up to base * 2^n (default: 500)
+    SP_SEARCH_HEDGE_MS     send a duplicate request if the first hasn't answered
+                           after this long; 0 = off (default)
+    SP_BREAKER_FAILURES    consecutive failures that open a provider's breaker (default: 5)
+    SP_BREAKER_RESET_S     seconds before an open breaker lets a probe through (default: 30)
+"""
+import abc
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+log = logging.getLogger("sp-finder.search")
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "search"
+
+
+class SearchError(Exception):
+    """A provider couldn't answer; the fallback chain moves on."""
+
+
+class RateLimited(SearchError):
+    pass
+
+
+class SearchTimeout(SearchError):
+    pass
+
+
+class CircuitOpen(SearchError):
+    pass
+
+
+class SearchProvider(abc.ABC):
+    name = "base"
+
+    def __init__(self):
+        self.stats = {"calls": 0, "errors": 0, "results": 0}
+        self._stats_lock = threading.Lock()
+
+    def search(self, query: str, max_results: int = 15) -> list[dict]:
+        try:
+            results = self._search(query, max_results)
+        except SearchError:
+            self._count(errors=1)
+            raise
+        except Exception as e:
+            self._count(errors=1)
+            raise SearchError(f"{self.name}: {e}") from e
+        self._count(results=len(results))
+        return results
+
+    @abc.abstractmethod
+    def _search(self, query: str, max_results: int) -> list[dict]:
+        """Raw results for one query; search() wraps errors and counts calls."""
+
+    def _count(self, errors: int = 0, results: int = 0) -> None:
+        with self._stats_lock:
+            self.stats["calls"] += 1
+            self.stats["errors"] += errors
+            self.stats["results"] += results
+
+    def report(self) -> dict:
+        return {self.name: dict(self.stats)}
+
+
+# ─── DUCKDUCKGO ────────────────────────────────────────────────────────────
+
+class DDGProvider(SearchProvider):
+    name = "ddg"
+
+    def _search(self, query, max_results):
+        from duckduckgo_search import DDGS
+        from duckduckgo_search.exceptions import RatelimitException
+
+        try:
+            with DDGS() as ddgs:
+                return list(ddgs.text(query, max_results=max_results))
+        except RatelimitException as e:
+            raise RateLimited(f"ddg: {e}") from e
+
+
+# ─── RECORDED FIXTURES ─────────────────────────────────────────────────────
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def fixture_path(directory: Path, query: str) -> Path:
+    digest = hashlib.sha1(_normalize_query(query).encode()).hexdigest()[:16]
+    return Path(directory) / f"{digest}.json"
+
+
+def save_fixture(directory: Path, query: str, results: list[dict]) -> None:
+    path = fixture_path(directory, query)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"query": query, "results": results}, indent=1))
+
+
+class FixtureProvider(SearchProvider):
+    """
+    Replays result sets saved by save_fixture() — one JSON file per query,
+    keyed by a hash of the normalized query. Unknown queries return [].
+    """
+    name = "fixture"
+
+    def __init__(self, directory: Path = DEFAULT_FIXTURES, latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0, seed: int = None):
+        super().__init__()
+        self.directory = Path(directory)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._cache = {}
+
+    def _load(self, query: str) -> list[dict]:
+        path = fixture_path(self.directory, query)
+        if path not in self._cache:
+            self._cache[path] = json.loads(path.read_text())["results"] if path.exists() else []
+        return self._cache[path]
+
+    def _search(self, query, max_results):
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay / 1000)
+        if fail:
+            raise RateLimited("fixture: injected error")
+        return self._load(query)[:max_results]
+
+
+class RecordingProvider(SearchProvider):
+    """Wraps another provider and saves every successful result set."""
+
+    def __init__(self, inner: SearchProvider, directory: Path = DEFAULT_FIXTURES):
+        super().__init__()
+        self.inner = inner
+        self.directory = Path(directory)
+        self.name = inner.name
+
+    def _search(self, query, max_results):
+        results = self.inner.search(query, max_results)
+        if results:
+            save_fixture(self.directory, query, results)
+        return results
+
+    def report(self):
+        return self.inner.report()
+
+
+# ─── LOCAL INDEX ───────────────────────────────────────────────────────────
+
+_QUOTED = re.compile(r'"([^"]+)"')
+_TOKENS = re.compile(r'"([^"]+)"|(\S+)')
+_NOT_KEYWORDS = {"or", "and"}
+
+
+def parse_query(query: str) -> tuple[str, list[str]]:
+    """
+    Split a finder query into its subject (the first quoted phrase — a
+    company or a person) and title keywords (everything else except
+    site: filters and OR).
+    """
+    m = _QUOTED.search(query)
+    if not m:
+        return "", []
+    rest = query[:m.start()] + query[m.end():]
+    keywords = []
+    for phrase, word in _TOKENS.findall(rest):
+        token = (phrase or word).lower()
+        if token in _NOT_KEYWORDS or token.startswith("site:"):
+            continue
+        keywords.append(token)
+    return m.group(1), keywords
+
+
+class LocalIndexProvider(SearchProvider):
+    """
+    Answers finder queries from the `persons` table: people whose name
+    matches the subject, or who have worked at an org matching it, filtered
+    by title keywords. Results look like LinkedIn search snippets so the
+    normal snippet parsing applies.
+    """
+    name = "local"
+
+    def _search(self, query, max_results):
+        from sqlalchemy import or_
+        from sqlalchemy.orm import selectinload
+
+        from database import SessionLocal
+        import models
+
+        subject, keywords = parse_query(query)
+        if not subject:
+            return []
+        like = f"%{subject}%"
+        db = SessionLocal()
+        try:
+            people = (
+                db.query(models.Person)
+                .options(
+                    selectinload(models.Person.roles).selectinload(models.Role.org),
+                    selectinload(models.Person.education),
+                )
+                .filter(models.Person.is_internal == False)  # noqa: E712
+                .filter(or_(
+                    models.Person.full_name.ilike(like),
+                    models.Person.current_company.ilike(like),
+                    models.Person.roles.any(models.Role.org.has(models.Organization.name.ilike(like))),
+                ))
+                .order_by(models.Person.id)
+                .all()
+            )
+            results = []
+            for person in people:
+                title = person.current_title or next((r.title for r in person.roles if r.is_current and r.title), "")
+                if keywords and not any(k in title.lower() for k in keywords):
+                    continue
+                results.append(self._snippet(person, title))
+                if len(results) >= max_results:
+                    break
+            return results
+        finally:
+            db.close()
+
+    @staticmethod
+    def _snippet(person, title: str) -> dict:
+        company = person.current_company or next((r.org.name for r in person.roles if r.is_current and r.org), "")
+        headline = f"{title} at {company}" if title and company else title or company
+        orgs = list(dict.fromkeys(r.org.name for r in person.roles if r.org))
+        schools = [e.institution for e in person.education]
+        body = [headline + "."]
+        if orgs:
+            body.append(f"Experience: {', '.join(orgs)} |")
+        if schools:
+            body.append(f"Education: {', '.join(schools)}.")
+        if person.location:
+            body.append(f"Location: {person.location}.")
+        return {
+            "title": f"{person.full_name} - {headline} | LinkedIn",
+            "body": " ".join(body),
+            "href": person.linkedin_url or f"https://www.linkedin.com/in/local-{person.id}",
+        }
+
+
+# ─── RESILIENCE ────────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    closed → open after `failures` consecutive failures; open → half_open
+    after `reset_after` seconds, letting a single probe through; the probe's
+    outcome closes or re-opens it.
+    """
+
+    def __init__(self, failures: int = 5, reset_after: float = 30.0):
+        self.failures = failures
+        self.reset_after = reset_after
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.state, self.consecutive = "closed", 0
+                return
+            self.consecutive += 1
+            if self.state == "half_open" or self.consecutive >= self.failures:
+                if self.state != "open":
+                    self.opens += 1
+                self.state, self.opened_at = "open", time.monotonic()
+
+
+class ResilientProvider(SearchProvider):
+    """
+    Wraps a provider with a circuit breaker, retries with full-jitter
+    exponential backoff on RateLimited, a per-query timeout and optional
+    hedging: if the first request hasn't answered after `hedge_ms`, a
+    duplicate is sent and whichever finishes first wins. Timed-out calls are
+    abandoned, not cancelled — their thread finishes in the background.
+    """
+    COUNTERS = ("retries", "rate_limited", "timeouts", "hedges", "hedge_wins", "short_circuited")
+
+    def __init__(self, inner: SearchProvider, timeout_s: float = 15.0, retries: int = 2,
+                 backoff_ms: float = 500, hedge_ms: float = 0, breaker: CircuitBreaker = None,
+                 workers: int = 16):
+        super().__init__()
+        self.inner = inner
+        self.name = inner.name
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.backoff_ms = backoff_ms
+        self.hedge_ms = hedge_ms
+        self.breaker = breaker or CircuitBreaker()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"search-{self.name}")
+        self._rng = random.Random()
+
+    def _inc(self, counter: str) -> None:
+        with self._stats_lock:
+            self.counters[counter] += 1
+
+    def _search(self, query, max_results):
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._inc("short_circuited")
+                raise CircuitOpen(f"{self.name}: circuit open")
+            try:
+                results = self._attempt(query, max_results)
+            except SearchError as e:
+                self.breaker.record(False)
+                if isinstance(e, SearchTimeout):
+                    self._inc("timeouts")
+                if not isinstance(e, RateLimited):
+                    raise
+                self._inc("rate_limited")
+                if attempt >= self.retries:
+                    raise
+                attempt += 1
+                self._inc("retries")
+                time.sleep(self._rng.uniform(0, self.backoff_ms * 2 ** attempt) / 1000)
+                continue
+            self.breaker.record(True)
+            return results
+
+    def _attempt(self, query, max_results):
+        deadline = time.monotonic() + self.timeout_s
+        first = self._executor.submit(self.inner.search, query, max_results)
+        pending = {first}
+        if self.hedge_ms and self.hedge_ms / 1000 < self.timeout_s:
+            done, _ = wait(pending, timeout=self.hedge_ms / 1000)
+            if not done:
+                self._inc("hedges")
+                pending.add(self._executor.submit(self.inner.search, query, max_results))
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results = future.result()
+                except SearchError as e:
+                    error = error or e
+                    continue
+                if future is not first:
+                    self._inc("hedge_wins")
+                return results
+        if error is not None and not pending:
+            raise error
+        raise SearchTimeout(f"{self.name}: no answer within {self.timeout_s}s")
+
+    def report(self):
+        out = self.inner.report()
+        with self._stats_lock:
+            out[self.name] = {**out.get(self.name, {}), **self.counters,
+                              "breaker": self.breaker.state, "breaker_opens": self.breaker.opens}
+        return out
+
+
+# ─── FALLBACK CHAIN ────────────────────────────────────────────────────────
+
+class FallbackProvider(SearchProvider):
+    """Tries each provider in order until one answers."""
+
+    def __init__(self, providers: list):
+        super().__init__()
+        self.providers = providers
+        self.name = ",".join(p.name for p in providers)
+        self.fallbacks = 0
+
+    def _search(self, query, max_results):
+        error = None
+        for i, provider in enumerate(self.providers):
+            try:
+                results = provider.search(query, max_results)
+            except SearchError as e:
+                log.warning(f"{provider.name} search failed for '{query[:60]}': {e}")
+                error = e
+                continue
+            if i:
+                self.fallbacks += 1
+            return results
+        raise error
+
+    def report(self):
+        out = {}
+        for p in self.providers:
+            out.update(p.report())
+        out["fallbacks"] = self.fallbacks
+        return out
+
+
+# ─── CONFIG ────────────────────────────────────────────────────────────────
+
+def _provider(name: str, fixtures: Path) -> SearchProvider:
+    if name == "ddg":
+        return DDGProvider()
+    if name == "fixture":
+        return FixtureProvider(
+            fixtures,
+            latency_ms=float(os.getenv("SP_SEARCH_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("SP_SEARCH_JITTER_MS", "0")),
+            error_rate=float(os.getenv("SP_SEARCH_ERROR_RATE", "0")),
+        )
+    if name == "local":
+        return LocalIndexProvider()
+    raise ValueError(f"Unknown search provider '{name}'. Use ddg, fixture or local.")
+
+
+def from_env() -> SearchProvider:
+    names = [n.strip() for n in os.getenv("SP_SEARCH_PROVIDER", "ddg").split(",") if n.strip()]
+    fixtures = Path(os.getenv("SP_SEARCH_FIXTURES", str(DEFAULT_FIXTURES)))
+    providers = [_provider(n, fixtures) for n in names or ["ddg"]]
+    if os.getenv("SP_SEARCH_RECORD") == "1":
+        providers = [RecordingProvider(p, fixtures) if p.name != "fixture" else p for p in providers]
+    providers = [
+        ResilientProvider(
+            p,
+            timeout_s=float(os.getenv("SP_SEARCH_TIMEOUT_S", "15")),
+            retries=int(os.getenv("SP_SEARCH_RETRIES", "2")),
+            backoff_ms=float(os.getenv("SP_SEARCH_BACKOFF_MS", "500")),
+            hedge_ms=float(os.getenv("SP_SEARCH_HEDGE_MS", "0")),
+            breaker=CircuitBreaker(
+                failures=int(os.getenv("SP_BREAKER_FAILURES", "5")),
+                reset_after=float(os.getenv("SP_BREAKER_RESET_S", "30")),
+            ),
+        )
+        for p in providers
+    ]
+    return providers[0] if len(providers) == 1 else FallbackProvider(providers)
@@ -1,344 +1,211 @@
 """
-Seed the database with the real Smith Point Capital team.
-Education corrected from LinkedIn search results.
-LinkedIn URLs verified Feb 2026.
+Seed the database with the real Smith Point Capital team (data in team.py).
+
+Larger reference rosters (JSON/YAML, same shape as SP_TEAM) load with:
+    python seed.py roster.json
 """
+import json
+import time
+
 from models import Person, Organization, Role, Education
+from edges import refresh_org_edges
+from team import SP_TEAM, SAMPLE_EXTERNALS
+import geo
+import resolve
 
 
-SP_TEAM = [
-    {
-        "full_name": "Keith Block",
-        "first_name": "Keith",
-        "last_name": "Block",
-        "linkedin_url": "https://www.linkedin.com/in/keith-block-516a1811/",
-        "current_title": "Founder & CEO",
-        "current_company": "Smith Point Capital",
-        "location": "San Francisco, CA",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Oracle",              "slug": "oracle",         "start": 1986, "end": 2013, "board": False},
-            {"name": "Salesforce",          "slug": "salesforce",     "start": 2013, "end": 2020, "board": True},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None, "board": False},
-        ],
-        "education": [
-            {"institution": "Carnegie Mellon University", "degree": "MS/BS", "start": 1980, "end": 1984},
-        ],
-    },
-    {
-        "full_name": "Burke Norton",
-        "first_name": "Burke",
-        "last_name": "Norton",
-        "linkedin_url": "https://www.linkedin.com/in/burke-norton-121a1a2/",
-        "current_title": "Co-founder & Managing Director",
-        "current_company": "Smith Point Capital",
-        "location": "San Francisco, CA",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Wilson Sonsini",      "slug": "wilson-sonsini",     "start": 1993, "end": 2006, "board": False},
-            {"name": "Expedia",             "slug": "expedia",            "start": 2006, "end": 2010, "board": False},
-            {"name": "Salesforce",          "slug": "salesforce",         "start": 2010, "end": 2020, "board": False},
-            {"name": "Vista Equity Partners","slug": "vista-equity-partners","start": 2020, "end": 2022, "board": False},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital","start": 2022, "end": None,  "board": False},
-        ],
-        "education": [
-            # LinkedIn shows UC Berkeley School of Law
-            {"institution": "UC Berkeley School of Law", "degree": "JD", "start": 1989, "end": 1993},
-        ],
-    },
-    {
-        "full_name": "Christopher Lytle",
-        "first_name": "Christopher",
-        "last_name": "Lytle",
-        "linkedin_url": "https://www.linkedin.com/in/chris-lytle-a8141a15/",
-        "current_title": "Co-founder & Managing Director",
-        "current_company": "Smith Point Capital",
-        "location": "Old Greenwich, CT",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Longfellow Capital",  "slug": "longfellow-capital",  "start": 1995, "end": 2022, "board": False},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None,  "board": False},
-        ],
-        "education": [
-            # LinkedIn shows Lafayette College (corrected from Dartmouth)
-            {"institution": "Lafayette College", "degree": "BA", "start": 1987, "end": 1991},
-        ],
-    },
-    {
-        "full_name": "John Cummings",
-        "first_name": "John",
-        "last_name": "Cummings",
-        "linkedin_url": "https://www.linkedin.com/in/johncummings/",
-        "current_title": "Managing Director, CFO/COO",
-        "current_company": "Smith Point Capital",
-        "location": "San Francisco, CA",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Salesforce",          "slug": "salesforce",          "start": 2011, "end": 2020, "board": False},
-            {"name": "Celonis",             "slug": "celonis",             "start": 2020, "end": 2024, "board": False},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2023, "end": None, "board": False},
-        ],
-        "education": [
-            {"institution": "Columbia Business School", "degree": "MBA", "start": 1992, "end": 1994},
-            {"institution": "UC Berkeley Haas School of Business", "degree": "MBA", "start": 1992, "end": 1994},
-        ],
-    },
-    {
-        "full_name": "Tyler Prince",
-        "first_name": "Tyler",
-        "last_name": "Prince",
-        "linkedin_url": "https://www.linkedin.com/in/tyler-prince-210701/",
-        "current_title": "Managing Director, Head of Value Creation",
-        "current_company": "Smith Point Capital",
-        "location": "Chicago, IL",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Andersen Consulting","slug": "andersen-consulting","start": None, "end": None,  "board": False},
-            {"name": "IBM",                "slug": "ibm",               "start": None, "end": None,  "board": False},
-            {"name": "PeopleSoft",         "slug": "peoplesoft",        "start": None, "end": None,  "board": False},
-            {"name": "Oracle",             "slug": "oracle",            "start": None, "end": None,  "board": False},
-            {"name": "PwC",                "slug": "pwc",               "start": None, "end": None,  "board": False},
-            {"name": "Salesforce",         "slug": "salesforce",        "start": 2004, "end": 2019, "board": False},
-            {"name": "Snowflake",          "slug": "snowflake",         "start": 2023, "end": 2025, "board": False},
-            {"name": "Smith Point Capital","slug": "smith-point-capital","start": 2025, "end": None,  "board": False},
-        ],
-        "education": [
-            # LinkedIn shows University of Illinois at Urbana-Champaign (corrected from Duke)
-            {"institution": "University of Illinois Urbana-Champaign", "degree": "BA", "start": 1993, "end": 1997},
-        ],
-    },
-    {
-        "full_name": "Brooke Kiley Slattery",
-        "first_name": "Brooke",
-        "last_name": "Kiley Slattery",
-        "linkedin_url": "https://www.linkedin.com/in/brooke-kiley-slattery-7372949a/",
-        "current_title": "Principal Investor",
-        "current_company": "Smith Point Capital",
-        "location": "New York, NY",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Goldman Sachs",       "slug": "goldman-sachs",       "start": 2012, "end": 2016, "board": False},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None,  "board": False},
-        ],
-        "education": [
-            # LinkedIn shows Wharton / UPenn (corrected from Harvard)
-            {"institution": "University of Pennsylvania - The Wharton School", "degree": "BS", "start": 2008, "end": 2012},
-        ],
-    },
-    {
-        "full_name": "Lorenzo Salazar",
-        "first_name": "Lorenzo",
-        "last_name": "Salazar",
-        "linkedin_url": "https://www.linkedin.com/in/lorenzosalazar16/",
-        "current_title": "Principal Investor",
-        "current_company": "Smith Point Capital",
-        "location": "Austin, TX",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None, "board": False},
-        ],
-        "education": [
-            # LinkedIn shows UT Austin McCombs
-            {"institution": "University of Texas at Austin", "degree": "MBA", "start": 2014, "end": 2016},
-        ],
-    },
-    {
-        "full_name": "Sewon Park",
-        "first_name": "Sewon",
-        "last_name": "Park",
-        "linkedin_url": "https://www.linkedin.com/in/sewon-park-a939b9156/",
-        "current_title": "Associate",
-        "current_company": "Smith Point Capital",
-        "location": "New York, NY",
-        "is_internal": True,
-        # NOTE: Sewon Park does NOT have Goldman Sachs on LinkedIn — corrected per user
-        "orgs": [
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None,  "board": False},
-        ],
-        "education": [],
-    },
-    {
-        "full_name": "Katie Rodday",
-        "first_name": "Katie",
-        "last_name": "Rodday",
-        "linkedin_url": "https://www.linkedin.com/in/katie-rodday-082071a/",
-        "current_title": "Director of Operations",
-        "current_company": "Smith Point Capital",
-        "location": "Boston, MA",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2022, "end": None, "board": False},
-        ],
-        "education": [
-            # LinkedIn shows Stonehill College
-            {"institution": "Stonehill College", "degree": "BA", "start": 2004, "end": 2008},
-        ],
-    },
-    {
-        "full_name": "Lilly Cordover",
-        "first_name": "Lilly",
-        "last_name": "Cordover",
-        "linkedin_url": "https://www.linkedin.com/in/lillycordover/",
-        "current_title": "Analyst",
-        "current_company": "Smith Point Capital",
-        "location": "New York, NY",
-        "is_internal": True,
-        "orgs": [
-            {"name": "Fifth Wall",          "slug": "fifth-wall",          "start": 2023, "end": 2024, "board": False},
-            {"name": "Smith Point Capital", "slug": "smith-point-capital", "start": 2024, "end": None,  "board": False},
-        ],
-        "education": [
-            # LinkedIn shows McIntire School of Commerce (UVA)
-            {"institution": "University of Virginia - McIntire School of Commerce", "degree": "BS", "start": 2019, "end": 2023},
-        ],
-    },
-]
-
-# Sample external people for demo lookups
-SAMPLE_EXTERNALS = [
-    {
-        "full_name": "Marc Benioff",
-        "linkedin_url": "https://www.linkedin.com/in/marcbenioff/",
-        "current_title": "CEO & Chairman",
-        "current_company": "Salesforce",
-        "location": "San Francisco, CA",
-        "is_internal": False,
-        "orgs": [
-            {"name": "Oracle",     "slug": "oracle",     "start": 1986, "end": 1999, "board": False},
-            {"name": "Salesforce", "slug": "salesforce", "start": 1999, "end": None,  "board": True},
-        ],
-        "education": [
-            {"institution": "University of Southern California", "degree": "BS", "start": 1982, "end": 1986},
-        ],
-    },
-    {
-        "full_name": "Bret Taylor",
-        "linkedin_url": "https://www.linkedin.com/in/bret-taylor/",
-        "current_title": "Chairman & Former Co-CEO",
-        "current_company": "Salesforce",
-        "location": "San Francisco, CA",
-        "is_internal": False,
-        "orgs": [
-            {"name": "Google",     "slug": "google",     "start": 2003, "end": 2007, "board": False},
-            {"name": "Facebook",   "slug": "facebook",   "start": 2009, "end": 2012, "board": False},
-            {"name": "Salesforce", "slug": "salesforce", "start": 2016, "end": 2023, "board": True},
-        ],
-        "education": [
-            {"institution": "Stanford University", "degree": "BS/MS", "start": 1999, "end": 2003},
-        ],
-    },
-    {
-        "full_name": "Patrick Collison",
-        "linkedin_url": "https://www.linkedin.com/in/patrickcollison/",
-        "current_title": "CEO & Co-founder",
-        "current_company": "Stripe",
-        "location": "San Francisco, CA",
-        "is_internal": False,
-        "orgs": [
-            {"name": "Stripe", "slug": "stripe", "start": 2010, "end": None, "board": True},
-        ],
-        "education": [
-            {"institution": "MIT", "degree": "Started", "start": 2007, "end": 2009},
-        ],
-    },
-    {
-        "full_name": "Sam Altman",
-        "linkedin_url": "https://www.linkedin.com/in/sam-altman-1b5a7b/",
-        "current_title": "CEO",
-        "current_company": "OpenAI",
-        "location": "San Francisco, CA",
-        "is_internal": False,
-        "orgs": [
-            {"name": "Y Combinator", "slug": "y-combinator", "start": 2014, "end": 2019, "board": False},
-            {"name": "OpenAI",       "slug": "openai",        "start": 2019, "end": None,  "board": True},
-        ],
-        "education": [
-            {"institution": "Stanford University", "degree": "Started CS", "start": 2003, "end": 2005},
-        ],
-    },
-    {
-        "full_name": "Dhivya Suryadevara",
-        "linkedin_url": "https://www.linkedin.com/in/dhivya-suryadevara/",
-        "current_title": "CFO",
-        "current_company": "Stripe",
-        "location": "San Francisco, CA",
-        "is_internal": False,
-        "orgs": [
-            {"name": "Goldman Sachs", "slug": "goldman-sachs", "start": 2001, "end": 2018, "board": False},
-            {"name": "Stripe",        "slug": "stripe",         "start": 2021, "end": None,  "board": False},
-        ],
-        "education": [
-            {"institution": "University of Michigan", "degree": "MBA", "start": 2001, "end": 2003},
-        ],
-    },
-]
+# ── Loader ───────────────────────────────────────────────────────────────────
+#
+# Resolves orgs and people with one IN (...) query per chunk, inserts the rest
+# with bulk INSERT ... ON CONFLICT DO NOTHING, and only adds roles/education
+# for people that didn't exist yet — so re-running any roster is a no-op.
 
+CHUNK = 500
 
-def seed_db(db):
-    print("Seeding database...")
 
-    # Upsert orgs
-    org_cache = {}
-
-    def get_or_create_org(name, slug):
-        if name in org_cache:
-            return org_cache[name]
-        org = db.query(Organization).filter(Organization.name == name).first()
-        if not org:
-            org = Organization(name=name, linkedin_slug=slug)
-            db.add(org)
-            db.flush()
-        org_cache[name] = org
-        return org
-
-    def seed_person(pdata):
-        existing = db.query(Person).filter(Person.linkedin_url == pdata["linkedin_url"]).first()
-        if existing:
-            return existing
-
-        person = Person(
-            full_name=pdata["full_name"],
-            first_name=pdata.get("first_name"),
-            last_name=pdata.get("last_name"),
-            linkedin_url=pdata.get("linkedin_url"),
-            current_title=pdata.get("current_title"),
-            current_company=pdata.get("current_company"),
-            location=pdata.get("location"),
-            is_internal=pdata.get("is_internal", False),
-        )
-        db.add(person)
-        db.flush()
-
-        for org_data in pdata.get("orgs", []):
-            org = get_or_create_org(org_data["name"], org_data.get("slug"))
-            role = Role(
-                person_id=person.id,
-                org_id=org.id,
-                title=pdata.get("current_title") if org_data["end"] is None else None,
-                start_year=org_data["start"],
-                end_year=org_data["end"],
-                is_board=org_data.get("board", False),
-                is_current=org_data["end"] is None,
-            )
-            db.add(role)
-
-        for edu_data in pdata.get("education", []):
-            edu = Education(
-                person_id=person.id,
-                institution=edu_data["institution"],
-                degree=edu_data.get("degree"),
-                start_year=edu_data.get("start"),
-                end_year=edu_data.get("end"),
+def _chunks(items, size=CHUNK):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _insert_ignore(db, model, rows) -> None:
+    """Bulk insert, skipping rows that hit a unique constraint."""
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        db.execute(model.__table__.insert(), rows)
+        return
+    for chunk in _chunks(rows):
+        db.execute(insert(model.__table__).on_conflict_do_nothing(), chunk)
+
+
+def _resolve_orgs(db, wanted: dict) -> dict:
+    """wanted: {name: slug}. Returns {name: org_id}, creating missing orgs."""
+    def lookup():
+        found = {}
+        for names in _chunks(wanted):
+            slugs = [wanted[n] for n in names if wanted[n]]
+            rows = db.query(Organization.id, Organization.name, Organization.linkedin_slug).filter(
+                Organization.name.in_(names) | Organization.linkedin_slug.in_(slugs)
             )
-            db.add(edu)
+            by_slug = {}
+            for org_id, name, slug in rows:
+                found.setdefault(name, org_id)
+                if slug:
+                    by_slug[slug] = org_id
+            for name in names:
+                if name not in found and wanted[name] in by_slug:
+                    found[name] = by_slug[wanted[name]]
+        return found
+
+    found = lookup()
+    missing = [{"name": n, "linkedin_slug": wanted[n]} for n in wanted if n not in found]
+    if missing:
+        _insert_ignore(db, Organization, missing)
+        found = lookup()
+    return found
+
+
+def _person_key(pdata):
+    return pdata.get("linkedin_url") or ("name", pdata["full_name"])
+
+
+def _existing_person_keys(db, people) -> set:
+    urls = [p["linkedin_url"] for p in people if p.get("linkedin_url")]
+    names = [p["full_name"] for p in people if not p.get("linkedin_url")]
+    keys = set()
+    for chunk in _chunks(urls):
+        keys.update(url for (url,) in db.query(Person.linkedin_url).filter(Person.linkedin_url.in_(chunk)))
+    for chunk in _chunks(names):
+        keys.update(("name", name) for (name,) in db.query(Person.full_name).filter(
+            Person.full_name.in_(chunk), Person.linkedin_url == None
+        ))
+    return keys
+
+
+def _person_ids(db, people) -> dict:
+    ids = {}
+    urls = [p["linkedin_url"] for p in people if p.get("linkedin_url")]
+    names = [p["full_name"] for p in people if not p.get("linkedin_url")]
+    for chunk in _chunks(urls):
+        ids.update(db.query(Person.linkedin_url, Person.id).filter(Person.linkedin_url.in_(chunk)))
+    for chunk in _chunks(names):
+        for name, person_id in db.query(Person.full_name, Person.id).filter(
+            Person.full_name.in_(chunk), Person.linkedin_url == None
+        ):
+            ids[("name", name)] = person_id
+    return ids
 
-        return person
 
-    for pdata in SP_TEAM:
-        seed_person(pdata)
+def _person_row(p: dict) -> dict:
+    city_id, metro_id = geo.locate(p.get("location"))
+    return {
+        "full_name": p["full_name"],
+        "first_name": p.get("first_name"),
+        "last_name": p.get("last_name"),
+        "last_name_key": resolve.name_key(p["full_name"]).last or None,
+        "linkedin_url": p.get("linkedin_url"),
+        "current_title": p.get("current_title"),
+        "current_company": p.get("current_company"),
+        "location": p.get("location"),
+        "city_id": city_id,
+        "metro_id": metro_id,
+        "is_internal": p.get("is_internal", False),
+    }
 
-    for pdata in SAMPLE_EXTERNALS:
-        seed_person(pdata)
 
+def load_people(db, people: list) -> dict:
+    """
+    Load person records shaped like SP_TEAM entries. Existing people (matched
+    by linkedin_url, else by name) are left untouched. Flushes, doesn't commit.
+    """
+    # De-duplicate within the roster itself
+    people = list({_person_key(p): p for p in people}.values())
+
+    existing = _existing_person_keys(db, people)
+    new_people = [p for p in people if _person_key(p) not in existing]
+
+    org_ids = _resolve_orgs(db, {
+        o["name"]: o.get("slug") for p in new_people for o in p.get("orgs", [])
+    })
+
+    _insert_ignore(db, Person, [_person_row(p) for p in new_people])
+    person_ids = _person_ids(db, new_people)
+
+    roles, education = [], []
+    for p in new_people:
+        person_id = person_ids[_person_key(p)]
+        for org_data in p.get("orgs", []):
+            end = org_data.get("end")
+            roles.append({
+                "person_id": person_id,
+                "org_id": org_ids[org_data["name"]],
+                "title": p.get("current_title") if end is None else None,
+                "start_year": org_data.get("start"),
+                "end_year": end,
+                "is_board": org_data.get("board", False),
+                "is_current": end is None,
+            })
+        for edu_data in p.get("education", []):
+            education.append({
+                "person_id": person_id,
+                "institution": edu_data["institution"],
+                "degree": edu_data.get("degree"),
+                "start_year": edu_data.get("start"),
+                "end_year": edu_data.get("end"),
+            })
+
+    for chunk in _chunks(roles):
+        db.execute(Role.__table__.insert(), chunk)
+    for chunk in _chunks(education):
+        db.execute(Education.__table__.insert(), chunk)
+
+    refresh_org_edges(db, {r["org_id"] for r in roles})
+    db.flush()
+    return {"people": len(new_people), "skipped": len(people) - len(new_people),
+            "roles": len(roles), "education": len(education)}
+
+
+def load_roster_file(path: str) -> list:
+    """Read a roster (list of person records, or {"people": [...]}) from JSON or YAML."""
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("Install pyyaml to load YAML rosters (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return data["people"] if isinstance(data, dict) else data
+
+
+def seed_db(db):
+    print("Seeding database...")
+    load_people(db, SP_TEAM + SAMPLE_EXTERNALS)
     db.commit()
     print(f"✅ Seeded {len(SP_TEAM)} SP team members + {len(SAMPLE_EXTERNALS)} sample externals")
+
+
+if __name__ == "__main__":
+    # python seed.py roster.json [more.yaml ...]
+    import sys
+    from database import SessionLocal
+
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python seed.py ROSTER.json|yaml [...]")
+    db = SessionLocal()
+    try:
+        for path in sys.argv[1:]:
+            started = time.perf_counter()
+            stats = load_people(db, load_roster_file(path))
+            db.commit()
+            print(f"✅ {path}: {stats} in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
@@ -4,29 +4,40 @@ Run: python server.py
 Then open http://localhost:8000 in your browser.
 
 No API keys needed. Uses DuckDuckGo to find company leadership
-from public LinkedIn data.
+from public LinkedIn data (or another provider — see search.py).
 """
 
+import os
 import re
 import json
+import time
 import asyncio
 import logging
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 
-from duckduckgo_search import DDGS
+import adhoc
+import admission
+import compression
+import resolve
+import search
+from result_cache import ResultCache
+import shared_cache
+from snippets import MIN_NAME_LEN, Snippet, parse_snippet, timing_report
+from team import SP_TEAM
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("sp-finder")
 
 app = FastAPI(title="Smith Point Connection Finder")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(compression.CompressionMiddleware)
 
 # ─── MODELS ────────────────────────────────────────────────────────────────
 
@@ -47,153 +58,209 @@ class CompanyResult(BaseModel):
     company_name: str
     people: list[Person]
     search_queries_used: int = 0
+    failed_queries: list[str] = []  # searches that errored, timed out or were short-circuited
+
+class SPRole(BaseModel):
+    org: str
+    title: str = ""
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+class SPMember(Person):
+    title: str = ""
+    roles: list[SPRole] = []  # dated stints; undated ones can go in `orgs`
+
+class ScoreRequest(BaseModel):
+    people: list[Person]
+    sp_members: Optional[list[SPMember]] = None  # default: the SP team in team.py
+    changed_ids: Optional[list[str]] = None      # incremental: only rescore these people
+    min_score: int = 0
+
+class ScoredSignal(BaseModel):
+    type: str
+    label: str
+    detail: str
+    points: int
+    icon: str
+
+class ScoredPair(BaseModel):
+    sp_id: str
+    target_id: str
+    score: int
+    strength: str
+    signals: list[ScoredSignal]
+
+class ScoreResult(BaseModel):
+    results: list[ScoredPair]
+    scored_ids: list[str]  # people whose previous results these replace
 
 # ─── HELPERS ───────────────────────────────────────────────────────────────
 
+_COMPANY_URL = re.compile(r"linkedin\.com/company/([^/?#\s]+)")
+_DASHES = re.compile(r"-+")
+
 def extract_company_slug(url: str) -> Optional[str]:
     """Pull company slug from LinkedIn URL."""
-    m = re.search(r"linkedin\.com/company/([^/?#\s]+)", url)
+    m = _COMPANY_URL.search(url)
     return m.group(1).rstrip("/") if m else None
 
 def slug_to_name(slug: str) -> str:
     """Convert 'my-company-inc' → 'My Company Inc'."""
-    return re.sub(r"-+", " ", slug).title()
+    return _DASHES.sub(" ", slug).title()
+
+
+# ─── DEEP-DIVE SCHEDULER ───────────────────────────────────────────────────
 
-def parse_linkedin_title(title_str: str) -> tuple[str, str]:
+DEEP_DIVE_MAX_QUERIES = int(os.getenv("SP_DEEP_DIVE_MAX_QUERIES", "20"))
+DEEP_DIVE_MAX_SECONDS = float(os.getenv("SP_DEEP_DIVE_MAX_SECONDS", "45"))
+# Stop after this many consecutive deep-dives that found nothing new
+DEEP_DIVE_PATIENCE = int(os.getenv("SP_DEEP_DIVE_PATIENCE", "5"))
+
+SENIORITY_TIERS = [
+    (10, re.compile(r"\b(ceo|chief executive|founder|co-founder|chair(man|woman|person)?|president)\b", re.I)),
+    (8,  re.compile(r"\b(c[tfor]o|cmo|chro|cpo|chief)\b", re.I)),
+    (6,  re.compile(r"\b(evp|svp|executive vice president|senior vice president|general counsel)\b", re.I)),
+    (5,  re.compile(r"\b(board|director(?! of)|advisor)\b", re.I)),
+    (4,  re.compile(r"\b(vp|vice president|head of)\b", re.I)),
+    (3,  re.compile(r"\bdirector\b", re.I)),
+]
+
+# Orgs and schools the SP team has in common with anyone worth a deep-dive
+SP_ORGS = {o["name"].lower() for m in SP_TEAM for o in m["orgs"]} - {"smith point capital"}
+SP_SCHOOLS = [e["institution"].lower() for m in SP_TEAM for e in m["education"]]
+
+
+def title_seniority(title: str) -> int:
+    for points, pattern in SENIORITY_TIERS:
+        if pattern.search(title or ""):
+            return points
+    return 1
+
+def deep_dive_priority(person: Person, company_name: str) -> int:
+    """Seniority plus likely overlap with SP orgs/schools; sparse profiles get a nudge."""
+    score = title_seniority(person.title)
+    score += 5 * len({o.lower() for o in person.orgs} & (SP_ORGS - {company_name.lower()}))
+    score += 4 * sum(1 for e in person.education if any(e["s"].lower() in sch for sch in SP_SCHOOLS))
+    if len(person.orgs) <= 1 and not person.education:
+        score += 2  # little to score on yet — the deep-dive is worth more
+    return score
+
+def deep_dive(people: list[Person], company_name: str,
+              max_queries: int = None, max_seconds: float = None, patience: int = None,
+              failed: list = None) -> int:
     """
-    Parse a DuckDuckGo result title like:
-    'John Smith - CEO at Acme Corp | LinkedIn'
-    → ('John Smith', 'CEO at Acme Corp')
+    Enrich people in priority order until the query or time budget runs out,
+    or `patience` consecutive searches add nothing new. Returns queries used;
+    failed searches are appended to `failed`.
     """
-    # Remove trailing '| LinkedIn' or '- LinkedIn'
-    cleaned = re.sub(r"\s*[\|\-–—]\s*LinkedIn\s*$", "", title_str, flags=re.IGNORECASE).strip()
-    # Split on first ' - ' or ' – ' or ' — '
-    parts = re.split(r"\s*[\-–—]\s*", cleaned, maxsplit=1)
-    name = parts[0].strip()
-    title = parts[1].strip() if len(parts) > 1 else ""
-    # Clean up name — remove anything in parens, extra whitespace
-    name = re.sub(r"\s*\(.*?\)\s*", " ", name).strip()
-    # Skip if name looks like a company name or is too long
-    if len(name.split()) > 5 or not name:
-        return "", ""
-    return name, title
-
-def extract_orgs_from_text(text: str, company_name: str) -> list[str]:
-    """Pull company names from a search snippet."""
-    orgs = set()
-    # Add the target company itself
-    orgs.add(company_name)
-    
-    # Known SP-relevant companies to look for
-    sp_companies = [
-        "Salesforce", "Oracle", "Snowflake", "ServiceNow", "Databricks",
-        "Vista Equity Partners", "Morgan Stanley", "Credit Suisse", "Goldman Sachs",
-        "Insight Partners", "VMG Partners", "PwC", "PricewaterhouseCoopers",
-        "IBM", "PeopleSoft", "Cisco", "Microsoft", "Twilio", "Datadog",
-        "Stripe", "McKinsey", "Booz Allen Hamilton", "Booz Allen",
-        "Heidrick & Struggles", "SAP", "Genesys", "Confluent", "Anthropic",
-        "Procter & Gamble", "P&G", "Expedia", "Wilson Sonsini", "Celonis",
-        "ExactTarget", "Diligent", "Andersen Consulting", "Accenture",
-        "Ionic Partners", "Fifth Wall", "Longfellow Capital",
-        "Osterweis", "Inseego", "Cavulus", "Umee",
-        "Google", "Amazon", "Meta", "Apple", "Netflix",
-        "Uber", "Airbnb", "Tesla", "SpaceX", "Palantir",
-        "Workday", "Splunk", "VMware", "Dell", "HP", "Intel",
-        "Qualcomm", "Adobe", "Zoom", "Slack", "HubSpot",
-        "JP Morgan", "JPMorgan", "Bank of America", "Citigroup", "Citi",
-        "Deloitte", "EY", "Ernst & Young", "KPMG", "Bain",
-        "BCG", "Boston Consulting", "Sequoia", "Andreessen Horowitz", "a16z",
-        "Kleiner Perkins", "Benchmark", "Lightspeed", "GV", "Tiger Global",
-        "SoftBank", "Thoma Bravo", "Silver Lake", "KKR", "Blackstone",
-        "General Atlantic", "Warburg Pincus", "Bessemer",
-    ]
-    
-    text_lower = text.lower()
-    for co in sp_companies:
-        if co.lower() in text_lower:
-            orgs.add(co)
-    
-    # Also try to find "at CompanyName" or "Company Name" patterns
-    # "Previously at X" or "Experience: X, Y, Z"
-    prev_patterns = [
-        r"(?:previously|formerly|former)\s+(?:at|with|@)\s+([A-Z][A-Za-z\s&.]+?)(?:\s*[,;.|]|\s+and\s)",
-        r"(?:experience|worked at|career)[:.]?\s*([A-Z][A-Za-z\s&.,]+?)(?:\s*[|])",
-    ]
-    for pat in prev_patterns:
-        for m in re.finditer(pat, text, re.IGNORECASE):
-            candidates = re.split(r"\s*[,;]\s*", m.group(1))
-            for c in candidates:
-                c = c.strip()
-                if 2 <= len(c) <= 40 and c[0].isupper():
-                    orgs.add(c)
-    
-    return list(orgs)
-
-def extract_education_from_text(text: str) -> list[dict]:
-    """Pull school names from search snippets."""
-    schools = []
-    known_schools = [
-        "Carnegie Mellon", "Wharton", "UPenn", "University of Pennsylvania",
-        "Columbia Business School", "Columbia University", "UC Berkeley", "Berkeley",
-        "Haas School", "UCLA", "University of Illinois", "UIUC",
-        "UT Austin", "University of Texas", "McCombs",
-        "Lafayette College", "Stonehill College", "University of Virginia", "UVA",
-        "McIntire", "Stanford", "Harvard", "MIT", "Yale", "Princeton",
-        "Northwestern", "Kellogg", "Booth", "Chicago Booth",
-        "Duke", "Fuqua", "NYU", "Stern", "Georgetown",
-        "Cornell", "Dartmouth", "Tuck", "Brown", "Penn State",
-        "Michigan", "Ross", "Darden", "Sloan",
-    ]
-    text_lower = text.lower()
-    for sch in known_schools:
-        if sch.lower() in text_lower:
-            schools.append({"s": sch, "y": None})
-    return schools
-
-def extract_location_from_text(text: str) -> str:
-    """Try to find location from snippet."""
-    loc_patterns = [
-        r"(?:Location|Based in|located in)[:\s]+([A-Z][A-Za-z\s]+,\s*[A-Z]{2})",
-        r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)?,\s*(?:CA|NY|TX|IL|CT|MA|WA|CO|GA|FL|VA|PA|NJ|DC))\b",
-    ]
-    for pat in loc_patterns:
-        m = re.search(pat, text)
-        if m:
-            return m.group(1).strip()
-    return ""
+    max_queries = DEEP_DIVE_MAX_QUERIES if max_queries is None else max_queries
+    max_seconds = DEEP_DIVE_MAX_SECONDS if max_seconds is None else max_seconds
+    patience = DEEP_DIVE_PATIENCE if patience is None else patience
+
+    ranked = sorted(people, key=lambda p: deep_dive_priority(p, company_name), reverse=True)
+    started = time.monotonic()
+    queries_used = 0
+    dry_streak = 0
+
+    for person in ranked:
+        if queries_used >= max_queries:
+            break
+        if time.monotonic() - started >= max_seconds:
+            log.info(f"Deep-dive time budget ({max_seconds}s) exhausted")
+            break
+        if dry_streak >= patience:
+            log.info(f"Deep-dive stopped early: {dry_streak} searches in a row found nothing new")
+            break
+
+        before = (len(person.orgs), len(person.education), bool(person.location))
+        detail_results = run_search(
+            f'"{person.name}" site:linkedin.com/in',
+            max_results=3,
+            failed=failed,
+        )
+        queries_used += 1
+        
+        for dr in detail_results:
+            parsed = parse_snippet(Snippet.from_result(dr), company_name, with_name=False, details_from_body=False)
+            person.orgs = list(set(person.orgs + parsed.orgs))
+            for e in parsed.education:
+                if e not in person.education:
+                    person.education.append(e)
+            if not person.location:
+                person.location = parsed.location
+
+        after = (len(person.orgs), len(person.education), bool(person.location))
+        dry_streak = 0 if after != before else dry_streak + 1
+
+    return queries_used
 
 
 # ─── SEARCH ENGINE ─────────────────────────────────────────────────────────
 
-def search_ddg(query: str, max_results: int = 15) -> list[dict]:
-    """Run a DuckDuckGo search and return results."""
+def merge_duplicates(people: list[Person], company_name: str) -> list[Person]:
+    """Collapse entries that are the same person ("Bob Smith" / "Robert Smith")."""
+    clusters = resolve.cluster(
+        people,
+        name=lambda p: p.name,
+        url=lambda p: p.linkedin,
+        company=lambda p: company_name,
+    )
+    merged = []
+    for indexes in clusters:
+        primary = people[indexes[0]]
+        for i in indexes[1:]:
+            dup = people[i]
+            primary.orgs = list(set(primary.orgs + dup.orgs))
+            primary.education = primary.education + [e for e in dup.education if e not in primary.education]
+            primary.board = list(set(primary.board + dup.board))
+            if not primary.location:
+                primary.location = dup.location
+            if not primary.linkedin:
+                primary.linkedin = dup.linkedin
+            if primary.title.startswith("Executive at ") and not dup.title.startswith("Executive at "):
+                primary.title = dup.title
+        merged.append(primary)
+    if len(merged) < len(people):
+        log.info(f"Entity resolution merged {len(people) - len(merged)} duplicate(s)")
+    return merged
+
+SEARCH = search.from_env()
+
+def run_search(query: str, max_results: int = 15, failed: list = None) -> list[dict]:
+    """
+    Run a search through the configured provider and return results. A failed
+    search returns [] so the pipeline carries on, but is recorded in `failed`.
+    """
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
-        return results
-    except Exception as e:
-        log.warning(f"DDG search failed for '{query}': {e}")
+        return SEARCH.search(query, max_results=max_results)
+    except search.SearchError as e:
+        log.warning(f"Search failed for '{query}': {e}")
+        if failed is not None:
+            failed.append(query)
         return []
 
-def find_company_people(company_name: str, linkedin_slug: str) -> tuple[list[Person], int]:
+DISCOVERY_QUERIES = [
+    'site:linkedin.com/in "{company}" CEO OR "Chief Executive" OR founder OR co-founder',
+    'site:linkedin.com/in "{company}" CTO OR CFO OR COO OR CRO OR CMO OR "Chief"',
+    'site:linkedin.com/in "{company}" "board of directors" OR "board member" OR director OR advisor',
+    'site:linkedin.com/in "{company}" VP OR SVP OR EVP OR "Vice President" OR president',
+    'site:linkedin.com/in "{company}" "General Counsel" OR CHRO OR CPO OR "Head of"',
+]
+
+def find_company_people(company_name: str, linkedin_slug: str) -> tuple[list[Person], int, list[str]]:
     """
-    Search DuckDuckGo for all leadership at a company.
-    Returns (people, num_queries).
+    Search for all leadership at a company.
+    Returns (people, num_queries, failed_queries).
     """
     all_results = []
     queries_used = 0
+    failed = []
     
     # Multiple targeted searches to find different roles
-    search_queries = [
-        f'site:linkedin.com/in "{company_name}" CEO OR "Chief Executive" OR founder OR co-founder',
-        f'site:linkedin.com/in "{company_name}" CTO OR CFO OR COO OR CRO OR CMO OR "Chief"',
-        f'site:linkedin.com/in "{company_name}" "board of directors" OR "board member" OR director OR advisor',
-        f'site:linkedin.com/in "{company_name}" VP OR SVP OR EVP OR "Vice President" OR president',
-        f'site:linkedin.com/in "{company_name}" "General Counsel" OR CHRO OR CPO OR "Head of"',
-    ]
+    search_queries = [q.format(company=company_name) for q in DISCOVERY_QUERIES]
     
     for query in search_queries:
-        results = search_ddg(query, max_results=12)
+        results = run_search(query, max_results=12, failed=failed)
         all_results.extend(results)
         queries_used += 1
         log.info(f"Query: {query[:80]}... → {len(results)} results")
@@ -212,17 +279,13 @@ def find_company_people(company_name: str, linkedin_slug: str) -> tuple[list[Per
     # Parse each result into a Person
     people_map = {}  # name_lower → Person
     for r in unique_results:
-        title_str = r.get("title", "")
-        body = r.get("body", "")
-        href = r.get("href", "")
-        
-        name, role = parse_linkedin_title(title_str)
-        if not name or len(name) < 3:
+        parsed = parse_snippet(Snippet.from_result(r), company_name, linkedin_slug)
+        name = parsed.name
+        if len(name) < MIN_NAME_LEN:
             continue
         
         # Skip if this doesn't seem related to our company
-        combined_text = f"{title_str} {body}".lower()
-        if company_name.lower() not in combined_text and linkedin_slug.lower().replace("-", " ") not in combined_text:
+        if not parsed.mentions_company:
             continue
         
         name_key = name.lower().strip()
@@ -230,96 +293,137 @@ def find_company_people(company_name: str, linkedin_slug: str) -> tuple[list[Per
         if name_key in people_map:
             # Merge info
             existing = people_map[name_key]
-            new_orgs = extract_orgs_from_text(f"{title_str} {body}", company_name)
-            existing.orgs = list(set(existing.orgs + new_orgs))
-            new_edu = extract_education_from_text(body)
-            existing.education = existing.education + [e for e in new_edu if e not in existing.education]
+            existing.orgs = list(set(existing.orgs + parsed.orgs))
+            existing.education = existing.education + [e for e in parsed.education if e not in existing.education]
             if not existing.location:
-                existing.location = extract_location_from_text(body)
+                existing.location = parsed.location
         else:
-            orgs = extract_orgs_from_text(f"{title_str} {body}", company_name)
-            edu = extract_education_from_text(body)
-            loc = extract_location_from_text(body)
-            
             people_map[name_key] = Person(
                 id=f"t-{len(people_map)}",
                 name=name,
-                title=role or f"Executive at {company_name}",
-                orgs=orgs,
-                education=edu,
+                title=parsed.role or f"Executive at {company_name}",
+                orgs=parsed.orgs,
+                education=parsed.education,
                 board=[],
-                location=loc,
-                linkedin=href,
+                location=parsed.location,
+                linkedin=r.get("href", ""),
             )
     
-    people = list(people_map.values())
+    people = merge_duplicates(list(people_map.values()), company_name)
     
-    # Now do deep-dive searches on each person to find more career detail
-    for person in people[:20]:  # Cap at 20 people for speed
-        detail_results = search_ddg(
-            f'"{person.name}" site:linkedin.com/in',
-            max_results=3,
-        )
-        queries_used += 1
-        
-        for dr in detail_results:
-            body = dr.get("body", "")
-            title = dr.get("title", "")
-            combined = f"{title} {body}"
-            
-            # Extract more orgs
-            new_orgs = extract_orgs_from_text(combined, company_name)
-            person.orgs = list(set(person.orgs + new_orgs))
-            
-            # Extract education
-            new_edu = extract_education_from_text(combined)
-            for e in new_edu:
-                if e not in person.education:
-                    person.education.append(e)
-            
-            # Extract location
-            if not person.location:
-                person.location = extract_location_from_text(combined)
+    # Now deep-dive the most valuable people first, within a query/time budget
+    queries_used += deep_dive(people, company_name, failed=failed)
     
-    log.info(f"Final: {len(people)} people with career details, {queries_used} queries used")
-    return people, queries_used
+    log.info(f"Final: {len(people)} people with career details, {queries_used} queries used, {len(failed)} failed")
+    return people, queries_used, failed
 
 
 # ─── API ROUTES ────────────────────────────────────────────────────────────
 
-@app.post("/api/find-connections", response_model=CompanyResult)
-async def find_connections(req: CompanyRequest):
-    """Main endpoint: takes LinkedIn company URL, returns leadership with career data."""
-    slug = extract_company_slug(req.url)
-    if not slug:
-        raise HTTPException(400, "Invalid LinkedIn company URL. Expected: linkedin.com/company/...")
-    
+# Degraded or empty results aren't cached, so the next request tries again
+RESULTS = ResultCache(cacheable=lambda result: bool(result.people) and not result.failed_queries,
+                      shared=shared_cache.store("finder-results"))
+
+# Searches are mostly waiting on the provider, but each one counts against its rate limits
+ADMISSION = admission.Admission.from_env("finder", "SP", concurrency=4)
+
+async def _find_connections_cost(request: Request) -> float:
+    """Search queries the request will run: none when it's answered from the cache."""
+    try:
+        slug = extract_company_slug((await request.json()).get("url", ""))
+    except (ValueError, AttributeError, TypeError):
+        return 1
+    refresh = request.query_params.get("refresh", "").lower() in ("1", "true")
+    if not slug or (not refresh and await RESULTS.has(slug.lower())):
+        return 1
+    return len(DISCOVERY_QUERIES) + DEEP_DIVE_MAX_QUERIES
+
+async def _score_cost(request: Request) -> float:
+    try:
+        return 1 + len((await request.json()).get("people") or []) / 200
+    except (ValueError, AttributeError, TypeError):
+        return 1
+
+async def search_company(slug: str) -> CompanyResult:
     company_name = slug_to_name(slug)
     log.info(f"Starting search for: {company_name} (slug: {slug})")
     
     # Run the search (this takes 20-60 seconds)
     loop = asyncio.get_event_loop()
-    people, queries_used = await loop.run_in_executor(
+    people, queries_used, failed = await loop.run_in_executor(
         None, find_company_people, company_name, slug
     )
     
     if not people:
         # Try alternate search with just the slug
         log.info(f"No results with name, trying slug: {slug}")
-        people, q2 = await loop.run_in_executor(
+        people, q2, f2 = await loop.run_in_executor(
             None, find_company_people, slug.replace("-", " "), slug
         )
         queries_used += q2
+        failed += f2
     
     return CompanyResult(
         company_name=company_name,
         people=people,
         search_queries_used=queries_used,
+        failed_queries=failed,
+    )
+
+@app.post("/api/find-connections", response_model=CompanyResult,
+          dependencies=[Depends(ADMISSION.guard(_find_connections_cost))])
+async def find_connections(req: CompanyRequest, response: Response, refresh: bool = False):
+    """
+    Main endpoint: takes LinkedIn company URL, returns leadership with career data.
+    Results are cached per company slug (X-Cache: hit | stale | miss);
+    ?refresh=true forces a new search.
+    """
+    slug = extract_company_slug(req.url)
+    if not slug:
+        raise HTTPException(400, "Invalid LinkedIn company URL. Expected: linkedin.com/company/...")
+    
+    result, status = await RESULTS.get(slug.lower(), lambda: search_company(slug), refresh=refresh)
+    response.headers["X-Cache"] = status
+    return result
+
+@app.post("/api/score", response_model=ScoreResult, dependencies=[Depends(ADMISSION.guard(_score_cost))])
+async def score(req: ScoreRequest):
+    """
+    Score an ad-hoc people list (e.g. the finder's results after edits) with
+    the same engine as the main API. With changed_ids, only those people are
+    scored and the caller swaps their old results for the new ones.
+    """
+    sp_members = [m.model_dump() for m in req.sp_members] if req.sp_members is not None else None
+    people = [p.model_dump() for p in req.people]
+    loop = asyncio.get_event_loop()
+    pairs, scored = await loop.run_in_executor(
+        None, lambda: adhoc.score_people(people, sp_members, req.changed_ids, req.min_score)
+    )
+    return ScoreResult(
+        results=[
+            ScoredPair(
+                sp_id=str(member.id), target_id=str(target.id),
+                score=result.score, strength=result.strength,
+                signals=[ScoredSignal(type=s.type, label=s.label, detail=s.detail, points=s.points, icon=s.icon)
+                         for s in result.signals],
+            )
+            for member, target, result in pairs
+        ],
+        scored_ids=scored,
     )
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok", "message": "Smith Point Connection Finder is running"}
+    return {"status": "ok", "message": "Smith Point Connection Finder is running", "search_provider": SEARCH.name}
+
+@app.get("/api/metrics")
+async def metrics():
+    return {"search": SEARCH.report(), "result_cache": RESULTS.report(), "admission": ADMISSION.report(),
+            "compression": compression.report(), "snippet_extractors": timing_report()}
+
+def preload():
+    """Called in the gunicorn master before forking (gunicorn.conf.py): build read-only data once."""
+    adhoc.roster()    # SP_TEAM records + MemberIndex, and the gazetteer via geo.locate()
 
 # ─── SERVE FRONTEND ───────────────────────────────────────────────────────
 
@@ -0,0 +1,114 @@
+"""
+Cross-process state for multi-worker deployments (see gunicorn.conf.py).
+
+Every worker on the host opens one SQLite database on tmpfs. It has two uses:
+
+    SharedStore   key → pickled value plus the time it was stored. The
+                  finder's ResultCache writes through to it, so a company
+                  searched by one worker is a hit in all of them.
+    ChangeLog     an append-only log of changes.Change. Each worker's feed
+                  appends the changes it handled and replays everyone
+                  else's, so per-worker caches (ScoreCache, role index)
+                  don't drift apart.
+
+Sharing is off unless RCP_SHARED_DIR is set; gunicorn.conf.py sets it to a
+fresh directory per master. A single uvicorn process doesn't need any of it.
+Connections are per thread and reopened after a fork.
+
+Environment:
+    RCP_SHARED_DIR   directory for the shared database (default: unset, sharing off)
+"""
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+LOG_KEEP_S = 600           # change log rows older than this are pruned
+STORE_MAX_ENTRIES = 1024   # per namespace, oldest evicted
+
+_local = threading.local()
+
+
+def enabled() -> bool:
+    return bool(os.getenv("RCP_SHARED_DIR"))
+
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.pid == os.getpid():
+        return conn
+    path = os.path.join(os.environ["RCP_SHARED_DIR"], "shared.db")
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")    # tmpfs; nothing here outlives the host anyway
+    conn.execute("CREATE TABLE IF NOT EXISTS kv (namespace TEXT, key TEXT, stored_at REAL, value BLOB, "
+                 "PRIMARY KEY (namespace, key))")
+    conn.execute("CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, pid INTEGER, "
+                 "at REAL, person_ids TEXT, org_ids TEXT)")
+    _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+class SharedStore:
+    """One namespace of the shared key/value table. Times are wall-clock (time.time())."""
+
+    def __init__(self, namespace: str, max_entries: int = STORE_MAX_ENTRIES):
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+    def get(self, key: str):
+        """(stored_at, value) or None."""
+        row = _connect().execute("SELECT stored_at, value FROM kv WHERE namespace = ? AND key = ?",
+                                 (self.namespace, key)).fetchone()
+        return (row[0], pickle.loads(row[1])) if row else None
+
+    def put(self, key: str, value, stored_at: float = None) -> None:
+        conn = _connect()
+        conn.execute("INSERT OR REPLACE INTO kv VALUES (?, ?, ?, ?)",
+                     (self.namespace, key, stored_at or time.time(), pickle.dumps(value)))
+        conn.execute("DELETE FROM kv WHERE namespace = ? AND key IN (SELECT key FROM kv WHERE namespace = ? "
+                     "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.namespace, self.namespace, self.max_entries))
+
+    def delete(self, key: str = None) -> None:
+        if key is None:
+            _connect().execute("DELETE FROM kv WHERE namespace = ?", (self.namespace,))
+        else:
+            _connect().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+
+class ChangeLog:
+    """Changes handled by any worker; read() returns the ones other processes appended."""
+
+    def __init__(self):
+        self._cursor = None
+
+    def append(self, change) -> None:
+        conn = _connect()
+        now = time.time()
+        conn.execute("INSERT INTO changes (pid, at, person_ids, org_ids) VALUES (?, ?, ?, ?)",
+                     (os.getpid(), now, json.dumps(sorted(change.person_ids)), json.dumps(sorted(change.org_ids))))
+        conn.execute("DELETE FROM changes WHERE at < ?", (now - LOG_KEEP_S,))
+
+    def read(self) -> list:
+        """[(person_ids, org_ids)] appended by other processes since the last read (or since the first call)."""
+        conn = _connect()
+        if self._cursor is None:
+            self._cursor = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            return []
+        rows = conn.execute("SELECT seq, pid, person_ids, org_ids FROM changes WHERE seq > ? ORDER BY seq",
+                            (self._cursor,)).fetchall()
+        if rows:
+            self._cursor = rows[-1][0]
+        return [(set(json.loads(p)), set(json.loads(o))) for _, pid, p, o in rows if pid != os.getpid()]
+
+
+def store(namespace: str):
+    """A SharedStore, or None when sharing is off."""
+    return SharedStore(namespace) if enabled() else None
+
+
+def change_log():
+    """A ChangeLog, or None when sharing is off."""
+    return ChangeLog() if enabled() else None
@@ -0,0 +1,670 @@
+"""
+Columnar snapshots of the relationship graph.
+
+A snapshot is a directory of flat, uncompressed column files plus a
+manifest.json — one file per column, native byte order, so a reader can
+mmap them and index straight into the page cache:
+
+    int / bool / timestamp columns   <table>.<column>.bin   fixed-width array
+    string columns                   <table>.<column>.off   int64 offsets (rows + 1)
+                                     <table>.<column>.dat   utf-8 bytes
+                                     <table>.<column>.nul   1 byte per row, 1 = NULL
+
+Integer NULLs are stored as the type's minimum value; timestamps are UTC
+microseconds since the epoch. Tables are written sorted by the key that
+scoring looks rows up by (roles and education by person, interactions and
+their roll-ups by internal person, edges by pair), streamed from the
+database in chunks so memory stays flat. `roles_by_org` and `edges_by_b` are (key, row) indexes
+into roles and coworker_edges.
+
+Snapshot(path) opens one read-only, and score() runs batch scoring from it
+without a database session. Needs no third-party packages; `--parquet` also
+writes one Parquet file per table if pyarrow is installed.
+
+    python snapshot.py export DIR [--parquet]
+    python snapshot.py publish ROOT        # new version under ROOT, swap CURRENT
+    python snapshot.py info DIR
+    python snapshot.py score DIR COMPANY_SLUG [--top N]
+"""
+import json
+import logging
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import Boolean, DateTime, Integer, SmallInteger, select
+
+import models
+import records
+import scoring
+
+try:
+    import fcntl
+except ImportError:     # Windows: no cross-process rebuild lock
+    fcntl = None
+
+log = logging.getLogger("rcp.snapshot")
+
+FORMAT_VERSION = 1
+CHUNK_ROWS = 5000
+
+# Array typecodes for each stored type, and the NULL sentinel for ints
+_TYPECODES = {"i64": "q", "i32": "i", "u8": "B", "ts": "q"}
+_NULLS = {"i64": -2 ** 63, "i32": -2 ** 31, "ts": -2 ** 63}
+_EPOCH = datetime(1970, 1, 1)
+
+# table → (model, columns, sort key)
+TABLES = {
+    "persons": (models.Person, [
+        "id", "full_name", "current_title", "current_company", "location", "city_id", "metro_id",
+        "linkedin_url", "is_internal",
+    ], ["id"]),
+    "organizations": (models.Organization, [
+        "id", "name", "linkedin_slug", "hq_location", "industry", "is_portfolio",
+    ], ["id"]),
+    "roles": (models.Role, [
+        "id", "person_id", "org_id", "title", "start_year", "end_year", "is_board", "is_current",
+    ], ["person_id", "id"]),
+    "education": (models.Education, [
+        "id", "person_id", "institution", "degree", "start_year", "end_year",
+    ], ["person_id", "id"]),
+    "interactions": (models.Interaction, [
+        "id", "internal_person_id", "external_person_id", "interaction_type", "occurred_at",
+    ], ["internal_person_id", "occurred_at", "id"]),
+    "interaction_rollups": (models.InteractionRollup, [
+        "internal_person_id", "external_person_id", "interaction_type", "last_occurred_at", "count",
+    ], ["internal_person_id", "last_occurred_at", "id"]),
+    "coworker_edges": (models.CoworkerEdge, [
+        "person_a_id", "person_b_id", "org_id", "overlap_years", "first_overlap_year", "last_overlap_year",
+    ], ["person_a_id", "person_b_id", "org_id"]),
+}
+
+
+def _column_type(column) -> str:
+    t = column.type
+    if isinstance(t, Boolean):
+        return "u8"
+    if isinstance(t, SmallInteger):
+        return "i32"
+    if isinstance(t, Integer):
+        return "i64"
+    if isinstance(t, DateTime):
+        return "ts"
+    return "str"
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+# ─── WRITING ───────────────────────────────────────────────────────────────
+
+class _FixedWriter:
+    def __init__(self, path: Path, kind: str):
+        self.kind = kind
+        self.file = open(path, "wb")
+        self.buf = array(_TYPECODES[kind])
+
+    def append(self, value) -> None:
+        if value is None:
+            value = _NULLS.get(self.kind, 0)
+        elif self.kind == "ts":
+            value = _to_micros(value)
+        self.buf.append(int(value))
+
+    def flush(self) -> None:
+        self.buf.tofile(self.file)
+        del self.buf[:]
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+
+class _StringWriter:
+    def __init__(self, path_prefix: Path):
+        self.off = open(f"{path_prefix}.off", "wb")
+        self.dat = open(f"{path_prefix}.dat", "wb")
+        self.nul = open(f"{path_prefix}.nul", "wb")
+        self.pos = 0
+        self.offsets = array("q", [0])
+        self.nulls = array("B")
+        self.data = []
+
+    def append(self, value) -> None:
+        encoded = b"" if value is None else str(value).encode()
+        self.pos += len(encoded)
+        self.data.append(encoded)
+        self.offsets.append(self.pos)
+        self.nulls.append(value is None)
+
+    def flush(self) -> None:
+        self.offsets.tofile(self.off)
+        self.nulls.tofile(self.nul)
+        self.dat.write(b"".join(self.data))
+        del self.offsets[:], self.nulls[:]
+        self.data.clear()
+
+    def close(self) -> None:
+        self.flush()
+        for f in (self.off, self.dat, self.nul):
+            f.close()
+
+
+def _write_table(conn, out: Path, name: str, model, columns: list, sort_key: list) -> dict:
+    table = model.__table__
+    kinds = {c: _column_type(table.c[c]) for c in columns}
+    writers = {
+        c: _StringWriter(out / f"{name}.{c}") if kinds[c] == "str" else _FixedWriter(out / f"{name}.{c}.bin", kinds[c])
+        for c in columns
+    }
+    query = select(*[table.c[c] for c in columns]).order_by(*[table.c[c] for c in sort_key])
+    result = conn.execution_options(stream_results=True).execute(query)
+    rows = 0
+    while True:
+        chunk = result.fetchmany(CHUNK_ROWS)
+        if not chunk:
+            break
+        for row in chunk:
+            for c, value in zip(columns, row):
+                writers[c].append(value)
+        for w in writers.values():
+            w.flush()
+        rows += len(chunk)
+    for w in writers.values():
+        w.close()
+    return {"rows": rows, "columns": kinds, "sorted_by": sort_key}
+
+
+def _write_index(out: Path, name: str, key_values, source_rows) -> dict:
+    """A two-column index table: key, row (into the source table), sorted by key."""
+    order = sorted(range(len(key_values)), key=lambda i: key_values[i])
+    with open(out / f"{name}.key.bin", "wb") as f:
+        array("q", (key_values[i] for i in order)).tofile(f)
+    with open(out / f"{name}.row.bin", "wb") as f:
+        array("q", (source_rows[i] for i in order)).tofile(f)
+    return {"rows": len(order), "columns": {"key": "i64", "row": "i64"}, "sorted_by": ["key"]}
+
+
+def write_snapshot(db, out_dir, schema_version=None) -> dict:
+    """
+    Export every table in TABLES to `out_dir`. Writes to a temporary sibling
+    directory and renames it into place, so readers never see a partial
+    snapshot. Returns the manifest.
+    """
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}.", dir=out_dir.parent))
+    try:
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "schema_version": schema_version,
+            "tables": {},
+        }
+        conn = db.connection()
+        for name, (model, columns, sort_key) in TABLES.items():
+            manifest["tables"][name] = _write_table(conn, tmp, name, model, columns, sort_key)
+
+        # Secondary indexes: role rows by org ("everyone who worked at X") and
+        # edge rows by person_b_id (edges are sorted by person_a_id)
+        org_ids = Snapshot._read_fixed(tmp / "roles.org_id.bin", "i64")
+        manifest["tables"]["roles_by_org"] = _write_index(tmp, "roles_by_org", org_ids, range(len(org_ids)))
+        b_ids = Snapshot._read_fixed(tmp / "coworker_edges.person_b_id.bin", "i64")
+        manifest["tables"]["edges_by_b"] = _write_index(tmp, "edges_by_b", b_ids, range(len(b_ids)))
+
+        (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        if out_dir.exists():
+            old = out_dir.with_name(f".{out_dir.name}.old")
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(out_dir, old)
+            os.replace(tmp, out_dir)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(tmp, out_dir)
+        return manifest
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def write_parquet(snapshot_dir, out_dir=None) -> list:
+    """One Parquet file per table (needs pyarrow). Returns the written paths."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+    snap = Snapshot(snapshot_dir)
+    out_dir = Path(out_dir or snapshot_dir)
+    written = []
+    for name, meta in snap.manifest["tables"].items():
+        table = snap.table(name)
+        data = {c: [table.get(c, i) for i in range(table.rows)] for c in meta["columns"]}
+        path = out_dir / f"{name}.parquet"
+        pq.write_table(pa.table(data), path)
+        written.append(path)
+    snap.close()
+    return written
+
+
+# ─── READING ───────────────────────────────────────────────────────────────
+
+class _Strings:
+    """Lazily decoded, read-only view of a string column."""
+
+    def __init__(self, offsets: memoryview, data: mmap.mmap, nulls: memoryview):
+        self.offsets, self.data, self.nulls = offsets, data, nulls
+
+    def __len__(self):
+        return len(self.nulls)
+
+    def __getitem__(self, i: int):
+        if self.nulls[i]:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode()
+
+
+class Table:
+    def __init__(self, snap: "Snapshot", name: str, meta: dict):
+        self.snap, self.name = snap, name
+        self.rows = meta["rows"]
+        self.kinds = meta["columns"]
+        self._columns = {}
+
+    def column(self, name: str):
+        """Zero-copy memoryview for fixed-width columns, _Strings for text."""
+        if name not in self._columns:
+            kind = self.kinds[name]
+            prefix = f"{self.name}.{name}"
+            if kind == "str":
+                self._columns[name] = _Strings(
+                    self.snap._view(f"{prefix}.off", "q"),
+                    self.snap._map(f"{prefix}.dat"),
+                    self.snap._view(f"{prefix}.nul", "B"),
+                )
+            else:
+                self._columns[name] = self.snap._view(f"{prefix}.bin", _TYPECODES[kind])
+        return self._columns[name]
+
+    def get(self, name: str, i: int):
+        """One value with NULLs, booleans and timestamps decoded."""
+        kind = self.kinds[name]
+        value = self.column(name)[i]
+        if kind == "str":
+            return value
+        if kind == "u8":
+            return bool(value)
+        if value == _NULLS[kind]:
+            return None
+        if kind == "ts":
+            return _EPOCH + timedelta(microseconds=value)
+        return value
+
+    def range(self, name: str, key: int) -> range:
+        """Rows whose (sorted) column `name` equals `key`."""
+        col = self.column(name)
+        return range(bisect_left(col, key), bisect_right(col, key))
+
+
+class Snapshot:
+    """
+    A read-only, memory-mapped snapshot. Columns are mapped on first use and
+    shared with every other process mapping the same files.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        if self.manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {self.manifest['format_version']}")
+        if self.manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"Snapshot was written {self.manifest['byteorder']}-endian")
+        self._maps = {}
+        self._org_names = {}
+        self._slugs = None
+        self._person_ids = {}
+        self._tables = {name: Table(self, name, meta) for name, meta in self.manifest["tables"].items()}
+
+    @staticmethod
+    def _read_fixed(path: Path, kind: str) -> array:
+        values = array(_TYPECODES[kind])
+        values.frombytes(path.read_bytes())
+        return values
+
+    def _map(self, filename: str):
+        if filename not in self._maps:
+            with open(self.path / filename, "rb") as f:
+                # mmap can't map empty files; an empty bytes object reads the same
+                self._maps[filename] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        return self._maps[filename]
+
+    def _view(self, filename: str, typecode: str) -> memoryview:
+        return memoryview(self._map(filename)).cast(typecode)
+
+    def table(self, name: str) -> Table:
+        return self._tables[name]
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            table._columns.clear()
+        for m in self._maps.values():
+            if isinstance(m, mmap.mmap):
+                m.close()
+        self._maps.clear()
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def _row(self, table: str, id_: int):
+        rows = self.table(table).range("id", id_)
+        return rows.start if rows else None
+
+    def org(self, org_id: int):
+        t, i = self.table("organizations"), self._row("organizations", org_id)
+        if i is None:
+            return None
+        return records.OrgRecord(
+            id=org_id, name=t.get("name", i), linkedin_slug=t.get("linkedin_slug", i),
+            hq_location=t.get("hq_location", i), industry=t.get("industry", i),
+            is_portfolio=t.get("is_portfolio", i),
+        )
+
+    def org_by_slug(self, slug: str):
+        if self._slugs is None:
+            t = self.table("organizations")
+            slugs, ids = t.column("linkedin_slug"), t.column("id")
+            self._slugs = {slugs[i]: ids[i] for i in range(t.rows) if slugs[i] is not None}
+        org_id = self._slugs.get(slug)
+        return self.org(org_id) if org_id is not None else None
+
+    def person_ids(self, internal: bool = None) -> list:
+        if internal not in self._person_ids:
+            t = self.table("persons")
+            ids, flags = t.column("id"), t.column("is_internal")
+            self._person_ids[internal] = [ids[i] for i in range(t.rows) if internal is None or bool(flags[i]) == internal]
+        return self._person_ids[internal]
+
+    def people_at_org(self, org_id: int) -> list:
+        """Distinct person ids with any role at `org_id`, in id order."""
+        index, roles = self.table("roles_by_org"), self.table("roles")
+        rows, person_ids = index.column("row"), roles.column("person_id")
+        return sorted({person_ids[rows[i]] for i in index.range("key", org_id)})
+
+    def person(self, person_id: int, needs=records.ALL_NEEDS):
+        """Materialize one PersonRecord, with only the relationships in `needs`."""
+        t, i = self.table("persons"), self._row("persons", person_id)
+        if i is None:
+            return None
+        person = records.PersonRecord(
+            id=person_id, full_name=t.get("full_name", i), location=t.get("location", i),
+            current_title=t.get("current_title", i), current_company=t.get("current_company", i),
+            linkedin_url=t.get("linkedin_url", i), is_internal=t.get("is_internal", i),
+        )
+        if "city_id" in t.kinds:   # snapshots written before geocoding fall back to text matching
+            person.city_id, person.metro_id = t.get("city_id", i), t.get("metro_id", i)
+        if "roles" in needs:
+            roles = self.table("roles")
+            for r in roles.range("person_id", person_id):
+                org_id = roles.get("org_id", r)
+                org = self._org_name_record(org_id)
+                person.roles.append(records.RoleRecord(
+                    org_id=org_id, org=org, start_year=roles.get("start_year", r),
+                    end_year=roles.get("end_year", r), is_board=roles.get("is_board", r),
+                ))
+        if "education" in needs:
+            edu = self.table("education")
+            person.education = [
+                records.EducationRecord(edu.get("institution", r), edu.get("start_year", r), edu.get("end_year", r))
+                for r in edu.range("person_id", person_id)
+            ]
+        if "interactions" in needs:
+            ix = self.table("interactions")
+            person.interactions_as_internal = [
+                records.InteractionRecord(ix.get("external_person_id", r), ix.get("interaction_type", r), ix.get("occurred_at", r))
+                for r in ix.range("internal_person_id", person_id)
+            ]
+            if "interaction_rollups" in self._tables:   # snapshots written before retention.py have none
+                ru = self.table("interaction_rollups")
+                person.interactions_as_internal += [
+                    records.InteractionRecord(ru.get("external_person_id", r), ru.get("interaction_type", r),
+                                              ru.get("last_occurred_at", r), ru.get("count", r))
+                    for r in ru.range("internal_person_id", person_id)
+                ]
+        return person
+
+    def _org_name_record(self, org_id: int):
+        if org_id not in self._org_names:
+            i = self._row("organizations", org_id)
+            name = self.table("organizations").get("name", i) if i is not None else str(org_id)
+            self._org_names[org_id] = records.OrgRecord(org_id, name)
+        return self._org_names[org_id]
+
+    def pair_edges(self, sp_ids, target_ids) -> dict:
+        """Same shape as edges.load_pair_edges(), with EdgeRecords."""
+        t, by_b = self.table("coworker_edges"), self.table("edges_by_b")
+        a_col, b_col, b_rows = t.column("person_a_id"), t.column("person_b_id"), by_b.column("row")
+        targets = set(target_ids)
+        out = {}
+        for sp_id in sp_ids:
+            # Edges are stored with person_a_id < person_b_id: look on both sides
+            rows = [(r, b_col[r]) for r in t.range("person_a_id", sp_id)]
+            rows += [(b_rows[i], a_col[b_rows[i]]) for i in by_b.range("key", sp_id)]
+            for r, other in rows:
+                if other in targets:
+                    out.setdefault((sp_id, other), {})[t.get("org_id", r)] = self._edge(t, r)
+        return out
+
+    @staticmethod
+    def _edge(t: Table, r: int):
+        return records.EdgeRecord(t.get("overlap_years", r), t.get("first_overlap_year", r), t.get("last_overlap_year", r))
+
+
+# ─── PUBLISHING ────────────────────────────────────────────────────────────
+# A snapshot root holds versioned snapshot directories plus a CURRENT file
+# naming the live one. publish() writes a new version and swaps CURRENT with
+# an atomic rename; readers notice on their next request and re-map. Old
+# versions are pruned — processes still mapping them keep their pages until
+# they switch over.
+
+def current_version(root) -> str:
+    try:
+        return (Path(root) / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish(db, root, schema_version=None, keep: int = 2) -> str:
+    root = Path(root)
+    dirty = root / "DIRTY"
+    dirty_at = dirty.stat().st_mtime_ns if dirty.exists() else None
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    write_snapshot(db, root / version, schema_version)
+    pointer = root / f".CURRENT.{os.getpid()}"
+    pointer.write_text(version)
+    os.replace(pointer, root / "CURRENT")
+    # Writes that landed while we were exporting leave DIRTY for the next build
+    if dirty_at is not None and dirty.exists() and dirty.stat().st_mtime_ns == dirty_at:
+        dirty.unlink(missing_ok=True)
+    versions = sorted(p.name for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in versions[:-keep]:
+        shutil.rmtree(root / old, ignore_errors=True)
+    return version
+
+
+class SnapshotStore:
+    """
+    Read side of a snapshot root, for serving. get() returns the live
+    Snapshot (re-mapping when CURRENT changes; one stat per call) or None if
+    nothing has been published yet. SP member records are materialized once
+    per snapshot version and signal set.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._snap = None
+        self._version = None
+        self._stamp = None
+        self._members = {}
+        self.builds = 0
+        self.last_build_ms = None
+
+    def get(self):
+        pointer = self.root / "CURRENT"
+        try:
+            st = pointer.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_ino)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    version = current_version(self.root)
+                    if version and version != self._version:
+                        # The old snapshot is left to the GC: requests still
+                        # scoring against it keep their mappings until done
+                        self._snap, self._version, self._members = Snapshot(self.root / version), version, {}
+                    self._stamp = stamp
+        return self._snap
+
+    @property
+    def version(self):
+        return self._version
+
+    def members(self, snap: "Snapshot", needs) -> list:
+        key = (id(snap), frozenset(needs))
+        if key not in self._members:
+            self._members[key] = [snap.person(pid, needs) for pid in snap.person_ids(internal=True)]
+        return self._members[key]
+
+    # ── Rebuilding ───────────────────────────────────────────────────────────
+
+    def mark_dirty(self) -> None:
+        """Ask for a rebuild; shared by every process using this root."""
+        (self.root / "DIRTY").touch()
+
+    def needs_rebuild(self, max_age_s: float, debounce_s: float) -> bool:
+        version = current_version(self.root)
+        if version is None:
+            return True
+        age = time.time() - (self.root / "CURRENT").stat().st_mtime
+        if (self.root / "DIRTY").exists():
+            return age >= debounce_s
+        return bool(max_age_s) and age >= max_age_s
+
+    def rebuild(self, session_factory, schema_version=None) -> bool:
+        """Publish a new snapshot unless another process is already doing it."""
+        with open(self.root / ".lock", "w") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+            started = time.perf_counter()
+            db = session_factory()
+            try:
+                publish(db, self.root, schema_version)
+            finally:
+                db.close()
+            self.builds += 1
+            self.last_build_ms = round((time.perf_counter() - started) * 1000, 1)
+            return True
+
+    def start_refresher(self, session_factory, max_age_s: float, debounce_s: float,
+                        ready=lambda: True, schema_version=lambda: None, poll_s: float = 2.0) -> threading.Thread:
+        def loop():
+            while True:
+                try:
+                    if ready() and self.needs_rebuild(max_age_s, debounce_s):
+                        self.rebuild(session_factory, schema_version())
+                except Exception:
+                    log.exception("Snapshot rebuild failed")
+                time.sleep(poll_s)
+
+        thread = threading.Thread(target=loop, name="rcp-snapshot", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> dict:
+        return {"root": str(self.root), "version": self._version, "builds": self.builds,
+                "last_build_ms": self.last_build_ms, "dirty": (self.root / "DIRTY").exists()}
+
+
+# ─── BATCH SCORING ─────────────────────────────────────────────────────────
+
+def score(snap: Snapshot, target_ids, ctx=None, min_score: int = 0, strengths=None):
+    """
+    Score every SP member against every target straight from the snapshot.
+    Yields (member, target, ConnectivityResult) for pairs passing the filters.
+    """
+    ctx = ctx or scoring.default_context()
+    members = [snap.person(pid, ctx.needs) for pid in snap.person_ids(internal=True)]
+    targets = [snap.person(pid, ctx.needs - {"interactions"}) for pid in target_ids]
+    pair_edges = snap.pair_edges([m.id for m in members], target_ids) if "edges" in ctx.needs else {}
+    for target in targets:
+        for member in members:
+            result = scoring.compute_connectivity(member, target, pair_edges.get((member.id, target.id), {}), ctx)
+            if scoring.keep_result(result, min_score, strengths):
+                yield member, target, result
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+    import bootstrap
+
+    usage = ("Usage: python snapshot.py export DIR [--parquet] | publish ROOT | info DIR | "
+             "score DIR COMPANY_SLUG [--top N]")
+    args = sys.argv[1:]
+    if len(args) < 2:
+        sys.exit(usage)
+    command, path = args[0], args[1]
+
+    if command == "export":
+        db = SessionLocal()
+        try:
+            manifest = write_snapshot(db, path, bootstrap.read_markers().get("schema_version"))
+        finally:
+            db.close()
+        for name, meta in manifest["tables"].items():
+            print(f"  {name:16} {meta['rows']:>9,} rows")
+        if "--parquet" in args:
+            for p in write_parquet(path):
+                print(f"  wrote {p}")
+        print(f"✅ Snapshot written to {path}")
+    elif command == "publish":
+        db = SessionLocal()
+        try:
+            version = publish(db, path, bootstrap.read_markers().get("schema_version"))
+        finally:
+            db.close()
+        print(f"✅ Published {path}/{version}")
+    elif command == "info":
+        print(json.dumps(Snapshot(path).manifest, indent=2))
+    elif command == "score" and len(args) >= 3:
+        snap = Snapshot(path)
+        org = snap.org_by_slug(args[2])
+        if org is None:
+            sys.exit(f"Company '{args[2]}' not in snapshot")
+        top_n = int(args[args.index("--top") + 1]) if "--top" in args else 20
+        external = set(snap.person_ids(internal=False))
+        ids = [pid for pid in snap.people_at_org(org.id) if pid in external]
+        top = scoring.TopK(top_n)
+        for member, target, result in score(snap, ids):
+            top.push(result.score, (member, target, result))
+        for member, target, result in top.items():
+            print(f"{result.score:>4}  {result.strength:7} {member.full_name} → {target.full_name}")
+        print(f"{top.seen} pairs scored for {org.name}")
+    else:
+        sys.exit(usage)
@@ -0,0 +1,198 @@
+"""
+Search-snippet processing for the finder.
+
+Every pattern is compiled once at import. Each search result is normalized
+once into a Snippet (title, body, combined text and their lowercased forms),
+and all extractors run over that shared representation, producing one
+SnippetParse record. Per-extractor timings are accumulated in TIMINGS for
+/api/metrics.
+"""
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+# ─── PATTERNS ──────────────────────────────────────────────────────────────
+
+# 'John Smith - CEO at Acme Corp | LinkedIn'
+_LINKEDIN_SUFFIX = re.compile(r"\s*[\|\-–—]\s*LinkedIn\s*$", re.IGNORECASE)
+_TITLE_SPLIT = re.compile(r"\s*[\-–—]\s*")
+_NAME_PARENS = re.compile(r"\s*\(.*?\)\s*")
+
+# "Previously at X" or "Experience: X, Y, Z"
+_PREV_PATTERNS = [
+    re.compile(r"(?:previously|formerly|former)\s+(?:at|with|@)\s+([A-Z][A-Za-z\s&.]+?)(?:\s*[,;.|]|\s+and\s)", re.IGNORECASE),
+    re.compile(r"(?:experience|worked at|career)[:.]?\s*([A-Z][A-Za-z\s&.,]+?)(?:\s*[|])", re.IGNORECASE),
+]
+_CANDIDATE_SPLIT = re.compile(r"\s*[,;]\s*")
+
+_LOC_PATTERNS = [
+    re.compile(r"(?:Location|Based in|located in)[:\s]+([A-Z][A-Za-z\s]+,\s*[A-Z]{2})"),
+    re.compile(r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)?,\s*(?:CA|NY|TX|IL|CT|MA|WA|CO|GA|FL|VA|PA|NJ|DC))\b"),
+]
+
+# Known SP-relevant companies to look for, as (display, lowercase) pairs
+SP_COMPANIES = [(co, co.lower()) for co in [
+    "Salesforce", "Oracle", "Snowflake", "ServiceNow", "Databricks",
+    "Vista Equity Partners", "Morgan Stanley", "Credit Suisse", "Goldman Sachs",
+    "Insight Partners", "VMG Partners", "PwC", "PricewaterhouseCoopers",
+    "IBM", "PeopleSoft", "Cisco", "Microsoft", "Twilio", "Datadog",
+    "Stripe", "McKinsey", "Booz Allen Hamilton", "Booz Allen",
+    "Heidrick & Struggles", "SAP", "Genesys", "Confluent", "Anthropic",
+    "Procter & Gamble", "P&G", "Expedia", "Wilson Sonsini", "Celonis",
+    "ExactTarget", "Diligent", "Andersen Consulting", "Accenture",
+    "Ionic Partners", "Fifth Wall", "Longfellow Capital",
+    "Osterweis", "Inseego", "Cavulus", "Umee",
+    "Google", "Amazon", "Meta", "Apple", "Netflix",
+    "Uber", "Airbnb", "Tesla", "SpaceX", "Palantir",
+    "Workday", "Splunk", "VMware", "Dell", "HP", "Intel",
+    "Qualcomm", "Adobe", "Zoom", "Slack", "HubSpot",
+    "JP Morgan", "JPMorgan", "Bank of America", "Citigroup", "Citi",
+    "Deloitte", "EY", "Ernst & Young", "KPMG", "Bain",
+    "BCG", "Boston Consulting", "Sequoia", "Andreessen Horowitz", "a16z",
+    "Kleiner Perkins", "Benchmark", "Lightspeed", "GV", "Tiger Global",
+    "SoftBank", "Thoma Bravo", "Silver Lake", "KKR", "Blackstone",
+    "General Atlantic", "Warburg Pincus", "Bessemer",
+]]
+
+KNOWN_SCHOOLS = [(sch, sch.lower()) for sch in [
+    "Carnegie Mellon", "Wharton", "UPenn", "University of Pennsylvania",
+    "Columbia Business School", "Columbia University", "UC Berkeley", "Berkeley",
+    "Haas School", "UCLA", "University of Illinois", "UIUC",
+    "UT Austin", "University of Texas", "McCombs",
+    "Lafayette College", "Stonehill College", "University of Virginia", "UVA",
+    "McIntire", "Stanford", "Harvard", "MIT", "Yale", "Princeton",
+    "Northwestern", "Kellogg", "Booth", "Chicago Booth",
+    "Duke", "Fuqua", "NYU", "Stern", "Georgetown",
+    "Cornell", "Dartmouth", "Tuck", "Brown", "Penn State",
+    "Michigan", "Ross", "Darden", "Sloan",
+]]
+
+# ─── SHARED REPRESENTATION ─────────────────────────────────────────────────
+
+class Snippet:
+    """One search result, normalized once for every extractor."""
+    __slots__ = ("title", "body", "href", "combined", "combined_lower", "body_lower")
+
+    def __init__(self, title: str, body: str, href: str = ""):
+        self.title = title or ""
+        self.body = body or ""
+        self.href = href or ""
+        self.combined = f"{self.title} {self.body}"
+        self.combined_lower = self.combined.lower()
+        self.body_lower = self.body.lower()
+
+    @classmethod
+    def from_result(cls, result: dict) -> "Snippet":
+        return cls(result.get("title", ""), result.get("body", ""), result.get("href", ""))
+
+
+@dataclass
+class SnippetParse:
+    name: str = ""
+    role: str = ""
+    mentions_company: bool = False
+    orgs: list = field(default_factory=list)
+    education: list = field(default_factory=list)
+    location: str = ""
+    timings_us: dict = field(default_factory=dict)
+
+
+# Shorter title names are parse noise; the finder drops them
+MIN_NAME_LEN = 3
+
+# Cumulative extractor counters: {extractor: {"calls": n, "total_ms": t}}
+TIMINGS = defaultdict(lambda: {"calls": 0, "total_ms": 0.0})
+
+# ─── EXTRACTORS ────────────────────────────────────────────────────────────
+
+def parse_linkedin_title(title_str: str) -> tuple[str, str]:
+    """
+    Parse a DuckDuckGo result title like:
+    'John Smith - CEO at Acme Corp | LinkedIn'
+    → ('John Smith', 'CEO at Acme Corp')
+    """
+    cleaned = _LINKEDIN_SUFFIX.sub("", title_str).strip()
+    parts = _TITLE_SPLIT.split(cleaned, maxsplit=1)
+    name = parts[0].strip()
+    title = parts[1].strip() if len(parts) > 1 else ""
+    # Clean up name — remove anything in parens, extra whitespace
+    name = _NAME_PARENS.sub(" ", name).strip()
+    # Skip if name looks like a company name or is too long
+    if len(name.split()) > 5 or not name:
+        return "", ""
+    return name, title
+
+def extract_orgs(text: str, text_lower: str, company_name: str) -> list[str]:
+    """Pull company names from a snippet (text plus its lowercased form)."""
+    orgs = {company_name}
+    for co, co_lower in SP_COMPANIES:
+        if co_lower in text_lower:
+            orgs.add(co)
+    for pat in _PREV_PATTERNS:
+        for m in pat.finditer(text):
+            for c in _CANDIDATE_SPLIT.split(m.group(1)):
+                c = c.strip()
+                if 2 <= len(c) <= 40 and c[0].isupper():
+                    orgs.add(c)
+    return list(orgs)
+
+def extract_education(text_lower: str) -> list[dict]:
+    return [{"s": sch, "y": None} for sch, sch_lower in KNOWN_SCHOOLS if sch_lower in text_lower]
+
+def extract_location(text: str) -> str:
+    for pat in _LOC_PATTERNS:
+        m = pat.search(text)
+        if m:
+            return m.group(1).strip()
+    return ""
+
+# ─── PIPELINE ──────────────────────────────────────────────────────────────
+
+def parse_snippet(snippet: Snippet, company_name: str, slug: Optional[str] = None,
+                  with_name: bool = True, details_from_body: bool = True) -> SnippetParse:
+    """
+    Run every extractor over one snippet. Discovery results (with_name=True)
+    take the person from the title and education/location from the body;
+    deep-dive results use the combined title + body for everything.
+    Discovery results the finder will drop (no usable name, or the company
+    isn't mentioned) stop after the title: orgs/education/location stay empty.
+    """
+    out = SnippetParse()
+
+    def timed(name, fn, *args):
+        started = time.perf_counter()
+        value = fn(*args)
+        elapsed = time.perf_counter() - started
+        out.timings_us[name] = round(elapsed * 1e6, 1)
+        TIMINGS[name]["calls"] += 1
+        TIMINGS[name]["total_ms"] += elapsed * 1000
+        return value
+
+    if with_name:
+        out.name, out.role = timed("title", parse_linkedin_title, snippet.title)
+        slug_text = (slug or "").lower().replace("-", " ")
+        out.mentions_company = (
+            company_name.lower() in snippet.combined_lower or
+            bool(slug_text) and slug_text in snippet.combined_lower
+        )
+        if len(out.name) < MIN_NAME_LEN or not out.mentions_company:
+            return out
+
+    detail_text, detail_lower = (
+        (snippet.body, snippet.body_lower) if details_from_body
+        else (snippet.combined, snippet.combined_lower)
+    )
+    out.orgs = timed("orgs", extract_orgs, snippet.combined, snippet.combined_lower, company_name)
+    out.education = timed("education", extract_education, detail_lower)
+    out.location = timed("location", extract_location, detail_text)
+    return out
+
+
+def timing_report() -> dict:
+    return {
+        name: {"calls": t["calls"], "total_ms": round(t["total_ms"], 2),
+               "avg_us": round(t["total_ms"] * 1000 / t["calls"], 1) if t["calls"] else 0.0}
+        for name, t in TIMINGS.items()
+    }
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from admission import Admission, _parse_weights
+
+
+def test_bucket_runs_out_and_refuses_with_retry_after():
+    gate = Admission("t", concurrency=10, rate=1.0, burst=5.0)
+
+    async def run():
+        assert await gate.acquire("a", 1) is False       # light: charged, no slot
+        assert await gate.acquire("a", 4) is True
+        with pytest.raises(HTTPException) as refused:
+            await gate.acquire("a", 3)
+        assert refused.value.status_code == 429
+        assert int(refused.value.headers["Retry-After"]) >= 1
+        assert await gate.acquire("b", 4) is True        # other clients have their own bucket
+
+    asyncio.run(run())
+    assert gate.counters["rate_limited"] == 1
+    assert gate.active == 2
+
+
+def test_busy_slots_go_to_the_lightest_backlog_first():
+    gate = Admission("t", concurrency=1, burst=100.0, max_queued=10)
+    order = []
+
+    async def request(client, cost):
+        holds_slot = await gate.acquire(client, cost)
+        order.append(client)
+        await asyncio.sleep(0)
+        gate.release(holds_slot)
+
+    async def run():
+        assert await gate.acquire("hog", 5)                # holds the only slot
+        tasks = [asyncio.create_task(request("hog", 5)) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("other", 5)))
+        await asyncio.sleep(0)
+        gate.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order.index("other") < 2
+    assert gate.active == 0
+
+
+def test_queue_limit_and_timeout_refund_tokens():
+    gate = Admission("t", concurrency=1, burst=20.0, max_queued=1, max_wait_s=0.05)
+
+    async def run():
+        assert await gate.acquire("a", 5)
+        waiting = asyncio.create_task(gate.acquire("b", 5))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException):
+            await gate.acquire("b", 5)                     # second one waiting
+        with pytest.raises(HTTPException):
+            await waiting                                  # never got the slot
+        assert gate._buckets["b"][0] == pytest.approx(20.0, abs=0.5)
+
+    asyncio.run(run())
+    assert gate.counters["queue_full"] == 1
+    assert gate.counters["timed_out"] == 1
+
+
+def test_parse_weights():
+    assert _parse_weights("1.2.3.4=2, batch=0.5,") == {"1.2.3.4": 2.0, "batch": 0.5}
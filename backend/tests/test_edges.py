@@ -0,0 +1,42 @@
+import random
+from types import SimpleNamespace
+
+from edges import compute_org_edges, compute_person_edges
+
+
+def random_roles(rng, people=30, roles=80):
+    out = []
+    for _ in range(roles):
+        start = rng.choice([None] + list(range(1995, 2025)))
+        end = None if rng.random() < 0.25 else (start or 1995) + rng.randint(0, 10)
+        out.append(SimpleNamespace(person_id=rng.randrange(people), start_year=start, end_year=end,
+                                   is_board=rng.random() < 0.1))
+    return out
+
+
+def test_person_edges_match_the_full_sweep():
+    rng = random.Random(44)
+    for _ in range(200):
+        roles = random_roles(rng)
+        changed = set(rng.sample(range(30), rng.randint(1, 5)))
+        full = compute_org_edges(roles, current_year=2026)
+        expected = {pair: edge for pair, edge in full.items() if changed & set(pair)}
+        assert compute_person_edges(roles, changed, current_year=2026) == expected
+
+
+def test_single_year_role_inside_another_makes_no_edge():
+    roles = [
+        SimpleNamespace(person_id=1, start_year=2018, end_year=2018, is_board=False),
+        SimpleNamespace(person_id=2, start_year=2017, end_year=2020, is_board=False),
+    ]
+    assert compute_org_edges(roles, current_year=2026) == {}
+    assert compute_person_edges(roles, {1}, current_year=2026) == {}
+
+
+def test_current_roles_overlap_until_this_year():
+    roles = [
+        SimpleNamespace(person_id=1, start_year=2020, end_year=None, is_board=False),
+        SimpleNamespace(person_id=2, start_year=2022, end_year=None, is_board=False),
+        SimpleNamespace(person_id=3, start_year=2021, end_year=None, is_board=True),
+    ]
+    assert compute_org_edges(roles, current_year=2026) == {(1, 2): (4, 2022, None)}
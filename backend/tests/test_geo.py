@@ -0,0 +1,31 @@
+from geo import gazetteer, locate
+
+
+def names(location):
+    city_id, metro_id = locate(location)
+    return gazetteer().city_name(city_id), gazetteer().metro_name(metro_id)
+
+
+def test_city_and_alias_resolve_to_their_metro():
+    assert names("SF") == ("San Francisco, CA", "San Francisco Bay Area")
+    assert names("Palo Alto, California") == ("Palo Alto, CA", "San Francisco Bay Area")
+
+
+def test_metro_only():
+    assert names("San Francisco Bay Area") == ("", "San Francisco Bay Area")
+    assert names("Greater Boston, MA") == ("", "Greater Boston")
+
+
+def test_qualifier_picks_the_city():
+    assert names("Portland, OR") == ("Portland, OR", "Portland Oregon Metropolitan Area")
+    assert names("Portland, ME")[0] == "Portland, ME"
+    assert names("Cambridge, MA") == ("Cambridge, MA", "Greater Boston")
+
+
+def test_known_place_that_disagrees_is_unknown():
+    assert locate("Cambridge, United Kingdom") == (None, None)
+
+
+def test_unknown_or_blank():
+    for location in ("Somewhere, XY", "  ", "", None):
+        assert locate(location) == (None, None)
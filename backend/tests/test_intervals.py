@@ -0,0 +1,44 @@
+import random
+
+from intervals import OPEN, IntervalIndex, role_interval
+
+
+def brute_force(intervals, start, end):
+    return sorted(p for s, e, p in intervals if s < e and s < end and start < e)
+
+
+def test_half_open_boundaries():
+    index = IntervalIndex([(2010, 2015, "a"), (2015, 2020, "b"), (2020, OPEN, "c")])
+    assert index.overlapping(2015, 2016) == ["b"]           # a ends where b starts
+    assert index.overlapping(2014, 2015) == ["a"]
+    assert sorted(index.overlapping(2014, 2016)) == ["a", "b"]
+    assert index.overlapping(2009, 2010) == []              # ends exactly at a's start
+    assert index.overlapping(3000, 3001) == ["c"]           # open-ended role
+    assert sorted(index.overlapping(-float("inf"), OPEN)) == ["a", "b", "c"]
+
+
+def test_empty_intervals_are_dropped():
+    index = IntervalIndex([(2018, 2018, "empty"), (2018, 2019, "year")])
+    assert index.overlapping(2000, 2100) == ["year"]
+    assert IntervalIndex([]).overlapping(0, OPEN) == []
+
+
+def test_role_interval():
+    assert role_interval(2018, 2018) == (2018, 2019)        # one calendar year
+    assert role_interval(2018, None) == (2018, OPEN)
+    assert role_interval(None, 2005) == (0, 2005)
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        intervals = []
+        for p in range(rng.randint(0, 60)):
+            start = rng.randint(1990, 2025)
+            end = OPEN if rng.random() < 0.2 else start + rng.randint(0, 12)
+            intervals.append((start, end, p))
+        index = IntervalIndex(intervals)
+        for _ in range(20):
+            start = rng.randint(1985, 2030)
+            end = start + rng.randint(1, 10)
+            assert sorted(index.overlapping(start, end)) == brute_force(intervals, start, end)
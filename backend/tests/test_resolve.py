@@ -0,0 +1,35 @@
+from resolve import find_match, linkedin_slug
+
+
+def match(name, url, company, candidates):
+    return find_match(name, url, company, candidates,
+                      cand_name=lambda c: c[0], cand_url=lambda c: c[1], cand_company=lambda c: c[2])
+
+
+def test_linkedin_slug_normalizes_the_url():
+    assert linkedin_slug("https://uk.linkedin.com/in/Bob-Smith-1a2b3c/?trk=x") == "bob-smith-1a2b3c"
+    assert linkedin_slug("https://example.com/bob") is None
+
+
+def test_same_profile_matches_whatever_the_name():
+    cand = ("Robert Smith", "https://www.linkedin.com/in/bsmith", "Acme")
+    assert match("Bobby S.", "https://linkedin.com/in/BSmith/", None, [cand]) is cand
+
+
+def test_different_profiles_never_match():
+    cand = ("Robert Smith", "https://www.linkedin.com/in/bsmith", "Acme Inc")
+    assert match("Robert Smith", "https://www.linkedin.com/in/robert-smith-2", "Acme", [cand]) is None
+
+
+def test_name_match_needs_both_companies_to_agree():
+    cand = ("Robert Smith", None, "Acme Inc.")
+    assert match("Bob Smith", None, "acme", [cand]) is cand
+    assert match("Bob Smith", None, "Globex", [cand]) is None
+    assert match("Bob Smith", None, None, [cand]) is None
+    assert match("Bob Smith", None, "Acme", [("Robert Smith", None, None)]) is None
+
+
+def test_profile_on_one_side_only_falls_back_to_name_and_company():
+    cand = ("Robert Smith", "https://www.linkedin.com/in/bsmith", "Acme")
+    assert match("Robert Smith", None, "Acme", [cand]) is cand
+    assert match("Richard Smith", None, "Acme", [cand]) is None
@@ -0,0 +1,42 @@
+import asyncio
+
+import shared_cache
+from result_cache import ResultCache
+
+
+def test_workers_share_results(tmp_path, monkeypatch):
+    monkeypatch.setenv("RCP_SHARED_DIR", str(tmp_path))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return "people"
+
+    async def run():
+        one = ResultCache(shared=shared_cache.store("test-results"))
+        two = ResultCache(shared=shared_cache.store("test-results"))
+        assert not await two.has("acme")
+        assert await one.get("acme", compute) == ("people", "miss")
+        assert await two.has("acme")
+        assert await two.get("acme", compute) == ("people", "hit")
+        assert two.counters["shared_hits"] == 1
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = ResultCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "people"
+
+    async def run():
+        return await asyncio.gather(*(cache.get("acme", compute) for _ in range(5)))
+
+    assert [value for value, _ in asyncio.run(run())] == ["people"] * 5
+    assert len(calls) == 1
+    assert cache.counters["coalesced"] == 4
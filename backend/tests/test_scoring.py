@@ -0,0 +1,65 @@
+import random
+from datetime import date
+
+import pytest
+
+from records import EdgeRecord, OrgRecord, PersonRecord, RoleRecord
+from scoring import ScoringContext, TopK, compute_connectivity
+
+
+def test_keeps_the_k_highest_in_stable_order():
+    rng = random.Random(28)
+    for _ in range(200):
+        scores = [rng.randint(0, 20) for _ in range(rng.randint(0, 40))]
+        k = rng.randint(1, 10)
+        top = TopK(k)
+        for i, score in enumerate(scores):
+            top.push(score, i)
+        expected = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+        assert top.items() == expected
+        assert top.seen == len(scores)
+
+
+def test_none_keeps_everything():
+    top = TopK()
+    for i, score in enumerate([3, 1, 3, 2]):
+        top.push(score, i)
+    assert top.items() == [0, 2, 3, 1]
+
+
+def test_zero_or_negative_keeps_nothing():
+    for k in (0, -1):
+        top = TopK(k)
+        top.push(5, "a")
+        top.push(7, "b")
+        assert top.items() == []
+        assert top.seen == 2
+
+
+def _acme_person(pid, name):
+    acme = OrgRecord(id=1, name="Acme")
+    return PersonRecord(id=pid, full_name=name, roles=[
+        RoleRecord(org_id=1, org=acme, start_year=2010, end_year=2014),
+        RoleRecord(org_id=1, org=acme, start_year=2020),
+    ])
+
+
+def test_backtest_ignores_edges_from_later_stints():
+    member, target = _acme_person(1, "Sam"), _acme_person(2, "Tess")
+    # The edge row keeps the longest overlap: the stint from 2020 on
+    edge = EdgeRecord(overlap_years=6, first_overlap_year=2020, last_overlap_year=None)
+    ctx = ScoringContext(as_of=date(2016, 1, 1), signals=["company"])
+    assert "edges" not in ctx.needs
+    with_edges = compute_connectivity(member, target, {1: edge}, ctx)
+    without = compute_connectivity(member, target, None, ctx)
+    assert with_edges.score == without.score > 8
+    assert "4 year(s) of overlap" in with_edges.signals[0].detail
+
+
+def test_weights_must_be_between_0_and_the_max():
+    for weight in ("inf", "nan", "-1", "1e308"):
+        with pytest.raises(ValueError):
+            ScoringContext(weights={"company": float(weight)})
+    ctx = ScoringContext(signals=["company"], weights={"company": 0})
+    member, target = _acme_person(1, "Sam"), _acme_person(2, "Tess")
+    assert compute_connectivity(member, target, None, ctx).score == 0